@@ -5,6 +5,7 @@ from .agents.agent_interface import AgentInterface
 from .agents.basic_memory_agent import BasicMemoryAgent
 from .agents.dual_model_agent import DualModelAgent
 from .stateless_llm_factory import LLMFactory as StatelessLLMFactory
+from .response_cache import ResponseCache
 from .agents.hume_ai import HumeAIAgent
 from .agents.letta_agent import LettaAgent
 
@@ -83,7 +84,7 @@ class AgentFactory:
                     immediate_audio_playback=llm_config.get("immediate_audio_playback", True),
                     # 性能优化
                     max_wait_time=llm_config.get("max_wait_time", 3),
-                    connection_pool_size=llm_config.get("connection_pool_size", 5),
+                    connection_pool_size=llm_config.get("connection_pool_size"),
                     keep_alive=llm_config.get("keep_alive", True),
                 )
             else:
@@ -98,6 +99,7 @@ class AgentFactory:
             tool_manager: Optional[ToolManager] = kwargs.get("tool_manager")
             tool_executor: Optional[ToolExecutor] = kwargs.get("tool_executor")
             mcp_prompt_string: str = kwargs.get("mcp_prompt_string", "")
+            response_cache: Optional[ResponseCache] = kwargs.get("response_cache")
 
             # Create the agent with the LLM and live2d_model
             return BasicMemoryAgent(
@@ -115,6 +117,11 @@ class AgentFactory:
                 tool_manager=tool_manager,
                 tool_executor=tool_executor,
                 mcp_prompt_string=mcp_prompt_string,
+                max_context_tokens=basic_memory_settings.get("max_context_tokens", 0),
+                pinned_recent_messages=basic_memory_settings.get(
+                    "pinned_recent_messages", 4
+                ),
+                response_cache=response_cache,
             )
 
         elif conversation_agent_choice == "mem0_agent":
@@ -194,8 +201,16 @@ class AgentFactory:
                 tool_manager=tool_manager,
                 tool_executor=tool_executor,
                 mcp_prompt_string=mcp_prompt_string,
+                max_context_tokens=dual_model_settings.get("max_context_tokens", 0),
+                pinned_recent_messages=dual_model_settings.get(
+                    "pinned_recent_messages", 4
+                ),
                 quality_threshold=dual_model_settings.get("quality_threshold", 0.4),
                 enable_fallback=dual_model_settings.get("enable_fallback", True),
+                hedged_mode=dual_model_settings.get("hedged_mode", False),
+                hedge_ttft_ms=dual_model_settings.get("hedge_ttft_ms", 800),
+                hedge_min_chars=dual_model_settings.get("hedge_min_chars", 60),
+                response_cache=kwargs.get("response_cache"),
             )
 
         elif conversation_agent_choice == "letta_agent":
@@ -1,10 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import AsyncIterator
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, List, Optional
 from loguru import logger
 
 from ..output_types import BaseOutput
 from ..input_types import BaseInput
 
+# While set, agents that support undo_messages also append here every
+# message they add to their memory. A speculative chat sets it inside its
+# own task, so it can later take back exactly the messages it added, even
+# when other sessions share the agent and added turns in the meantime.
+recorded_messages: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar(
+    "recorded_messages", default=None
+)
+
 
 class AgentInterface(ABC):
     """Base interface for all agent implementations"""
@@ -52,3 +61,27 @@ class AgentInterface(ABC):
             history_uid: str - History ID
         """
         pass
+
+    def can_undo_messages(self) -> bool:
+        """
+        Whether a chat's additions to working memory can be taken back.
+
+        Used to run a chat speculatively and roll it back if its input turns
+        out to be wrong. Agents that return False (the default) are never
+        run speculatively.
+
+        Returns:
+            bool - True if the agent records into `recorded_messages` and
+            implements undo_messages
+        """
+        return False
+
+    def undo_messages(self, messages: List[Dict[str, Any]]) -> None:
+        """
+        Remove messages from working memory, leaving all others in place
+
+        Args:
+            messages: List[Dict[str, Any]] - Messages recorded through
+                `recorded_messages` while a chat ran
+        """
+        pass
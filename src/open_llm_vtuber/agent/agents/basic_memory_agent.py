@@ -9,7 +9,7 @@ from typing import (
     Optional,
 )
 from loguru import logger
-from .agent_interface import AgentInterface
+from .agent_interface import AgentInterface, recorded_messages
 from ..output_types import SentenceOutput, DisplayText
 from ..stateless_llm.stateless_llm_interface import StatelessLLMInterface
 from ..stateless_llm.claude_llm import AsyncLLM as ClaudeAsyncLLM
@@ -23,6 +23,8 @@ from ..transformers import (
 )
 from ...config_manager import TTSPreprocessorConfig
 from ..input_types import BatchInput, TextSource
+from ..context_window import ContextWindow
+from ..response_cache import ResponseCache
 from prompts import prompt_loader
 from ...mcpp.tool_manager import ToolManager
 from ...mcpp.json_detector import StreamJSONDetector
@@ -49,10 +51,17 @@ class BasicMemoryAgent(AgentInterface):
         tool_manager: Optional[ToolManager] = None,
         tool_executor: Optional[ToolExecutor] = None,
         mcp_prompt_string: str = "",
+        max_context_tokens: int = 0,
+        pinned_recent_messages: int = 4,
+        response_cache: Optional[ResponseCache] = None,
     ):
         """Initialize agent with LLM and configuration."""
         super().__init__()
         self._memory = []
+        self._context_window = ContextWindow(
+            max_tokens=max_context_tokens, pinned_messages=pinned_recent_messages
+        )
+        self._response_cache = response_cache
         self._live2d_model = live2d_model
         self._tts_preprocessor_config = tts_preprocessor_config
         self._faster_first_response = faster_first_response
@@ -172,6 +181,10 @@ class BasicMemoryAgent(AgentInterface):
             return
 
         self._memory.append(message_data)
+        self._context_window.track(message_data)
+        journal = recorded_messages.get()
+        if journal is not None:
+            journal.append(message_data)
 
     def set_memory_from_history(self, conf_uid: str, history_uid: str) -> None:
         """Load memory from chat history."""
@@ -182,16 +195,27 @@ class BasicMemoryAgent(AgentInterface):
             role = "user" if msg["role"] == "human" else "assistant"
             content = msg["content"]
             if isinstance(content, str) and content:
-                self._memory.append(
-                    {
-                        "role": role,
-                        "content": content,
-                    }
-                )
+                message_data = {
+                    "role": role,
+                    "content": content,
+                }
+                self._memory.append(message_data)
+                self._context_window.track(message_data)
             else:
                 logger.warning(f"Skipping invalid message from history: {msg}")
         logger.info(f"Loaded {len(self._memory)} messages from history.")
 
+    def can_undo_messages(self) -> bool:
+        """Messages added by _add_message are recorded, so chats can be undone."""
+        return True
+
+    def undo_messages(self, messages: List[Dict[str, Any]]) -> None:
+        """Remove the given messages from working memory."""
+        undone = {id(message) for message in messages}
+        self._memory = [
+            message for message in self._memory if id(message) not in undone
+        ]
+
     def handle_interrupt(self, heard_response: str) -> None:
         """Handle user interruption."""
         if self._interrupt_handled:
@@ -239,11 +263,33 @@ class BasicMemoryAgent(AgentInterface):
 
         return "\n".join(message_parts).strip()
 
+    def _response_cache_key(self, input_data: BatchInput) -> Optional[str]:
+        """Response cache key for this input, or None if its reply is not cached."""
+        if self._response_cache is None or input_data.images:
+            return None
+        # Taken before the input is added to memory, so the context
+        # fingerprint covers the messages that came before it
+        return self._response_cache.make_key(
+            self._to_text_prompt(input_data), self._system, self._memory
+        )
+
+    def _turn_context(self, input_data: BatchInput) -> str:
+        """
+        Context that changes from turn to turn, such as retrieved memories.
+
+        It is sent after the user's input in the current request only and
+        is not stored in memory, so the earlier messages of the next
+        request are byte-identical and still match the provider's prompt
+        cache. Subclasses override this; the default adds nothing.
+        """
+        return ""
+
     def _to_messages(self, input_data: BatchInput) -> List[Dict[str, Any]]:
         """Prepare messages for LLM API call."""
         messages = self._memory.copy()
         user_content = []
         text_prompt = self._to_text_prompt(input_data)
+        turn_context = self._turn_context(input_data)
         if text_prompt:
             user_content.append({"type": "text", "text": text_prompt})
 
@@ -271,6 +317,8 @@ class BasicMemoryAgent(AgentInterface):
                 )
 
         if user_content:
+            if turn_context:
+                user_content.append({"type": "text", "text": turn_context})
             user_message = {"role": "user", "content": user_content}
             messages.append(user_message)
 
@@ -285,7 +333,7 @@ class BasicMemoryAgent(AgentInterface):
         else:
             logger.warning("No content generated for user message.")
 
-        return messages
+        return self._context_window.fit(messages, self._system)
 
     async def _claude_tool_interaction_loop(
         self,
@@ -598,6 +646,7 @@ class BasicMemoryAgent(AgentInterface):
             self.reset_interrupt()
             self.prompt_mode_flag = False
 
+            cache_key = self._response_cache_key(input_data)
             messages = self._to_messages(input_data)
             tools = None
             tool_mode = None
@@ -642,6 +691,14 @@ class BasicMemoryAgent(AgentInterface):
                     yield output
                 return
             else:
+                if cache_key:
+                    cached_response = await self._response_cache.aget(cache_key)
+                    if cached_response is not None:
+                        logger.info("Response cache hit, skipping the LLM.")
+                        yield cached_response
+                        self._add_message(cached_response, "assistant")
+                        return
+
                 logger.info("Starting simple chat completion.")
                 token_stream = self._llm.chat_completion(messages, self._system)
                 complete_response = ""
@@ -658,6 +715,8 @@ class BasicMemoryAgent(AgentInterface):
                         complete_response += text_chunk
                 if complete_response:
                     self._add_message(complete_response, "assistant")
+                    if cache_key:
+                        await self._response_cache.aput(cache_key, complete_response)
 
         return chat_with_memory
 
@@ -7,11 +7,15 @@ from typing import (
     Literal,
     Union,
     Optional,
+    Set,
+    Tuple,
 )
 import re
+import time
 import asyncio
+from collections import deque
 from loguru import logger
-from .agent_interface import AgentInterface
+from .agent_interface import AgentInterface, recorded_messages
 from ..output_types import SentenceOutput, DisplayText
 from ..stateless_llm.stateless_llm_interface import StatelessLLMInterface
 from ..stateless_llm.claude_llm import AsyncLLM as ClaudeAsyncLLM
@@ -25,6 +29,8 @@ from ..transformers import (
 )
 from ...config_manager import TTSPreprocessorConfig
 from ..input_types import BatchInput, TextSource
+from ..context_window import ContextWindow
+from ..response_cache import ResponseCache
 from prompts import prompt_loader
 from ...mcpp.tool_manager import ToolManager
 from ...mcpp.json_detector import StreamJSONDetector
@@ -32,131 +38,261 @@ from ...mcpp.types import ToolCallObject
 from ...mcpp.tool_executor import ToolExecutor
 
 
+# Marks the end of a stream in DualModelAgent's hedged race
+_STREAM_END = object()
+
+# 句子内容或句子结束符（换行也结束一句）
+_SENTENCE_PARTS = re.compile(r"([^\s.!?。！？]+)|([.!?。！？\n])")
+
+
+class _PhraseAutomaton:
+    """Aho-Corasick 自动机：一次扫描找出文本中出现的所有短语（包括重叠的）"""
+
+    def __init__(self, phrases: List[str]):
+        self.phrases = phrases
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for index, phrase in enumerate(phrases):
+            state = 0
+            for char in phrase:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = next_state
+            self._out[state] += (index,)
+
+        # 按广度优先顺序建立失败链接，合并后缀状态的输出，并展开成完整的
+        # 转移表，扫描时每个字符只需一次查表
+        self._delta: List[Dict[str, int]] = [dict(self._goto[0])]
+        self._delta.extend({} for _ in range(len(self._goto) - 1))
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fail_delta = self._delta[self._fail[state]]
+            self._delta[state] = {**fail_delta, **self._goto[state]}
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                if state:
+                    self._fail[next_state] = fail_delta.get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def scan(self, state: int, text: str, found: Set[int]) -> int:
+        """从 state 继续扫描 text，把匹配到的短语编号加入 found，返回新状态"""
+        delta, out = self._delta, self._out
+        for char in text:
+            state = delta[state].get(char, 0)
+            if out[state]:
+                found.update(out[state])
+        return state
+
+
+class StreamingQualityScorer:
+    """
+    对一条正在生成的回复增量评分。
+
+    每个文本块只扫描一次，计数器随之更新，所以每次 feed 的开销与新文本
+    长度成正比，verdict 随时可用（例如第一句话结束后）。
+    """
+
+    def __init__(self, checker: "ResponseQualityChecker"):
+        self._checker = checker
+        self._state = 0
+        self._matched: Set[int] = set()
+        self._scores = {category: 0.0 for category in checker.WEIGHTS}
+        # 去掉首尾空白后的长度 = 第一个非空白字符之后的长度 - 末尾空白长度
+        self._length = 0
+        self._trailing_space = 0
+        self._in_sentence = False
+        self.sentence_count = 0
+
+    def feed(self, chunk: str) -> None:
+        """加入下一段文本"""
+        text = chunk.lower()
+        found: Set[int] = set()
+        self._state = self._checker.automaton.scan(self._state, text, found)
+        for index in found - self._matched:
+            for category in self._checker.phrase_categories[index]:
+                self._scores[category] += self._checker.WEIGHTS[category]
+        self._matched |= found
+
+        # 去掉首尾空白后的长度
+        if not self._length:
+            text = text.lstrip()
+        content = text.rstrip()
+        if content:
+            self._length += len(text)
+            self._trailing_space = len(text) - len(content)
+        else:
+            self._length += len(text)
+            self._trailing_space += len(text)
+
+        for words, ending in _SENTENCE_PARTS.findall(text):
+            if words:
+                self._in_sentence = True
+            elif self._in_sentence:
+                self.sentence_count += 1
+                self._in_sentence = False
+
+    def verdict(self) -> Dict[str, Any]:
+        """当前已生成文本的质量评分，格式同 check_response_quality"""
+        length = self._length - self._trailing_space
+        if not length:
+            return {"is_good": False, "reason": "empty_response", "score": 0.0}
+        if length < self._checker.min_length:
+            return {"is_good": False, "reason": "too_short", "score": 0.2}
+        if length > self._checker.max_length:
+            return {"is_good": False, "reason": "too_long", "score": 0.3}
+
+        scores = self._scores
+        # 计算总分 - 更宽松的评分标准
+        total_score = min(
+            1.0, scores["keyword"] + scores["trait"] - scores["generic"] * 0.3
+        )
+        total_score += scores["emotion"]
+
+        # 降低质量阈值，让更多响应通过
+        is_good = total_score >= 0.2
+
+        return {
+            "is_good": is_good,
+            "reason": "quality_check" if is_good else "low_quality",
+            "score": total_score,
+            "details": {
+                "keyword_score": scores["keyword"],
+                "trait_score": scores["trait"],
+                "generic_score": scores["generic"],
+                "emotion_score": scores["emotion"],
+            },
+        }
+
+
 class ResponseQualityChecker:
     """检查响应质量的类"""
-    
-    def __init__(self, character_prompt: str, min_length: int = 5, max_length: int = 800):
+
+    # 每个类别中每个出现过的短语的加分（降低关键词和特征权重，更宽松）
+    WEIGHTS = {"keyword": 0.15, "trait": 0.2, "generic": 0.1, "emotion": 0.05}
+
+    # 过于通用的短语
+    GENERIC_PHRASES = [
+        "i understand",
+        "that's interesting",
+        "i see",
+        "okay",
+        "sure",
+        "yes",
+        "no",
+        "maybe",
+        "i think",
+        "i believe",
+    ]
+
+    # 情感表达
+    EMOTION_INDICATORS = ["!", "?", "...", "haha", "lol", "omg", "wow", "[", "]"]
+
+    def __init__(
+        self, character_prompt: str, min_length: int = 5, max_length: int = 800
+    ):
         self.character_prompt = character_prompt
         self.min_length = min_length
         self.max_length = max_length
-        
+
         # 从角色提示中提取关键特征
         self.character_keywords = self._extract_character_keywords()
         self.personality_traits = self._extract_personality_traits()
-    
+
+        # 所有类别的短语编进同一个自动机，一个短语可以属于多个类别
+        categories: Dict[str, List[str]] = {}
+        for category, phrases in (
+            ("keyword", self.character_keywords),
+            ("trait", self.personality_traits),
+            ("generic", self.GENERIC_PHRASES),
+            ("emotion", self.EMOTION_INDICATORS),
+        ):
+            for phrase in phrases:
+                categories.setdefault(phrase, []).append(category)
+        self.automaton = _PhraseAutomaton(list(categories))
+        self.phrase_categories = list(categories.values())
+
     def _extract_character_keywords(self) -> List[str]:
         """从角色提示中提取关键词"""
         keywords = []
-        
+
         # 提取角色名称
-        name_match = re.search(r'You are \*\*(\w+)\*\*', self.character_prompt)
+        name_match = re.search(r"You are \*\*(\w+)\*\*", self.character_prompt)
         if name_match:
             keywords.append(name_match.group(1).lower())
-        
+
         # 提取其他关键词
         keyword_patterns = [
-            r'(\w+)\s+and\s+(\w+)',  # "sassy and witty"
-            r'(\w+)\s+but\s+(\w+)',  # "wise but naive"
-            r'(\w+)\s+with\s+(\w+)', # "playful with care"
+            r"(\w+)\s+and\s+(\w+)",  # "sassy and witty"
+            r"(\w+)\s+but\s+(\w+)",  # "wise but naive"
+            r"(\w+)\s+with\s+(\w+)",  # "playful with care"
         ]
-        
+
         for pattern in keyword_patterns:
             matches = re.findall(pattern, self.character_prompt.lower())
             for match in matches:
                 keywords.extend(match)
-        
+
         # 添加Kiyo特有的角色相关词汇
-        keywords.extend(['babe', 'sweetie', 'darling', 'princess', 'alien', 'nota', 'sparkle', 'glitter', 'royal', 'tsundere'])
-        
+        keywords.extend(
+            [
+                "babe",
+                "sweetie",
+                "darling",
+                "princess",
+                "alien",
+                "nota",
+                "sparkle",
+                "glitter",
+                "royal",
+                "tsundere",
+            ]
+        )
+
         return list(set(keywords))
-    
+
     def _extract_personality_traits(self) -> List[str]:
         """提取性格特征"""
         traits = []
-        
+
         # 常见的性格特征
         trait_patterns = [
-            r'sassy', r'witty', r'tsundere', r'curious', r'wise', r'naive',
-            r'playful', r'supportive', r'royal', r'alien', r'princess'
+            r"sassy",
+            r"witty",
+            r"tsundere",
+            r"curious",
+            r"wise",
+            r"naive",
+            r"playful",
+            r"supportive",
+            r"royal",
+            r"alien",
+            r"princess",
         ]
-        
+
         for pattern in trait_patterns:
             if re.search(pattern, self.character_prompt.lower()):
                 traits.append(pattern)
-        
+
         return traits
-    
+
+    def new_scorer(self) -> StreamingQualityScorer:
+        """为一条新回复创建增量评分器"""
+        return StreamingQualityScorer(self)
+
     def check_response_quality(self, response: str) -> Dict[str, Any]:
-        """检查响应质量"""
-        if not response or not response.strip():
-            return {
-                'is_good': False,
-                'reason': 'empty_response',
-                'score': 0.0
-            }
-        
-        response_lower = response.lower().strip()
-        
-        # 检查长度
-        if len(response_lower) < self.min_length:
-            return {
-                'is_good': False,
-                'reason': 'too_short',
-                'score': 0.2
-            }
-        
-        if len(response_lower) > self.max_length:
-            return {
-                'is_good': False,
-                'reason': 'too_long',
-                'score': 0.3
-            }
-        
-        # 检查是否包含角色关键词
-        keyword_score = 0.0
-        for keyword in self.character_keywords:
-            if keyword in response_lower:
-                keyword_score += 0.15  # 降低关键词权重，更宽松
-        
-        # 检查是否包含性格特征
-        trait_score = 0.0
-        for trait in self.personality_traits:
-            if trait in response_lower:
-                trait_score += 0.2  # 降低特征权重，更宽松
-        
-        # 检查是否过于通用
-        generic_phrases = [
-            'i understand', 'that\'s interesting', 'i see', 'okay',
-            'sure', 'yes', 'no', 'maybe', 'i think', 'i believe'
-        ]
-        
-        generic_score = 0.0
-        for phrase in generic_phrases:
-            if phrase in response_lower:
-                generic_score += 0.1
-        
-        # 计算总分 - 更宽松的评分标准
-        total_score = min(1.0, keyword_score + trait_score - generic_score * 0.3)
-        
-        # 检查是否包含情感表达
-        emotion_indicators = ['!', '?', '...', 'haha', 'lol', 'omg', 'wow', '[', ']']
-        emotion_score = sum(0.05 for indicator in emotion_indicators if indicator in response_lower)
-        total_score += emotion_score
-        
-        # 降低质量阈值，让更多响应通过
-        is_good = total_score >= 0.2
-        
-        return {
-            'is_good': is_good,
-            'reason': 'quality_check' if is_good else 'low_quality',
-            'score': total_score,
-            'details': {
-                'keyword_score': keyword_score,
-                'trait_score': trait_score,
-                'generic_score': generic_score,
-                'emotion_score': emotion_score
-            }
-        }
+        """检查完整响应的质量"""
+        scorer = self.new_scorer()
+        if response:
+            scorer.feed(response)
+        return scorer.verdict()
 
 
 class DualModelAgent(AgentInterface):
@@ -179,12 +315,22 @@ class DualModelAgent(AgentInterface):
         tool_manager: Optional[ToolManager] = None,
         tool_executor: Optional[ToolExecutor] = None,
         mcp_prompt_string: str = "",
+        max_context_tokens: int = 0,
+        pinned_recent_messages: int = 4,
+        response_cache: Optional[ResponseCache] = None,
         quality_threshold: float = 0.2,  # 质量阈值 - 更宽松
         enable_fallback: bool = True,  # 是否启用回退
+        hedged_mode: bool = False,
+        hedge_ttft_ms: int = 800,
+        hedge_min_chars: int = 60,
     ):
         """Initialize dual model agent with primary and fallback LLMs."""
         super().__init__()
         self._memory = []
+        self._context_window = ContextWindow(
+            max_tokens=max_context_tokens, pinned_messages=pinned_recent_messages
+        )
+        self._response_cache = response_cache
         self._live2d_model = live2d_model
         self._tts_preprocessor_config = tts_preprocessor_config
         self._faster_first_response = faster_first_response
@@ -196,6 +342,17 @@ class DualModelAgent(AgentInterface):
         self.prompt_mode_flag = False
         self.quality_threshold = quality_threshold
         self.enable_fallback = enable_fallback
+        # 对冲模式：主模型迟迟没有输出或开头质量差时并行启动大模型，先合格者胜出
+        self.hedged_mode = hedged_mode
+        self.hedge_ttft_ms = hedge_ttft_ms
+        self.hedge_min_chars = hedge_min_chars
+        self._hedge_stats = {
+            "turns": 0,
+            "primary_wins": 0,
+            "fallback_wins": 0,
+            "hedges_started": 0,
+            "latency_saved_ms": 0.0,
+        }
 
         # 双模型设置
         self._primary_llm = primary_llm
@@ -286,6 +443,10 @@ class DualModelAgent(AgentInterface):
             return
 
         self._memory.append(message_data)
+        self._context_window.track(message_data)
+        journal = recorded_messages.get()
+        if journal is not None:
+            journal.append(message_data)
 
     def set_memory_from_history(self, conf_uid: str, history_uid: str) -> None:
         """Load memory from chat history."""
@@ -296,16 +457,27 @@ class DualModelAgent(AgentInterface):
             role = "user" if msg["role"] == "human" else "assistant"
             content = msg["content"]
             if isinstance(content, str) and content:
-                self._memory.append(
-                    {
-                        "role": role,
-                        "content": content,
-                    }
-                )
+                message_data = {
+                    "role": role,
+                    "content": content,
+                }
+                self._memory.append(message_data)
+                self._context_window.track(message_data)
             else:
                 logger.warning(f"Skipping invalid message from history: {msg}")
         logger.info(f"Loaded {len(self._memory)} messages from history.")
 
+    def can_undo_messages(self) -> bool:
+        """Messages added by _add_message are recorded, so chats can be undone."""
+        return True
+
+    def undo_messages(self, messages: List[Dict[str, Any]]) -> None:
+        """Remove the given messages from working memory."""
+        undone = {id(message) for message in messages}
+        self._memory = [
+            message for message in self._memory if id(message) not in undone
+        ]
+
     def handle_interrupt(self, heard_response: str) -> None:
         """Handle user interruption."""
         if self._interrupt_handled:
@@ -353,6 +525,16 @@ class DualModelAgent(AgentInterface):
 
         return "\n".join(message_parts).strip()
 
+    def _response_cache_key(self, input_data: BatchInput) -> Optional[str]:
+        """Response cache key for this input, or None if its reply is not cached."""
+        if self._response_cache is None or input_data.images:
+            return None
+        # Taken before the input is added to memory, so the context
+        # fingerprint covers the messages that came before it
+        return self._response_cache.make_key(
+            self._to_text_prompt(input_data), self._system, self._memory
+        )
+
     def _to_messages(self, input_data: BatchInput) -> List[Dict[str, Any]]:
         """Prepare messages for LLM API call."""
         messages = self._memory.copy()
@@ -399,7 +581,7 @@ class DualModelAgent(AgentInterface):
         else:
             logger.warning("No content generated for user message.")
 
-        return messages
+        return self._context_window.fit(messages, self._system)
 
     async def _generate_with_fallback(
         self, 
@@ -411,6 +593,7 @@ class DualModelAgent(AgentInterface):
         # 首先尝试主模型（小模型）
         logger.info("🔄 Trying primary LLM (small model) first...")
         primary_response = ""
+        primary_scorer = self._quality_checker.new_scorer()
         
         try:
             token_stream = self._primary_llm.chat_completion(messages, system)
@@ -423,11 +606,12 @@ class DualModelAgent(AgentInterface):
                     continue
                 if text_chunk:
                     primary_response += text_chunk
+                    primary_scorer.feed(text_chunk)
                     yield text_chunk
             
             # 检查主模型响应质量
             if self.enable_fallback and primary_response.strip():
-                quality_result = self._quality_checker.check_response_quality(primary_response)
+                quality_result = primary_scorer.verdict()
                 logger.info(f"📊 Primary model quality score: {quality_result['score']:.2f}")
                 
                 if not quality_result['is_good']:
@@ -505,6 +689,229 @@ class DualModelAgent(AgentInterface):
         
         return response.strip()
 
+    @staticmethod
+    def _event_text(event: Any) -> str:
+        """Text carried by an item of an LLM token stream, if any"""
+        if isinstance(event, dict) and event.get("type") == "text_delta":
+            return event.get("text", "")
+        if isinstance(event, str):
+            return event
+        return ""
+
+    async def _pump_stream(
+        self,
+        name: str,
+        llm: StatelessLLMInterface,
+        messages: List[Dict[str, Any]],
+        system: str,
+        queue: asyncio.Queue,
+    ) -> None:
+        """Forward an LLM's text chunks to the race queue as (name, chunk)"""
+        stream = llm.chat_completion(messages, system)
+        try:
+            async for event in stream:
+                text_chunk = self._event_text(event)
+                if text_chunk:
+                    await queue.put((name, text_chunk))
+            await queue.put((name, _STREAM_END))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put((name, e))
+        finally:
+            # Closing the generator closes the HTTP stream of the losing request
+            await stream.aclose()
+
+    def _primary_acceptable(self, quality_result: Dict[str, Any]) -> bool:
+        """Same test as the sequential path, plus the configured threshold"""
+        logger.debug(
+            f"Hedged: primary score {quality_result['score']:.2f} "
+            f"({quality_result['reason']})"
+        )
+        return (
+            quality_result["is_good"]
+            and quality_result["score"] >= self.quality_threshold
+        )
+
+    async def _generate_hedged(
+        self, messages: List[Dict[str, Any]], system: str
+    ) -> AsyncIterator[str]:
+        """
+        Race the fallback model against the primary instead of running it after.
+
+        The primary's output is held back until its first sentence or its
+        first `hedge_min_chars` characters (or the whole reply, if shorter)
+        pass the quality check, which is updated as each chunk arrives.
+        The fallback model is started with the same messages as soon as the
+        primary has produced nothing for `hedge_ttft_ms`, fails, or its
+        opening fails the check the sequential path uses or scores below
+        `quality_threshold`. The fallback wins with its
+        first token; a primary that scored too low keeps running and is only
+        used if the fallback fails. Only the winner's text is yielded, so
+        nothing reaches the sentence divider before the choice is made, and
+        the other request is cancelled.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        start = time.monotonic()
+        tasks = {
+            "primary": asyncio.create_task(
+                self._pump_stream("primary", self._primary_llm, messages, system, queue)
+            )
+        }
+        buffers = {"primary": "", "fallback": ""}
+        primary_scorer = self._quality_checker.new_scorer()
+        finished = set()
+        primary_disqualified = False
+        primary_out_at = None
+        fallback_started_at = None
+        fallback_first_at = None
+        winner = None
+
+        def start_fallback(reason: str) -> None:
+            nonlocal fallback_started_at
+            if "fallback" in tasks:
+                return
+            logger.info(f"🔀 Hedged: starting fallback model ({reason})")
+            self._hedge_stats["hedges_started"] += 1
+            fallback_started_at = time.monotonic()
+            tasks["fallback"] = asyncio.create_task(
+                self._pump_stream(
+                    "fallback", self._fallback_llm, messages, system, queue
+                )
+            )
+
+        try:
+            while winner is None:
+                timeout = None
+                if "fallback" not in tasks and not buffers["primary"]:
+                    timeout = max(
+                        start + self.hedge_ttft_ms / 1000 - time.monotonic(), 0
+                    )
+                try:
+                    source, item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    start_fallback("primary time to first token exceeded")
+                    continue
+
+                if item is _STREAM_END or isinstance(item, Exception):
+                    finished.add(source)
+                    if isinstance(item, Exception):
+                        logger.warning(f"Hedged: {source} model failed: {item}")
+                        buffers[source] = ""
+                    if source == "primary":
+                        primary_out_at = primary_out_at or time.monotonic()
+                        if (
+                            not primary_disqualified
+                            and buffers["primary"]
+                            and self._primary_acceptable(primary_scorer.verdict())
+                        ):
+                            winner = "primary"
+                        else:
+                            primary_disqualified = True
+                            start_fallback("primary reply failed or low quality")
+                    elif "primary" not in finished or buffers["primary"]:
+                        # The fallback gave nothing, so the primary is all there is
+                        winner = "primary"
+                    if winner is None and {"primary", "fallback"} <= finished:
+                        break
+                    continue
+
+                buffers[source] += item
+                if source == "fallback":
+                    fallback_first_at = time.monotonic()
+                    winner = "fallback"
+                    continue
+                primary_scorer.feed(item)
+                if primary_disqualified:
+                    continue
+                # A good first sentence commits the primary early; rejecting
+                # it waits for hedge_min_chars, as one short sentence says little
+                scored_enough = len(buffers["primary"]) >= self.hedge_min_chars
+                if primary_scorer.sentence_count or scored_enough:
+                    quality_result = primary_scorer.verdict()
+                    if self._primary_acceptable(quality_result):
+                        winner = "primary"
+                    elif quality_result["reason"] == "too_short":
+                        # A first sentence under min_length ("Hi!") is judged
+                        # on the text that follows; only a whole reply that
+                        # short disqualifies the primary, at its stream end
+                        continue
+                    elif scored_enough:
+                        # Keep it running in case the fallback fails too
+                        primary_disqualified = True
+                        primary_out_at = time.monotonic()
+                        start_fallback("low quality primary opening")
+
+            if winner is None:
+                # Neither model produced an acceptable reply
+                if buffers["primary"]:
+                    winner = "primary"
+                else:
+                    yield "[Error: Both models failed to respond]"
+                    return
+
+            self._record_hedge_result(
+                winner, primary_out_at, fallback_started_at, fallback_first_at
+            )
+            loser = "fallback" if winner == "primary" else "primary"
+            if loser in tasks:
+                tasks[loser].cancel()
+                finished.add(loser)
+
+            yield buffers[winner]
+            while winner not in finished:
+                source, item = await queue.get()
+                if source != winner:
+                    continue
+                if item is _STREAM_END:
+                    break
+                if isinstance(item, Exception):
+                    logger.error(f"Hedged: {winner} model failed mid-reply: {item}")
+                    break
+                yield item
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+    def _record_hedge_result(
+        self,
+        winner: str,
+        primary_out_at: Optional[float],
+        fallback_started_at: Optional[float],
+        fallback_first_at: Optional[float],
+    ) -> None:
+        stats = self._hedge_stats
+        stats["turns"] += 1
+        stats[f"{winner}_wins"] += 1
+        if winner == "fallback" and fallback_first_at is not None:
+            # The sequential path would only have started the fallback once
+            # the primary was done, which is no earlier than when the race
+            # dropped it, or than now if it was still running
+            committed_at = fallback_first_at
+            fallback_ttft = fallback_first_at - fallback_started_at
+            sequential_at = max(primary_out_at or committed_at, committed_at)
+            saved_ms = (sequential_at + fallback_ttft - committed_at) * 1000
+            stats["latency_saved_ms"] += saved_ms
+            logger.info(f"🔀 Hedged: fallback won, saved at least {saved_ms:.0f} ms")
+        else:
+            logger.info(f"🔀 Hedged: {winner} model won")
+
+    def get_hedge_stats(self) -> Dict[str, Any]:
+        """Return how often each model won the hedged race and the time saved"""
+        stats = self._hedge_stats
+        turns = stats["turns"]
+        return {
+            **stats,
+            "primary_win_rate": stats["primary_wins"] / turns if turns else 0.0,
+            "fallback_win_rate": stats["fallback_wins"] / turns if turns else 0.0,
+            "avg_latency_saved_ms": (
+                stats["latency_saved_ms"] / stats["fallback_wins"]
+                if stats["fallback_wins"]
+                else 0.0
+            ),
+        }
+
     def _chat_function_factory(
         self,
     ) -> Callable[[BatchInput], AsyncIterator[Union[SentenceOutput, Dict[str, Any]]]]:
@@ -525,17 +932,32 @@ class DualModelAgent(AgentInterface):
             self.reset_interrupt()
             self.prompt_mode_flag = False
 
+            cache_key = self._response_cache_key(input_data)
             messages = self._to_messages(input_data)
-            
+
+            if cache_key:
+                cached_response = await self._response_cache.aget(cache_key)
+                if cached_response is not None:
+                    logger.info("Response cache hit, skipping both models.")
+                    yield cached_response
+                    self._add_message(cached_response, "assistant")
+                    return
+
             # 使用双模型生成响应
             complete_response = ""
-            async for text_chunk in self._generate_with_fallback(messages, self._system):
+            if self.hedged_mode and self.enable_fallback:
+                generator = self._generate_hedged(messages, self._system)
+            else:
+                generator = self._generate_with_fallback(messages, self._system)
+            async for text_chunk in generator:
                 if text_chunk:
                     yield text_chunk
                     complete_response += text_chunk
             
             if complete_response:
                 self._add_message(complete_response, "assistant")
+                if cache_key:
+                    await self._response_cache.aput(cache_key, complete_response)
 
         return chat_with_dual_models
 
@@ -12,6 +12,7 @@ from ..stateless_llm.stateless_llm_interface import StatelessLLMInterface
 from ...config_manager.tts_preprocessor import TTSPreprocessorConfig
 from ...mcpp.tool_manager import ToolManager
 from ...mcpp.tool_executor import ToolExecutor
+from ..response_cache import ResponseCache
 # 可选导入记忆系统
 try:
     from ...memory.smart_memory_manager import SmartMemoryManager
@@ -40,6 +41,9 @@ class MemoryEnhancedAgent(BasicMemoryAgent):
         tool_manager: Optional[ToolManager] = None,
         tool_executor: Optional[ToolExecutor] = None,
         mcp_prompt_string: str = "",
+        max_context_tokens: int = 0,
+        pinned_recent_messages: int = 4,
+        response_cache: Optional[ResponseCache] = None,
         # 记忆管理相关参数
         max_memory_items: int = 1000,
         compression_threshold: float = 0.3,
@@ -62,6 +66,9 @@ class MemoryEnhancedAgent(BasicMemoryAgent):
             tool_manager=tool_manager,
             tool_executor=tool_executor,
             mcp_prompt_string=mcp_prompt_string,
+            max_context_tokens=max_context_tokens,
+            pinned_recent_messages=pinned_recent_messages,
+            response_cache=response_cache,
         )
         
         # 初始化智能记忆管理器（如果可用）
@@ -131,11 +138,8 @@ class MemoryEnhancedAgent(BasicMemoryAgent):
         except Exception as e:
             logger.error(f"处理消息记忆失败: {e}")
     
-    def _to_text_prompt(self, input_data) -> str:
-        """构建包含记忆上下文的文本提示"""
-        # 获取基础提示
-        base_prompt = super()._to_text_prompt(input_data)
-        
+    def _turn_context(self, input_data) -> str:
+        """构建本轮的记忆上下文（放在用户输入之后，不写入对话历史，以保持提示词前缀稳定）"""
         # 获取相关记忆（如果记忆系统可用）
         if self.enable_memory_compression and self.memory_manager:
             try:
@@ -147,16 +151,13 @@ class MemoryEnhancedAgent(BasicMemoryAgent):
                     # 构建记忆上下文
                     memory_context = self._build_memory_context(relevant_memories)
                     
-                    # 将记忆上下文添加到提示中
-                    enhanced_prompt = f"{base_prompt}\n\n[相关记忆上下文]\n{memory_context}"
-                    
                     logger.debug(f"添加了 {len(relevant_memories)} 个相关记忆到提示中")
-                    return enhanced_prompt
+                    return f"[相关记忆上下文]\n{memory_context}"
                     
             except Exception as e:
                 logger.error(f"构建记忆上下文失败: {e}")
         
-        return base_prompt
+        return ""
     
     def _build_memory_context(self, memories) -> str:
         """构建记忆上下文"""
@@ -0,0 +1,252 @@
+"""
+Token budget for the conversation history sent to the LLM.
+
+Agents keep their whole conversation in memory, but only a window of it
+is sent with each request. `ContextWindow` picks that window: the system
+prompt and the most recent messages are always kept, older turns are
+added newest first while they fit the budget, and the turns left out
+are condensed into a short note so the model still knows what came
+before.
+
+Once the history outgrows the budget, the window does not slide forward
+one message per turn. It jumps far enough ahead to leave some headroom
+and then keeps the same first message, and the same note, until the
+budget is reached again. Consecutive requests therefore share a
+byte-identical prefix, which is what provider prompt caches match on.
+
+Token counts are estimates, not tokenizer output. They are cheap enough
+to take once per message and close enough to keep a request inside a
+provider's context limit.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+# Roughly four characters of English per token; CJK and other
+# non-ASCII characters usually take at least one token each
+CHARS_PER_TOKEN = 4
+# Role markers and separators the chat format adds around each message
+MESSAGE_OVERHEAD_TOKENS = 4
+# What an image at "auto" detail typically costs
+IMAGE_TOKENS = 765
+
+
+def estimate_text_tokens(text: str) -> int:
+    """Estimate the token count of a piece of text"""
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return -(-ascii_chars // CHARS_PER_TOKEN) + (len(text) - ascii_chars)
+
+
+def estimate_message_tokens(message: Dict[str, Any]) -> int:
+    """Estimate the tokens a chat message adds to a request"""
+    content = message.get("content")
+    tokens = MESSAGE_OVERHEAD_TOKENS
+    if isinstance(content, str):
+        return tokens + estimate_text_tokens(content)
+    for part in content or []:
+        if part.get("type") == "text":
+            tokens += estimate_text_tokens(part.get("text", ""))
+        elif part.get("type") in ("image_url", "image"):
+            tokens += IMAGE_TOKENS
+    return tokens
+
+
+def _text_of(message: Dict[str, Any]) -> str:
+    content = message.get("content")
+    if isinstance(content, str):
+        return content
+    return " ".join(
+        part.get("text", "") for part in content or [] if part.get("type") == "text"
+    )
+
+
+class ContextWindow:
+    """
+    Fits an agent's message history into a token budget.
+
+    Each agent owns one instance. Messages are estimated once, when the
+    agent stores them (see `track`), and the estimate is reused on every
+    later turn until the message's content changes.
+    """
+
+    # Length a dropped message is cut to in the condensed note
+    SUMMARY_SNIPPET_CHARS = 80
+    # Share of the budget left free when the window moves, so that it can
+    # stay where it is for the next few turns
+    TRIM_HEADROOM = 0.25
+
+    def __init__(
+        self,
+        max_tokens: int = 0,
+        pinned_messages: int = 4,
+        summary_tokens: int = 200,
+    ):
+        """
+        Args:
+            max_tokens: Budget for the system prompt plus messages.
+                0 or less sends the whole history.
+            pinned_messages: Most recent messages that are always sent,
+                even when they alone exceed the budget.
+            summary_tokens: Budget for the note that stands in for the
+                messages left out. 0 drops them without a note.
+        """
+        self.max_tokens = max_tokens
+        self.pinned_messages = max(pinned_messages, 1)
+        self.summary_tokens = summary_tokens
+        # id(message) -> (content the estimate was made for, tokens)
+        self._estimates: Dict[int, Tuple[Any, int]] = {}
+        # First message of the last trimmed window
+        self._anchor: Optional[Dict[str, Any]] = None
+        self.last_prompt_tokens = 0
+        self.last_history_tokens = 0
+        self._turns = 0
+        self._trimmed_turns = 0
+        self._dropped_messages = 0
+
+    def track(self, message: Dict[str, Any]) -> int:
+        """Estimate a message as it is stored, returning its token count"""
+        entry = self._estimates.get(id(message))
+        if entry is not None and entry[0] is message.get("content"):
+            return entry[1]
+        tokens = estimate_message_tokens(message)
+        self._estimates[id(message)] = (message.get("content"), tokens)
+        return tokens
+
+    def fit(
+        self, messages: List[Dict[str, Any]], system: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Select the messages to send with the next request.
+
+        Args:
+            messages: The full history, oldest first, ending with the
+                message being answered.
+            system: The system prompt, which is always sent and counts
+                against the budget.
+
+        Returns:
+            List[Dict[str, Any]]: The messages to send. It is a new list;
+            neither `messages` nor its dicts are modified.
+        """
+        system_tokens = estimate_text_tokens(system or "")
+        counts = [self.track(message) for message in messages]
+        history_tokens = sum(counts)
+        self.last_history_tokens = system_tokens + history_tokens
+        # Only the estimates of messages still in the history are worth keeping
+        self._estimates = {
+            id(message): self._estimates[id(message)] for message in messages
+        }
+
+        if self.max_tokens <= 0 or self.last_history_tokens <= self.max_tokens:
+            self._anchor = None
+            return self._report(list(messages), system_tokens + history_tokens)
+
+        budget = self.max_tokens - system_tokens - max(self.summary_tokens, 0)
+        start, used = self._anchored_start(messages, counts, budget)
+        if start is None:
+            start, used = self._window_start(
+                messages, counts, int(budget * (1 - self.TRIM_HEADROOM))
+            )
+            logger.debug(f"Context window: moved to start at message {start}.")
+        self._anchor = messages[start]
+
+        kept = list(messages[start:])
+        note = self._condense(messages[:start])
+        if note:
+            kept[0] = self._with_note(kept[0], note)
+            used += estimate_text_tokens(note)
+
+        self._trimmed_turns += 1
+        self._dropped_messages += start
+        logger.debug(
+            f"Context window: sending {len(kept)} of {len(messages)} messages "
+            f"({start} condensed) to stay within {self.max_tokens} tokens."
+        )
+        return self._report(kept, system_tokens + used)
+
+    def _anchored_start(
+        self, messages: List[Dict[str, Any]], counts: List[int], budget: int
+    ) -> Tuple[Optional[int], int]:
+        """Start of the previous window, if it still fits the budget"""
+        if self._anchor is None:
+            return None, 0
+        last_start = len(messages) - self.pinned_messages
+        for index in range(len(messages) - 1, -1, -1):
+            if messages[index] is self._anchor:
+                used = sum(counts[index:])
+                if index <= max(last_start, 0) and used <= budget:
+                    return index, used
+                break
+        return None, 0
+
+    def _window_start(
+        self, messages: List[Dict[str, Any]], counts: List[int], budget: int
+    ) -> Tuple[int, int]:
+        """Earliest start that keeps the messages from it within budget"""
+        start = max(len(messages) - self.pinned_messages, 0)
+        used = sum(counts[start:])
+        while start > 0 and used + counts[start - 1] <= budget:
+            start -= 1
+            used += counts[start]
+        # Open the window on a user turn; some providers reject anything else
+        while start < len(messages) - 1 and messages[start]["role"] != "user":
+            used -= counts[start]
+            start += 1
+        return start, used
+
+    def _report(self, messages: List[Dict[str, Any]], tokens: int):
+        self._turns += 1
+        self.last_prompt_tokens = tokens
+        logger.info(
+            f"Prompt: ~{tokens} tokens in {len(messages)} messages "
+            f"(full history ~{self.last_history_tokens} tokens)."
+        )
+        return messages
+
+    def _condense(self, dropped: List[Dict[str, Any]]) -> str:
+        """Summarise dropped messages, newest first, within summary_tokens"""
+        if not dropped or self.summary_tokens <= 0:
+            return ""
+        lines = []
+        remaining = self.summary_tokens
+        for message in reversed(dropped):
+            text = " ".join(_text_of(message).split())
+            if not text:
+                continue
+            if len(text) > self.SUMMARY_SNIPPET_CHARS:
+                text = text[: self.SUMMARY_SNIPPET_CHARS].rstrip() + "..."
+            line = f"- {message.get('name') or message['role']}: {text}"
+            remaining -= estimate_text_tokens(line)
+            if remaining < 0:
+                break
+            lines.append(line)
+        if not lines:
+            return ""
+        lines.reverse()
+        return (
+            f"[Earlier conversation, {len(dropped)} messages condensed]\n"
+            + "\n".join(lines)
+        )
+
+    @staticmethod
+    def _with_note(message: Dict[str, Any], note: str) -> Dict[str, Any]:
+        """Return a copy of `message` with the note in front of its content"""
+        content = message.get("content")
+        if isinstance(content, str):
+            content = f"{note}\n\n{content}"
+        else:
+            content = [{"type": "text", "text": note}] + list(content or [])
+        return {**message, "content": content}
+
+    def stats(self) -> Dict[str, int]:
+        """Prompt size of the last turn and how often the budget applied"""
+        return {
+            "turns": self._turns,
+            "trimmed_turns": self._trimmed_turns,
+            "dropped_messages": self._dropped_messages,
+            "last_prompt_tokens": self.last_prompt_tokens,
+            "last_history_tokens": self.last_history_tokens,
+        }
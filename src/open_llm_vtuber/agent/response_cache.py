@@ -0,0 +1,279 @@
+"""
+Cache of complete agent replies.
+
+Viewers and users often send the same few lines ("hi", "how are you?",
+"what's your name?"). With the cache enabled for a character, the reply
+the LLM gave to such an input is stored, and the next time the same input
+arrives in the same situation the stored reply is streamed back instead of
+calling the LLM. The reply still goes through the agent's sentence
+divider and output transformers, and its sentences usually hit the TTS
+cache, so it starts playing at once.
+
+A reply is reused only for the same character and the same situation:
+the key combines the normalised input, a hash of the system prompt and,
+optionally, a fingerprint of the last few messages before it.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from ..config_manager import ResponseCacheConfig
+
+# Replies the LLM classes produce when the request failed; never cached
+_ERROR_PREFIXES = ("Error calling", "[Error")
+
+
+def normalize_input(text: str) -> str:
+    """Normalise user input for cache keys: NFKC, lowercase, no punctuation"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return " ".join(re.sub(r"[^\w\s]+", " ", text).split())
+
+
+class ResponseCache:
+    """
+    TTL-bounded, two-tier LRU cache of agent replies.
+
+    - memory: up to `memory_max_entries` replies
+    - disk: one JSON file per reply in `cache_dir`, up to
+      `disk_max_entries`; survives restarts
+
+    Entries older than `ttl_seconds` are dropped when they are looked up
+    and when the disk tier is indexed. All methods are thread safe; the
+    async wrappers run disk I/O in a worker thread.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "cache/response_cache",
+        memory_max_entries: int = 256,
+        disk_max_entries: int = 4096,
+        ttl_seconds: float = 7 * 24 * 3600,
+        context_messages: int = 2,
+    ):
+        self.cache_dir = cache_dir
+        self.memory_max_entries = memory_max_entries
+        self.disk_max_entries = disk_max_entries
+        self.ttl_seconds = ttl_seconds
+        self.context_messages = context_messages
+
+        self._lock = threading.Lock()
+        # key -> (created timestamp, reply)
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        # key -> file path
+        self._disk: OrderedDict[str, str] = OrderedDict()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+
+        if self.disk_max_entries > 0:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _load_disk_index(self) -> None:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".json"):
+                entries.append((entry.stat().st_mtime, entry.path))
+        now = time.time()
+        with self._lock:
+            for mtime, path in sorted(entries):
+                key = os.path.splitext(os.path.basename(path))[0]
+                self._disk[key] = path
+                if self._is_expired(mtime, now):
+                    self._drop_disk_entry(key)
+            self._evict_disk()
+        logger.info(
+            f"Response cache: indexed {len(self._disk)} replies in {self.cache_dir}"
+        )
+
+    def make_key(
+        self,
+        user_input: str,
+        system_prompt: str,
+        history: Optional[List[Dict[str, Any]]] = None,
+    ) -> Optional[str]:
+        """
+        Build the cache key for an input, or None if it should not be cached.
+
+        Args:
+            user_input: The text prompt the agent is about to answer.
+            system_prompt: The agent's system prompt; identifies the persona.
+            history: The conversation so far, without the new input. Its
+                last `context_messages` messages are part of the key.
+
+        Returns:
+            str | None: A hex digest, or None for empty input.
+        """
+        normalized = normalize_input(user_input)
+        if not normalized:
+            return None
+        context = []
+        if self.context_messages > 0 and history:
+            context = [
+                [message.get("role"), normalize_input(str(message.get("content")))]
+                for message in history[-self.context_messages :]
+            ]
+        material = json.dumps(
+            [
+                hashlib.sha256(system_prompt.encode("utf-8")).hexdigest(),
+                context,
+                normalized,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _is_expired(self, created: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and now - created > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up a reply, promoting disk hits into memory"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                created, reply = entry
+                if not self._is_expired(created, now):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return reply
+                del self._memory[key]
+                if key in self._disk:
+                    self._drop_disk_entry(key)
+                self.expired += 1
+                self.misses += 1
+                return None
+
+            path = self._disk.get(key)
+            if path is not None:
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    created, reply = float(data["created"]), str(data["reply"])
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Response cache: failed to read {path}: {e}")
+                    self._drop_disk_entry(key)
+                else:
+                    if not self._is_expired(created, now):
+                        self._disk.move_to_end(key)
+                        self.disk_hits += 1
+                        self._put_memory(key, created, reply)
+                        return reply
+                    self._drop_disk_entry(key)
+                    self.expired += 1
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, reply: str) -> None:
+        """Store a complete reply in both tiers"""
+        if not reply.strip() or reply.lstrip().startswith(_ERROR_PREFIXES):
+            return
+        created = time.time()
+        with self._lock:
+            self._put_memory(key, created, reply)
+            self.stores += 1
+            if self.disk_max_entries > 0:
+                path = os.path.join(self.cache_dir, f"{key}.json")
+                try:
+                    with open(path, "w", encoding="utf-8") as f:
+                        json.dump(
+                            {"created": created, "reply": reply}, f, ensure_ascii=False
+                        )
+                except OSError as e:
+                    logger.warning(f"Response cache: failed to write {path}: {e}")
+                    return
+                self._disk[key] = path
+                self._disk.move_to_end(key)
+                self._evict_disk()
+
+    async def aget(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, reply: str) -> None:
+        await asyncio.to_thread(self.put, key, reply)
+
+    def _put_memory(self, key: str, created: float, reply: str) -> None:
+        if self.memory_max_entries <= 0:
+            return
+        self._memory[key] = (created, reply)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self) -> None:
+        while len(self._disk) > self.disk_max_entries:
+            self._drop_disk_entry(next(iter(self._disk)))
+
+    def _drop_disk_entry(self, key: str) -> None:
+        path = self._disk.pop(key)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Response cache: failed to remove {path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "stores": self.stores,
+                "hit_rate": (
+                    (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+                ),
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk),
+            }
+
+
+# One cache per directory, shared by every agent that uses it
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(config: ResponseCacheConfig) -> Optional[ResponseCache]:
+    """
+    Return the shared cache for a character's config, or None if disabled.
+
+    Characters that use the same directory share one cache; their replies
+    are kept apart by the system prompt hash in the key. The limits of the
+    most recent config apply.
+    """
+    if not config.enabled:
+        return None
+    with _caches_lock:
+        cache = _caches.get(config.cache_dir)
+        if cache is None:
+            cache = ResponseCache(
+                cache_dir=config.cache_dir,
+                memory_max_entries=config.memory_max_entries,
+                disk_max_entries=config.disk_max_entries,
+                ttl_seconds=config.ttl_seconds,
+                context_messages=config.context_messages,
+            )
+            _caches[config.cache_dir] = cache
+        else:
+            cache.memory_max_entries = config.memory_max_entries
+            cache.disk_max_entries = config.disk_max_entries
+            cache.ttl_seconds = config.ttl_seconds
+            cache.context_messages = config.context_messages
+        return cache
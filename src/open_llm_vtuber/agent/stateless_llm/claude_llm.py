@@ -7,9 +7,11 @@ import json
 from typing import AsyncIterator, List, Dict, Any
 
 from loguru import logger
-from anthropic import AsyncAnthropic, NOT_GIVEN
+from anthropic import NOT_GIVEN
 
 from .stateless_llm_interface import StatelessLLMInterface
+from .client_registry import get_anthropic_client
+from .prompt_cache import PromptCacheStats, add_cache_breakpoints
 
 
 class AsyncLLM(StatelessLLMInterface):
@@ -19,6 +21,7 @@ class AsyncLLM(StatelessLLMInterface):
         base_url: str = None,
         llm_api_key: str = None,
         system: str = None,
+        prompt_caching: bool = True,
     ):
         """
         Initialize Claude LLM.
@@ -28,13 +31,17 @@ class AsyncLLM(StatelessLLMInterface):
             base_url (str): Base URL for Claude API
             llm_api_key (str): Claude API key
             system (str): System prompt
+            prompt_caching (bool): Mark the stable prefix of each request
+                for Anthropic's prompt cache
         """
         self.model = model
         self.system = system
+        self.prompt_caching = prompt_caching
+        self.cache_stats = PromptCacheStats()
 
         # Initialize Claude client
-        self.client = AsyncAnthropic(
-            api_key=llm_api_key, base_url=base_url if base_url else None
+        self.client = get_anthropic_client(
+            base_url=base_url if base_url else None, api_key=llm_api_key
         )
 
         logger.info(f"Initialized Claude AsyncLLM with model: {self.model}")
@@ -116,12 +123,18 @@ class AsyncLLM(StatelessLLMInterface):
                 if msg["role"] != "system"
             ]
 
+            system_prompt = system if system else (self.system if self.system else "")
+            if self.prompt_caching:
+                system_prompt, converted_messages, tools = add_cache_breakpoints(
+                    system_prompt, converted_messages, tools
+                )
+
             logger.debug(f"Sending messages to Claude API: {converted_messages}")
             logger.debug(f"Tools provided: {tools}")
 
             async with self.client.messages.stream(
                 messages=converted_messages,
-                system=system if system else (self.system if self.system else ""),
+                system=system_prompt,
                 model=self.model,
                 max_tokens=1024,
                 tools=tools if tools else NOT_GIVEN,
@@ -132,6 +145,7 @@ class AsyncLLM(StatelessLLMInterface):
                 async for event in stream:
                     if event.type == "message_start":
                         logger.debug("Stream: message_start")
+                        self.cache_stats.record(event.message.usage)
                         yield {
                             "type": "message_start",
                             "data": event.message.model_dump(exclude_none=True),
@@ -244,3 +258,7 @@ class AsyncLLM(StatelessLLMInterface):
 
         # No finally block needed for stream.close() due to async with
         logger.debug("Chat completion stream processing finished.")
+
+    def get_prompt_cache_stats(self) -> Dict[str, Any]:
+        """Return the input tokens of this LLM's requests and how many were cached"""
+        return self.cache_stats.get_stats()
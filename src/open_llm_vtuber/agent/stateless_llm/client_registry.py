@@ -0,0 +1,166 @@
+"""
+Shared SDK clients for the LLM backends.
+
+Creating an `AsyncOpenAI` or `AsyncAnthropic` client also creates an
+HTTP connection pool, so an LLM object that builds its own client starts
+with no open connections, and its first request pays for the TCP and TLS
+handshakes. Every character, every agent and every config switch used to
+do that.
+
+This registry hands out one client per (provider, base_url, credentials).
+LLM objects built for the same endpoint and key share it, together with
+its warm keep-alive connections. HTTP/2 is used when the `h2` package is
+installed.
+
+Clients keep the SDKs' default connection limits unless a caller asks for
+a pool size. A shared client has to serve every caller, so a request for
+more connections (or for keep-alive) than the current client allows
+replaces it with a larger one for new callers; a request for fewer is
+logged and ignored.
+"""
+
+import importlib.util
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from loguru import logger
+
+# The openai and anthropic SDKs' own limits, used unless a size is asked for
+DEFAULT_MAX_CONNECTIONS = 1000
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 100
+# Seconds an idle connection stays open for reuse
+KEEPALIVE_EXPIRY = 120.0
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+ClientKey = Tuple[str, Optional[str], Tuple[Optional[str], ...]]
+
+# key -> (client, max connections, keep-alive)
+_clients: Dict[ClientKey, Tuple[Any, int, bool]] = {}
+# Clients replaced by larger ones; LLM objects may still use them
+_retired: List[Any] = []
+_lock = threading.Lock()
+
+
+def _http_client_options(max_connections: int, keep_alive: bool) -> Dict[str, Any]:
+    return {
+        "limits": httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=(
+                min(max_connections, DEFAULT_MAX_KEEPALIVE_CONNECTIONS)
+                if keep_alive
+                else 0
+            ),
+            keepalive_expiry=KEEPALIVE_EXPIRY,
+        ),
+        "http2": _HTTP2_AVAILABLE,
+    }
+
+
+def _get_or_create(
+    key: ClientKey,
+    create: Callable[[Dict[str, Any]], Any],
+    pool_size: Optional[int],
+    keep_alive: bool,
+) -> Any:
+    size = pool_size or DEFAULT_MAX_CONNECTIONS
+    endpoint = key[1] or "the default endpoint"
+    with _lock:
+        entry = _clients.get(key)
+        if entry is not None:
+            client, current_size, current_keep_alive = entry
+            if size <= current_size and (current_keep_alive or not keep_alive):
+                if size < current_size or keep_alive != current_keep_alive:
+                    logger.info(
+                        f"Shared {key[0]} client for {endpoint} already allows "
+                        f"{current_size} connections (keep-alive: "
+                        f"{current_keep_alive}); ignoring the request for {size} "
+                        f"(keep-alive: {keep_alive})"
+                    )
+                else:
+                    logger.debug(f"Reusing shared {key[0]} client for {endpoint}")
+                return client
+            # Grow: the new client must also serve the earlier callers
+            _retired.append(client)
+            size = max(size, current_size)
+            keep_alive = keep_alive or current_keep_alive
+            logger.info(
+                f"Replacing shared {key[0]} client for {endpoint} to allow "
+                f"{size} connections (keep-alive: {keep_alive})"
+            )
+        client = create(_http_client_options(size, keep_alive))
+        _clients[key] = (client, size, keep_alive)
+        logger.debug(
+            f"Created shared {key[0]} client for {endpoint} with {size} connections"
+            f" (HTTP/2: {_HTTP2_AVAILABLE})"
+        )
+        return client
+
+
+def get_openai_client(
+    base_url: Optional[str],
+    api_key: Optional[str],
+    organization: Optional[str] = None,
+    project: Optional[str] = None,
+    pool_size: Optional[int] = None,
+    keep_alive: bool = True,
+):
+    """
+    Return the shared `AsyncOpenAI` client for an endpoint and key.
+
+    Per-request settings such as the timeout should be applied with
+    `client.with_options(...)`, which keeps the shared connection pool.
+    `pool_size` is the number of concurrent requests needed; None keeps
+    the SDK default.
+    """
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    key = ("openai", base_url, (api_key, organization, project))
+    return _get_or_create(
+        key,
+        lambda options: AsyncOpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            organization=organization,
+            project=project,
+            http_client=DefaultAsyncHttpxClient(**options),
+        ),
+        pool_size,
+        keep_alive,
+    )
+
+
+def get_anthropic_client(
+    base_url: Optional[str],
+    api_key: Optional[str],
+    pool_size: Optional[int] = None,
+    keep_alive: bool = True,
+):
+    """Return the shared `AsyncAnthropic` client for an endpoint and key"""
+    from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient
+
+    key = ("anthropic", base_url, (api_key,))
+    return _get_or_create(
+        key,
+        lambda options: AsyncAnthropic(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=DefaultAsyncHttpxClient(**options),
+        ),
+        pool_size,
+        keep_alive,
+    )
+
+
+async def close_llm_clients() -> None:
+    """Close every shared client and its connections"""
+    with _lock:
+        clients = [entry[0] for entry in _clients.values()] + _retired
+        _clients.clear()
+        _retired.clear()
+    for client in clients:
+        try:
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Failed to close LLM client: {e}")
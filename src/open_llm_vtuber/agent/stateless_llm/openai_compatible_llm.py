@@ -6,7 +6,6 @@ endpoints for language generation.
 from typing import AsyncIterator, List, Dict, Any
 from openai import (
     AsyncStream,
-    AsyncOpenAI,
     APIError,
     APIConnectionError,
     RateLimitError,
@@ -18,6 +17,7 @@ from openai.types.chat.chat_completion_chunk import ChoiceDeltaToolCall
 from loguru import logger
 
 from .stateless_llm_interface import StatelessLLMInterface
+from .client_registry import get_openai_client
 from ...mcpp.types import ToolCallObject
 
 
@@ -45,11 +45,11 @@ class AsyncLLM(StatelessLLMInterface):
         self.base_url = base_url
         self.model = model
         self.temperature = temperature
-        self.client = AsyncOpenAI(
+        self.client = get_openai_client(
             base_url=base_url,
+            api_key=llm_api_key,
             organization=organization_id,
             project=project_id,
-            api_key=llm_api_key,
         )
         self.support_tools = True
 
@@ -0,0 +1,111 @@
+"""
+Prompt caching for the Claude API.
+
+Anthropic caches the processed prefix of a request up to each block marked
+with `cache_control`, and a later request whose prompt starts with exactly
+the same tools, system prompt and messages reads that prefix back at a
+fraction of the cost and latency. The agents keep their prompts in that
+order: the system prompt (persona, expression and tool prompts) does not
+change between turns, the history only grows at the end (see
+`ContextWindow`), and context that changes every turn, such as retrieved
+memories, is sent after the user's input.
+
+`add_cache_breakpoints` marks the three stable parts of a request, and
+`PromptCacheStats` adds up the cached-token counts the API reports back.
+Prompts shorter than the model's minimum cacheable length are sent as
+usual; the API ignores the breakpoints.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+EPHEMERAL = {"type": "ephemeral"}
+
+
+def _with_breakpoint(message: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of `message` whose last content block is a breakpoint"""
+    content = message.get("content")
+    if isinstance(content, str):
+        blocks = [{"type": "text", "text": content}]
+    else:
+        blocks = list(content or [])
+    if not blocks:
+        return message
+    blocks[-1] = {**blocks[-1], "cache_control": EPHEMERAL}
+    return {**message, "content": blocks}
+
+
+def add_cache_breakpoints(
+    system: str,
+    messages: List[Dict[str, Any]],
+    tools: Optional[List[Dict[str, Any]]] = None,
+) -> Tuple[Any, List[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
+    """
+    Mark the stable prefix of a Claude request for caching.
+
+    Breakpoints go on the last tool, on the system prompt and on the last
+    message before the one being answered, which is the end of the part
+    the next turn will repeat. The arguments are not modified.
+
+    Returns:
+        Tuple: The system prompt as content blocks (or "" if empty), the
+        messages and the tools, ready for `messages.create`/`stream`.
+    """
+    if tools:
+        tools = [*tools[:-1], {**tools[-1], "cache_control": EPHEMERAL}]
+    system_blocks: Any = ""
+    if system:
+        system_blocks = [{"type": "text", "text": system, "cache_control": EPHEMERAL}]
+    if len(messages) >= 2:
+        messages = [*messages[:-2], _with_breakpoint(messages[-2]), messages[-1]]
+    return system_blocks, messages, tools
+
+
+class PromptCacheStats:
+    """Input token counts of an LLM's requests, split by cache use"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.input_tokens = 0
+        self.cache_read_tokens = 0
+        self.cache_creation_tokens = 0
+
+    def record(self, usage: Any) -> None:
+        """Add the `usage` of a Claude response (object or dict)"""
+
+        def field(name: str) -> int:
+            value = (
+                usage.get(name) if isinstance(usage, dict) else getattr(usage, name, 0)
+            )
+            return value or 0
+
+        uncached = field("input_tokens")
+        read = field("cache_read_input_tokens")
+        created = field("cache_creation_input_tokens")
+        with self._lock:
+            self.requests += 1
+            self.input_tokens += uncached
+            self.cache_read_tokens += read
+            self.cache_creation_tokens += created
+        total = uncached + read + created
+        logger.info(
+            f"Prompt cache: {read} of {total} input tokens read from cache, "
+            f"{created} written."
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return token totals and the share of input tokens read from cache"""
+        with self._lock:
+            total = (
+                self.input_tokens + self.cache_read_tokens + self.cache_creation_tokens
+            )
+            return {
+                "requests": self.requests,
+                "input_tokens": total,
+                "cache_read_tokens": self.cache_read_tokens,
+                "cache_creation_tokens": self.cache_creation_tokens,
+                "cached_ratio": self.cache_read_tokens / total if total else 0.0,
+            }
@@ -4,13 +4,13 @@ compatible endpoints for language generation where the language model is not
 trained using a ChatML format.
 """
 
-import requests
 import json
 from jinja2 import Template
 from loguru import logger
-from typing import AsyncIterator, List, Dict, Any
+from typing import AsyncIterator, List, Dict, Any, Tuple
 
 from .stateless_llm_interface import StatelessLLMInterface
+from ...utils.http_pool import get_http_pool
 
 
 TEMPLATES = {
@@ -27,6 +27,8 @@ TEMPLATES = {
             ]
         ),
         "eot_token": "<|eot_id|>",
+        # Each message renders the same wherever it is in the list
+        "incremental": True,
     },
     "CHATML": {
         "template": "".join(
@@ -41,6 +43,7 @@ TEMPLATES = {
             ]
         ),
         "eot_token": "<|im_end|>",
+        "incremental": True,
     },
     "ALPACA": {
         "template": "".join(
@@ -79,10 +82,15 @@ TEMPLATES = {
             ]
         ),
         "eot_token": "###",
+        # The system prompt and the separators depend on the whole list
+        "incremental": False,
     },
 }
 
 
+BOS_TOKEN = "<|begin_of_text|>"
+
+
 class AsyncLLMWithTemplate(StatelessLLMInterface):
     def __init__(
         self,
@@ -111,6 +119,19 @@ class AsyncLLMWithTemplate(StatelessLLMInterface):
         self.temperature = temperature
         self.template = Template(TEMPLATES[template]["template"])
         self.eot_token = TEMPLATES[template]["eot_token"]
+        self.incremental = TEMPLATES[template]["incremental"]
+        # Messages of the last prompt and their rendering, without the
+        # generation prompt. The next turn starts with the same messages,
+        # so only the ones added since then need rendering.
+        self._rendered_messages: List[Tuple[str, Any]] = []
+        self._rendered_prefix = ""
+        if self.incremental:
+            self._empty_prompt = self.template.render(
+                messages=[], bos_token=BOS_TOKEN, add_generation_prompt=False
+            )
+            self._generation_prompt = self.template.render(
+                messages=[], bos_token="", add_generation_prompt=True
+            )
         self.prompt_headers = {
             "Authorization": llm_api_key or "Bearer your_api_key_here"
         }
@@ -137,8 +158,6 @@ class AsyncLLMWithTemplate(StatelessLLMInterface):
         - APIError: For other API-related errors
         """
         logger.debug(f"Messages: {messages}")
-        bos_token = "<|begin_of_text|>"
-        stream = None
         try:
             # If system prompt is provided, add it to the messages
             messages_with_system: List[Dict[str, Any]] = messages
@@ -147,47 +166,77 @@ class AsyncLLMWithTemplate(StatelessLLMInterface):
                     {"role": "system", "content": system},
                     *messages,
                 ]
-            prompt = self.template.render(
-                messages=messages_with_system,
-                bos_token=bos_token,
-                add_generation_prompt=True,
-            )
             data: Dict = {
                 "stream": True,
                 "temperature": self.temperature,
-                "prompt": prompt,
+                "prompt": self._render_prompt(messages_with_system),
             }
-            with requests.post(
-                self.completion_url, headers=self.prompt_headers, json=data, stream=True
+            # Leaving this block, including when the consumer stops
+            # iterating on interrupt, closes the response, so the server
+            # stops generating tokens nobody will read.
+            async with get_http_pool().stream(
+                "POST", self.completion_url, headers=self.prompt_headers, json=data
             ) as response:
-                for line in response.iter_lines():
-                    if line:
-                        line = self._clean_raw_bytes(line)
-                        next_token = self._process_line(line)
-                        if next_token:
-                            if next_token == self.eot_token:
-                                break
-                            yield next_token
+                if response.status_code >= 400:
+                    body = await response.aread()
+                    raise RuntimeError(
+                        f"HTTP {response.status_code}: {body.decode(errors='replace')}"
+                    )
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    line = self._clean_raw_line(line)
+                    if line is None:
+                        continue
+                    next_token = self._process_line(line)
+                    if next_token:
+                        if next_token == self.eot_token:
+                            break
+                        yield next_token
         except Exception as e:
             logger.error(f"LLM API WITH TEMPLATE: Error occurred: {e}")
-            logger.info(f"Base URL: {self.base_url}")
+            logger.info(f"Base URL: {self.completion_url}")
             logger.info(f"Model: {self.model}")
             logger.info(f"Messages: {messages}")
             logger.info(f"temperature: {self.temperature}")
             yield "Error calling the chat endpoint: Error occurred while generating response. See the logs for details."
-        finally:
-            # make sure the stream is properly closed
-            # so when interrupted, no more tokens will being generated.
-            if stream:
-                logger.debug("Chat completion finished.")
-                await stream.close()
-                logger.debug("Stream closed.")
-
-    def _clean_raw_bytes(self, line):
-        line = line.decode("utf-8")
+
+    def _render_prompt(self, messages: List[Dict[str, Any]]) -> str:
+        """
+        Render the prompt, reusing the rendering of the previous turn.
+
+        Conversation history only grows at the end between turns, so for
+        templates that render each message independently the previous
+        prompt (without its generation prompt) is a prefix of this one.
+        """
+        if not self.incremental:
+            return self.template.render(
+                messages=messages, bos_token=BOS_TOKEN, add_generation_prompt=True
+            )
+
+        keys = [(message["role"], message["content"]) for message in messages]
+        cached = len(self._rendered_messages)
+        if cached and keys[:cached] == self._rendered_messages:
+            prefix = self._rendered_prefix
+        else:
+            cached = 0
+            prefix = self._empty_prompt
+        if len(keys) > cached:
+            prefix += self.template.render(
+                messages=messages[cached:], bos_token="", add_generation_prompt=False
+            )
+        self._rendered_messages = keys
+        self._rendered_prefix = prefix
+        return prefix + self._generation_prompt
+
+    def _clean_raw_line(self, line: str):
         line = line.removeprefix("data: ")
-        line = json.loads(line)
-        return line
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            # Keep-alive comments and end-of-stream markers
+            logger.debug(f"Skipping non-JSON stream line: {line}")
+            return None
 
     def _process_line(self, line):
         if not (("stop" in line) and (line["stop"])):
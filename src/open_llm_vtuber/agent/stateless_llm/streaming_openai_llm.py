@@ -4,11 +4,12 @@
 import asyncio
 import time
 from typing import AsyncIterator, List, Dict, Any, Optional
-from openai import AsyncOpenAI, AsyncStream
+from openai import AsyncStream
 from openai.types.chat import ChatCompletionChunk
 from loguru import logger
 
 from .stateless_llm_interface import StatelessLLMInterface
+from .client_registry import get_openai_client
 
 
 class StreamingOpenAILLM(StatelessLLMInterface):
@@ -36,7 +37,7 @@ class StreamingOpenAILLM(StatelessLLMInterface):
         immediate_audio_playback: bool = True,
         # 性能优化
         max_wait_time: int = 3,
-        connection_pool_size: int = 5,
+        connection_pool_size: Optional[int] = None,
         keep_alive: bool = True,
     ):
         """初始化流式OpenAI LLM"""
@@ -67,11 +68,12 @@ class StreamingOpenAILLM(StatelessLLMInterface):
         self.keep_alive = keep_alive
         
         # 初始化客户端
-        self.client = AsyncOpenAI(
+        self.client = get_openai_client(
             base_url=base_url,
             api_key=llm_api_key,
-            timeout=timeout,
-        )
+            pool_size=connection_pool_size,
+            keep_alive=keep_alive,
+        ).with_options(timeout=timeout)
         
         # 性能指标
         self.first_response_times = []
@@ -73,6 +73,7 @@ class LLMFactory:
                 base_url=kwargs.get("base_url"),
                 model=kwargs.get("model"),
                 llm_api_key=kwargs.get("llm_api_key"),
+                prompt_caching=kwargs.get("prompt_caching", True),
             )
         else:
             raise ValueError(f"Unsupported LLM provider: {llm_provider}")
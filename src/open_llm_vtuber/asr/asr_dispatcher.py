@@ -0,0 +1,236 @@
+import asyncio
+import bisect
+import heapq
+import itertools
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+if TYPE_CHECKING:
+    from .asr_interface import ASRInterface
+
+DEFAULT_MAX_CONCURRENCY = 2
+DEFAULT_DEADLINE_SECONDS = 30.0
+
+
+class ASRJobExpired(TimeoutError):
+    """An ASR job waited in the queue past its deadline and was dropped"""
+
+
+class LatencyHistogram:
+    """Counts of observed durations in fixed buckets, in seconds"""
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self) -> None:
+        # One count per bucket plus one for values above the last bound
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"<={bound}" for bound in self.BUCKETS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "avg": self.total / self.count if self.count else 0.0,
+            "max": self.max,
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass(order=True)
+class _Job:
+    # Audio duration added to the arrival time: short utterances overtake
+    # long ones that arrived a little earlier, but a long one is never
+    # overtaken by audio that arrives more than its own length later
+    sort_key: float
+    seq: int
+    deadline: Optional[float] = field(compare=False)
+    enqueued_at: float = field(compare=False, default_factory=time.monotonic)
+    grant: asyncio.Future = field(
+        compare=False,
+        default_factory=lambda: asyncio.get_running_loop().create_future(),
+    )
+
+
+class ASRDispatcher:
+    """
+    Runs the transcriptions of one ASR engine on its own sized thread pool.
+
+    Only `max_concurrency` jobs run at once, so the executor never queues
+    work behind the scenes. Waiting jobs are served shortest utterance
+    first (see `_Job.sort_key`). A job still queued when its deadline
+    passes is dropped with `ASRJobExpired`, and a job whose caller is
+    cancelled (e.g. the client interrupted) leaves the queue without ever
+    reaching the engine.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        deadline_seconds: float = DEFAULT_DEADLINE_SECONDS,
+        name: str = "asr",
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.deadline_seconds = deadline_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix=name
+        )
+
+        self._queue: List[_Job] = []
+        self._seq = itertools.count()
+        self._running = 0
+
+        self.completed = 0
+        self.cancelled = 0
+        self.expired = 0
+        self.failed = 0
+        self.queue_wait = LatencyHistogram()
+        self.decode_time = LatencyHistogram()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(not job.grant.done() for job in self._queue)
+
+    async def transcribe(
+        self,
+        transcribe_np: Callable[[np.ndarray], str],
+        audio: np.ndarray,
+        sample_rate: int,
+        deadline_seconds: Optional[float] = None,
+    ) -> str:
+        """
+        Queue a transcription and run it once a slot is free.
+
+        Args:
+            transcribe_np: The engine's blocking transcription function.
+            audio: The utterance to transcribe.
+            sample_rate: Sample rate of `audio`, used to rank jobs by duration.
+            deadline_seconds: How long the job may wait in the queue.
+                Defaults to the dispatcher's; 0 or less waits forever.
+
+        Raises:
+            ASRJobExpired: If the job was still queued at its deadline.
+        """
+        if deadline_seconds is None:
+            deadline_seconds = self.deadline_seconds
+        now = time.monotonic()
+        job = _Job(
+            sort_key=now + len(audio) / sample_rate,
+            seq=next(self._seq),
+            deadline=now + deadline_seconds if deadline_seconds > 0 else None,
+            enqueued_at=now,
+        )
+        heapq.heappush(self._queue, job)
+        self._dispatch()
+
+        try:
+            await job.grant
+        except asyncio.CancelledError:
+            if job.grant.done() and not job.grant.cancelled():
+                # Granted in the same loop iteration we were cancelled in
+                self._release()
+            else:
+                # Left in the heap; _dispatch skips it
+                self.cancelled += 1
+            raise
+
+        self.queue_wait.observe(time.monotonic() - job.enqueued_at)
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        future = self._executor.submit(transcribe_np, audio)
+        # The slot is freed when the worker thread is done, not when this
+        # coroutine is: a cancelled caller does not stop a running decode
+        future.add_done_callback(lambda _: self._release_threadsafe(loop))
+        try:
+            text = await asyncio.wrap_future(future)
+        except Exception:
+            self.failed += 1
+            raise
+        self.decode_time.observe(time.monotonic() - start)
+        self.completed += 1
+        return text
+
+    def _dispatch(self) -> None:
+        while self._running < self.max_concurrency and self._queue:
+            job = heapq.heappop(self._queue)
+            if job.grant.done():
+                continue
+            if job.deadline is not None and time.monotonic() > job.deadline:
+                self.expired += 1
+                waited = time.monotonic() - job.enqueued_at
+                logger.warning(f"Dropped an ASR job that waited {waited:.1f}s")
+                job.grant.set_exception(
+                    ASRJobExpired(f"ASR job expired after waiting {waited:.1f}s")
+                )
+                continue
+            self._running += 1
+            job.grant.set_result(None)
+
+    def _release(self) -> None:
+        self._running -= 1
+        self._dispatch()
+
+    def _release_threadsafe(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            # The loop is closed; nothing is left to dispatch
+            pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue depth, outcome counts and latency histograms"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self._running,
+            "queue_depth": self.queue_depth,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "expired": self.expired,
+            "failed": self.failed,
+            "queue_wait": self.queue_wait.snapshot(),
+            "decode_time": self.decode_time.snapshot(),
+        }
+
+
+# One dispatcher per engine instance, shared by every session using the engine
+_dispatchers: "weakref.WeakKeyDictionary[ASRInterface, ASRDispatcher]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def set_asr_dispatcher(
+    asr_engine: "ASRInterface",
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    deadline_seconds: float = DEFAULT_DEADLINE_SECONDS,
+) -> ASRDispatcher:
+    """Create the dispatcher for a newly initialised ASR engine"""
+    dispatcher = ASRDispatcher(
+        max_concurrency=max_concurrency,
+        deadline_seconds=deadline_seconds,
+        name=f"asr-{type(asr_engine).__module__.rsplit('.', 1)[-1]}",
+    )
+    _dispatchers[asr_engine] = dispatcher
+    return dispatcher
+
+
+def get_asr_dispatcher(asr_engine: "ASRInterface") -> ASRDispatcher:
+    """Return the dispatcher of an ASR engine, creating a default one if needed"""
+    dispatcher = _dispatchers.get(asr_engine)
+    if dispatcher is None:
+        dispatcher = set_asr_dispatcher(asr_engine)
+    return dispatcher
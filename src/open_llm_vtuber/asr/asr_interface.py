@@ -1,7 +1,54 @@
 import abc
+from typing import Optional
+
 import numpy as np
 import asyncio
 
+from .asr_dispatcher import get_asr_dispatcher
+
+
+class ASRStream(metaclass=abc.ABCMeta):
+    """Incremental recognition of one utterance, fed while the user speaks.
+
+    Most of the utterance is decoded by the time it ends, so only the last
+    chunk is left to decode at the endpoint. Calls on one stream must not
+    overlap; use one stream per client and utterance.
+    """
+
+    async def async_accept_waveform(
+        self, audio: np.ndarray, sample_rate: int
+    ) -> Optional[str]:
+        """Asynchronously feed audio; see accept_waveform.
+
+        By default, this runs the synchronous accept_waveform in a coroutine.
+        """
+        return await asyncio.to_thread(self.accept_waveform, audio, sample_rate)
+
+    @abc.abstractmethod
+    def accept_waveform(self, audio: np.ndarray, sample_rate: int) -> Optional[str]:
+        """Feed the next chunk of the utterance and decode what is ready.
+
+        Args:
+            audio: float32 mono samples in [-1, 1].
+            sample_rate: Sample rate of `audio` in Hz.
+
+        Returns:
+            Optional[str]: The partial transcript if it changed, else None.
+        """
+        raise NotImplementedError
+
+    async def async_finalize(self) -> str:
+        """Asynchronously end the utterance; see finalize.
+
+        By default, this runs the synchronous finalize in a coroutine.
+        """
+        return await asyncio.to_thread(self.finalize)
+
+    @abc.abstractmethod
+    def finalize(self) -> str:
+        """Mark the end of the utterance and return the final transcript."""
+        raise NotImplementedError
+
 
 class ASRInterface(metaclass=abc.ABCMeta):
     SAMPLE_RATE = 16000
@@ -11,7 +58,9 @@ class ASRInterface(metaclass=abc.ABCMeta):
     async def async_transcribe_np(self, audio: np.ndarray) -> str:
         """Asynchronously transcribe speech audio in numpy array format.
 
-        By default, this runs the synchronous transcribe_np in a coroutine.
+        By default, this runs the synchronous transcribe_np on the engine's
+        ASR dispatcher, which bounds concurrency, serves short utterances
+        first and drops jobs that waited past their deadline.
         Subclasses can override this method to provide true async implementation.
 
         Args:
@@ -22,7 +71,9 @@ class ASRInterface(metaclass=abc.ABCMeta):
         """
         if audio.dtype != np.float32:
             audio = audio.astype(np.float32)
-        return await asyncio.to_thread(self.transcribe_np, audio)
+        return await get_asr_dispatcher(self).transcribe(
+            self.transcribe_np, audio, self.SAMPLE_RATE
+        )
 
     @abc.abstractmethod
     def transcribe_np(self, audio: np.ndarray) -> str:
@@ -33,6 +84,22 @@ class ASRInterface(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    def create_stream(self) -> ASRStream:
+        """Start incremental recognition of a new utterance.
+
+        This is optional. Engines with a streaming (online) model should
+        implement it, so audio can be decoded while it is being recorded.
+
+        Returns:
+            ASRStream: A stream for one utterance.
+        """
+        raise NotImplementedError
+
+    @property
+    def supports_streaming(self) -> bool:
+        """Whether this engine implements create_stream"""
+        return type(self).create_stream is not ASRInterface.create_stream
+
     def nparray_to_audio_file(
         self, audio: np.ndarray, sample_rate: int, file_path: str
     ) -> None:
@@ -2,7 +2,8 @@ import os
 import numpy as np
 import sherpa_onnx
 from loguru import logger
-from .asr_interface import ASRInterface
+from .asr_interface import ASRInterface, ASRStream
+from .sherpa_onnx_batcher import SherpaOnnxBatcher
 from .utils import download_and_extract, check_and_extract_local_file
 import onnxruntime
 
@@ -37,6 +38,9 @@ class VoiceRecognition(ASRInterface):
         feature_dim: int = 80,  # Feature dimension
         use_itn: bool = True,  # Use ITN for SenseVoice models
         provider: str = "cpu",  # Provider for inference (cpu or cuda)
+        streaming: bool = False,  # Use an online (streaming) model
+        max_batch_size: int = 8,  # Utterances decoded together, 1 disables batching
+        batch_window_ms: float = 10.0,  # How long an utterance waits for others
     ) -> None:
         self.model_type = model_type
         self.encoder = encoder
@@ -64,6 +68,7 @@ class VoiceRecognition(ASRInterface):
         self.SAMPLE_RATE = sample_rate
         self.feature_dim = feature_dim
         self.use_itn = use_itn
+        self.streaming = streaming
 
         # we need to find a way to get cuda version of sherpa-onnx before we can
         # use the gpu provider.
@@ -82,7 +87,20 @@ class VoiceRecognition(ASRInterface):
 
         self.recognizer = self._create_recognizer()
 
+        # Utterances from concurrent sessions share decode_streams calls
+        self.batcher = None
+        if not self.streaming and max_batch_size > 1:
+            self.batcher = SherpaOnnxBatcher(
+                self.recognizer,
+                self.SAMPLE_RATE,
+                max_batch_size=max_batch_size,
+                batch_window_ms=batch_window_ms,
+            )
+
     def _create_recognizer(self):
+        if self.streaming:
+            return self._create_online_recognizer()
+
         if self.model_type == "transducer":
             recognizer = sherpa_onnx.OfflineRecognizer.from_transducer(
                 encoder=self.encoder,
@@ -198,8 +216,117 @@ class VoiceRecognition(ASRInterface):
 
         return recognizer
 
+    def _create_online_recognizer(self):
+        """Create a recognizer for streaming models, which decode audio as it arrives"""
+        if self.model_type == "transducer":
+            return sherpa_onnx.OnlineRecognizer.from_transducer(
+                encoder=self.encoder,
+                decoder=self.decoder,
+                joiner=self.joiner,
+                tokens=self.tokens,
+                num_threads=self.num_threads,
+                sample_rate=self.SAMPLE_RATE,
+                feature_dim=self.feature_dim,
+                decoding_method=self.decoding_method,
+                hotwords_file=self.hotwords_file,
+                hotwords_score=self.hotwords_score,
+                modeling_unit=self.modeling_unit or "cjkchar",
+                bpe_vocab=self.bpe_vocab,
+                blank_penalty=self.blank_penalty,
+                debug=self.debug,
+                provider=self.provider,
+            )
+        elif self.model_type == "paraformer":
+            # Streaming paraformer models ship as separate encoder and decoder
+            return sherpa_onnx.OnlineRecognizer.from_paraformer(
+                encoder=self.encoder,
+                decoder=self.decoder,
+                tokens=self.tokens,
+                num_threads=self.num_threads,
+                sample_rate=self.SAMPLE_RATE,
+                feature_dim=self.feature_dim,
+                decoding_method=self.decoding_method,
+                debug=self.debug,
+                provider=self.provider,
+            )
+        elif self.model_type == "nemo_ctc":
+            return sherpa_onnx.OnlineRecognizer.from_nemo_ctc(
+                model=self.nemo_ctc,
+                tokens=self.tokens,
+                num_threads=self.num_threads,
+                sample_rate=self.SAMPLE_RATE,
+                feature_dim=self.feature_dim,
+                decoding_method=self.decoding_method,
+                debug=self.debug,
+                provider=self.provider,
+            )
+        else:
+            raise ValueError(
+                f"Model type {self.model_type} has no streaming version. "
+                "Use transducer, paraformer or nemo_ctc."
+            )
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.streaming
+
+    def create_stream(self) -> ASRStream:
+        if not self.streaming:
+            raise NotImplementedError("Streaming needs an online model")
+        return SherpaOnnxASRStream(self.recognizer, self.SAMPLE_RATE)
+
+    async def async_transcribe_np(self, audio: np.ndarray) -> str:
+        if self.batcher is None:
+            return await super().async_transcribe_np(audio)
+        if audio.dtype != np.float32:
+            audio = audio.astype(np.float32)
+        return await self.batcher.async_transcribe(audio)
+
     def transcribe_np(self, audio: np.ndarray) -> str:
+        if self.streaming:
+            stream = self.create_stream()
+            stream.accept_waveform(audio, self.SAMPLE_RATE)
+            return stream.finalize()
+
+        if self.batcher is not None:
+            return self.batcher.transcribe(audio)
+
         stream = self.recognizer.create_stream()
         stream.accept_waveform(self.SAMPLE_RATE, audio)
         self.recognizer.decode_streams([stream])
         return stream.result.text
+
+
+class SherpaOnnxASRStream(ASRStream):
+    """One utterance decoded incrementally by a sherpa-onnx online recognizer"""
+
+    # Silence fed after the utterance so the model emits its last tokens
+    TAIL_PADDING_SECONDS = 0.5
+
+    def __init__(self, recognizer, sample_rate: int) -> None:
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.stream = recognizer.create_stream()
+        self._partial = ""
+
+    def accept_waveform(self, audio: np.ndarray, sample_rate: int) -> str | None:
+        self.stream.accept_waveform(sample_rate, audio)
+        self._decode()
+        text = self.recognizer.get_result(self.stream)
+        if text == self._partial:
+            return None
+        self._partial = text
+        return text
+
+    def finalize(self) -> str:
+        tail = np.zeros(
+            int(self.TAIL_PADDING_SECONDS * self.sample_rate), dtype=np.float32
+        )
+        self.stream.accept_waveform(self.sample_rate, tail)
+        self.stream.input_finished()
+        self._decode()
+        return self.recognizer.get_result(self.stream)
+
+    def _decode(self) -> None:
+        while self.recognizer.is_ready(self.stream):
+            self.recognizer.decode_stream(self.stream)
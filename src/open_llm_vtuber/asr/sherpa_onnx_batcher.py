@@ -0,0 +1,131 @@
+"""
+Batch offline sherpa-onnx decoding across sessions.
+
+Every client shares one `sherpa_onnx.OfflineRecognizer`. Decoding each
+utterance on its own thread runs one small `decode_streams([stream])` per
+call, and concurrent calls compete for the same cores. `SherpaOnnxBatcher`
+instead collects the utterances submitted within a short window (or until
+`max_batch_size` is reached) and decodes them together in one
+`decode_streams` call on a dedicated thread. Results are handed back
+through futures.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+class SherpaOnnxBatcher:
+    """Decodes utterances from concurrent callers in shared batches"""
+
+    def __init__(
+        self,
+        recognizer,
+        sample_rate: int,
+        max_batch_size: int = 8,
+        batch_window_ms: float = 10.0,
+    ) -> None:
+        """
+        Args:
+            recognizer: A `sherpa_onnx.OfflineRecognizer`.
+            sample_rate: Sample rate of the submitted audio in Hz.
+            max_batch_size: Most utterances decoded in one call.
+            batch_window_ms: How long the first utterance of a batch waits
+                for others to join it.
+        """
+        self.recognizer = recognizer
+        self.sample_rate = sample_rate
+        self.max_batch_size = max(1, max_batch_size)
+        self.batch_window = batch_window_ms / 1000
+
+        self._queue: "queue.Queue[Tuple[np.ndarray, Future]]" = queue.Queue()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+        self.batches = 0
+        self.utterances = 0
+        self.max_batch_seen = 0
+
+    def submit(self, audio: np.ndarray) -> "Future[str]":
+        """Queue an utterance for decoding and return a future of its text"""
+        self._ensure_thread()
+        future: "Future[str]" = Future()
+        self._queue.put((audio, future))
+        return future
+
+    def transcribe(self, audio: np.ndarray) -> str:
+        """Decode an utterance in the next batch, blocking until it is done"""
+        return self.submit(audio).result()
+
+    async def async_transcribe(self, audio: np.ndarray) -> str:
+        """Decode an utterance in the next batch without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(audio))
+
+    def _ensure_thread(self) -> None:
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="sherpa-onnx-asr-batcher", daemon=True
+                )
+                self._thread.start()
+
+    def _collect(self) -> List[Tuple[np.ndarray, Future]]:
+        """Wait for one utterance, then for others until the window closes"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    # Window closed; still take whatever is already waiting
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = [
+                (audio, future)
+                for audio, future in self._collect()
+                if future.set_running_or_notify_cancel()
+            ]
+            if not batch:
+                continue
+            try:
+                streams = []
+                for audio, _ in batch:
+                    stream = self.recognizer.create_stream()
+                    stream.accept_waveform(self.sample_rate, audio)
+                    streams.append(stream)
+                self.recognizer.decode_streams(streams)
+            except Exception as e:
+                logger.error(f"Batched ASR decoding failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for stream, (_, future) in zip(streams, batch):
+                future.set_result(stream.result.text)
+            self.batches += 1
+            self.utterances += len(batch)
+            self.max_batch_seen = max(self.max_batch_seen, len(batch))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "utterances": self.utterances,
+            "avg_batch_size": (
+                round(self.utterances / self.batches, 2) if self.batches else 0.0
+            ),
+            "max_batch_size": self.max_batch_seen,
+            "queued": self._queue.qsize(),
+        }
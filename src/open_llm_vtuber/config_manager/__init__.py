@@ -7,7 +7,7 @@ and utility functions for loading/saving configurations.
 
 # Import main configuration classes
 from .main import Config
-from .system import SystemConfig
+from .system import SystemConfig, AudioFrontEndConfig
 from .character import CharacterConfig
 from .live import LiveConfig, BiliBiliLiveConfig
 from .stateless_llm import (
@@ -23,6 +23,7 @@ from .asr import (
     WhisperConfig,
     FunASRConfig,
     SherpaOnnxASRConfig,
+    SpeculativeStartConfig,
     GroqWhisperASRConfig,
 )
 from .tts import (
@@ -37,6 +38,8 @@ from .tts import (
     GPTSoVITSConfig,
     FishAPITTSConfig,
     SherpaOnnxTTSConfig,
+    TTSCacheConfig,
+    TTSProcessPoolConfig,
 )
 from .vad import (
     VADConfig,
@@ -49,6 +52,7 @@ from .agent import (
     AgentSettings,
     StatelessLLMConfigs,
     BasicMemoryAgentConfig,
+    ResponseCacheConfig,
     Mem0Config,
     Mem0VectorStoreConfig,
     Mem0LLMConfig,
@@ -68,6 +72,7 @@ __all__ = [
     # Main configuration classes
     "Config",
     "SystemConfig",
+    "AudioFrontEndConfig",
     "CharacterConfig",
     "LiveConfig",
     "BiliBiliLiveConfig",
@@ -80,6 +85,7 @@ __all__ = [
     "AgentSettings",
     "StatelessLLMConfigs",
     "BasicMemoryAgentConfig",
+    "ResponseCacheConfig",
     "Mem0Config",
     "Mem0VectorStoreConfig",
     "Mem0LLMConfig",
@@ -92,6 +98,7 @@ __all__ = [
     "WhisperConfig",
     "FunASRConfig",
     "SherpaOnnxASRConfig",
+    "SpeculativeStartConfig",
     "GroqWhisperASRConfig",
     # TTS related classes
     "TTSConfig",
@@ -105,6 +112,8 @@ __all__ = [
     "GPTSoVITSConfig",
     "FishAPITTSConfig",
     "SherpaOnnxTTSConfig",
+    "TTSCacheConfig",
+    "TTSProcessPoolConfig",
     # VAD related classes
     "VADConfig",
     "SileroVADConfig",
@@ -3,7 +3,7 @@ This module contains the pydantic model for the configurations of
 different types of agents.
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from typing import Dict, ClassVar, Optional, Literal, List
 from .i18n import I18nMixin, Description
 from .stateless_llm import StatelessLLMConfigs
@@ -33,6 +33,8 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
     segment_method: Literal["regex", "pysbd"] = Field("pysbd", alias="segment_method")
     use_mcpp: Optional[bool] = Field(False, alias="use_mcpp")
     mcp_enabled_servers: Optional[List[str]] = Field([], alias="mcp_enabled_servers")
+    max_context_tokens: Optional[int] = Field(0, alias="max_context_tokens")
+    pinned_recent_messages: Optional[int] = Field(4, alias="pinned_recent_messages")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "llm_provider": Description(
@@ -55,6 +57,14 @@ class BasicMemoryAgentConfig(I18nMixin, BaseModel):
             en="List of MCP servers to enable for the agent",
             zh="为智能体启用 MCP 服务器列表",
         ),
+        "max_context_tokens": Description(
+            en="Estimated token budget for the system prompt and history sent with each request; older turns are condensed to fit, e.g. 4000; 0 sends everything (default: 0)",
+            zh="每次请求发送的系统提示和历史记录的估算 token 预算；较早的对话会被压缩以适应预算，例如 4000；0 表示全部发送（默认：0）",
+        ),
+        "pinned_recent_messages": Description(
+            en="Number of most recent messages that are always sent, whatever the budget (default: 4)",
+            zh="无论预算如何始终发送的最近消息数（默认：4）",
+        ),
     }
 
 
@@ -185,8 +195,13 @@ class DualModelAgentConfig(I18nMixin, BaseModel):
     segment_method: Literal["regex", "pysbd"] = Field("pysbd", alias="segment_method")
     use_mcpp: Optional[bool] = Field(False, alias="use_mcpp")
     mcp_enabled_servers: Optional[List[str]] = Field([], alias="mcp_enabled_servers")
+    max_context_tokens: Optional[int] = Field(0, alias="max_context_tokens")
+    pinned_recent_messages: Optional[int] = Field(4, alias="pinned_recent_messages")
     quality_threshold: Optional[float] = Field(0.4, alias="quality_threshold")
     enable_fallback: Optional[bool] = Field(True, alias="enable_fallback")
+    hedged_mode: Optional[bool] = Field(False, alias="hedged_mode")
+    hedge_ttft_ms: Optional[int] = Field(800, alias="hedge_ttft_ms")
+    hedge_min_chars: Optional[int] = Field(60, alias="hedge_min_chars")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "primary_llm_provider": Description(
@@ -213,6 +228,14 @@ class DualModelAgentConfig(I18nMixin, BaseModel):
             en="List of MCP servers to enable for the agent",
             zh="为智能体启用 MCP 服务器列表",
         ),
+        "max_context_tokens": Description(
+            en="Estimated token budget for the system prompt and history sent with each request; older turns are condensed to fit, e.g. 4000; 0 sends everything (default: 0)",
+            zh="每次请求发送的系统提示和历史记录的估算 token 预算；较早的对话会被压缩以适应预算，例如 4000；0 表示全部发送（默认：0）",
+        ),
+        "pinned_recent_messages": Description(
+            en="Number of most recent messages that are always sent, whatever the budget (default: 4)",
+            zh="无论预算如何始终发送的最近消息数（默认：4）",
+        ),
         "quality_threshold": Description(
             en="Quality threshold for triggering fallback (0.0-1.0, default: 0.4)",
             zh="触发回退的质量阈值（0.0-1.0，默认：0.4）",
@@ -221,6 +244,18 @@ class DualModelAgentConfig(I18nMixin, BaseModel):
             en="Whether to enable fallback to large model (default: True)",
             zh="是否启用大模型回退（默认：True）",
         ),
+        "hedged_mode": Description(
+            en="Race the fallback model against the primary instead of running it after a poor reply; the first acceptable stream is spoken and the other is cancelled (default: False)",
+            zh="让备用模型与主模型竞速，而不是在主模型回复较差后再调用；先合格的回复会被播放，另一个请求被取消（默认：False）",
+        ),
+        "hedge_ttft_ms": Description(
+            en="In hedged mode, start the fallback model if the primary has produced no text after this many milliseconds (default: 800)",
+            zh="对冲模式下，主模型在该毫秒数内没有输出时启动备用模型（默认：800）",
+        ),
+        "hedge_min_chars": Description(
+            en="In hedged mode, characters of the primary reply scored before it is rejected; a good first sentence commits it earlier (default: 60)",
+            zh="对冲模式下，主模型回复被判定为不合格前评分的字符数；合格的第一句话会提前确认（默认：60）",
+        ),
     }
 
 
@@ -248,6 +283,54 @@ class LettaConfig(I18nMixin, BaseModel):
     }
 
 
+class ResponseCacheConfig(I18nMixin, BaseModel):
+    """Configuration for reusing the agent's replies to repeated inputs."""
+
+    enabled: bool = Field(False, alias="enabled")
+    cache_dir: str = Field("cache/response_cache", alias="cache_dir")
+    ttl_seconds: float = Field(7 * 24 * 3600, alias="ttl_seconds")
+    memory_max_entries: int = Field(256, alias="memory_max_entries")
+    disk_max_entries: int = Field(4096, alias="disk_max_entries")
+    context_messages: int = Field(2, alias="context_messages")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "enabled": Description(
+            en="Reuse this character's earlier reply when the same input arrives in the same context, instead of calling the LLM (default: False)",
+            zh="相同上下文中收到相同输入时复用该角色之前的回复，而不调用 LLM（默认：False）",
+        ),
+        "cache_dir": Description(
+            en="Directory for the on-disk cache tier", zh="磁盘缓存目录"
+        ),
+        "ttl_seconds": Description(
+            en="Seconds a cached reply stays valid (0 keeps replies until evicted, default: 604800)",
+            zh="缓存回复的有效秒数（0 表示直到被淘汰前一直有效，默认：604800）",
+        ),
+        "memory_max_entries": Description(
+            en="Maximum number of replies in the in-memory tier (0 disables it)",
+            zh="内存缓存的最大回复数（0 表示禁用）",
+        ),
+        "disk_max_entries": Description(
+            en="Maximum number of replies in the on-disk tier (0 disables it)",
+            zh="磁盘缓存的最大回复数（0 表示禁用）",
+        ),
+        "context_messages": Description(
+            en="Number of preceding messages that must also match for a reply to be reused (0 matches on the input alone, default: 2)",
+            zh="复用回复时还需匹配的前几条消息数（0 表示只匹配输入，默认：2）",
+        ),
+    }
+
+    @model_validator(mode="after")
+    def check_limits(cls, values: "ResponseCacheConfig"):
+        if (
+            values.ttl_seconds < 0
+            or values.memory_max_entries < 0
+            or values.disk_max_entries < 0
+            or values.context_messages < 0
+        ):
+            raise ValueError("Response cache settings must not be negative")
+        return values
+
+
 class AgentSettings(I18nMixin, BaseModel):
     """Settings for different types of agents."""
 
@@ -286,6 +369,9 @@ class AgentConfig(I18nMixin, BaseModel):
     ] = Field(..., alias="conversation_agent_choice")
     agent_settings: AgentSettings = Field(..., alias="agent_settings")
     llm_configs: StatelessLLMConfigs = Field(..., alias="llm_configs")
+    response_cache: ResponseCacheConfig = Field(
+        default_factory=ResponseCacheConfig, alias="response_cache"
+    )
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conversation_agent_choice": Description(
@@ -297,6 +383,10 @@ class AgentConfig(I18nMixin, BaseModel):
         "llm_configs": Description(
             en="Pool of LLM provider configurations", zh="语言模型提供者配置池"
         ),
+        "response_cache": Description(
+            en="Cache of replies to repeated inputs, enabled per character",
+            zh="重复输入的回复缓存，按角色启用",
+        ),
         "faster_first_response": Description(
             en="Whether to respond as soon as encountering a comma in the first sentence to reduce latency (default: True)",
             zh="是否在第一句回应时遇上逗号就直接生成音频以减少首句延迟（默认：True）",
@@ -195,6 +195,9 @@ class SherpaOnnxASRConfig(I18nMixin):
     num_threads: int = Field(4, alias="num_threads")
     use_itn: bool = Field(True, alias="use_itn")
     provider: Literal["cpu", "cuda", "rocm"] = Field("cpu", alias="provider")
+    streaming: bool = Field(False, alias="streaming")
+    max_batch_size: int = Field(8, alias="max_batch_size")
+    batch_window_ms: float = Field(10.0, alias="batch_window_ms")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "model_type": Description(
@@ -236,12 +239,41 @@ class SherpaOnnxASRConfig(I18nMixin):
             en="Provider for inference (cpu or cuda) (cuda option needs additional settings. Please check our docs)",
             zh="推理平台（cpu 或 cuda）(cuda 需要额外配置，请参考文档)",
         ),
+        "streaming": Description(
+            en="Use a streaming (online) model that transcribes while the user is still speaking. Supports transducer, paraformer (encoder and decoder) and nemo_ctc",
+            zh="使用流式（在线）模型，在用户说话时即开始识别。支持 transducer、paraformer（encoder 和 decoder）和 nemo_ctc",
+        ),
+        "max_batch_size": Description(
+            en="Most utterances from concurrent sessions decoded together in one call (1 disables batching)",
+            zh="并发会话的语音合并为一批解码时的最大条数（1 表示不合并）",
+        ),
+        "batch_window_ms": Description(
+            en="Milliseconds an utterance waits for others to join its batch",
+            zh="每条语音等待其他语音加入同一批次的时间（毫秒）",
+        ),
     }
 
     @model_validator(mode="after")
     def check_model_paths(cls, values: "SherpaOnnxASRConfig", info: ValidationInfo):
         model_type = values.model_type
 
+        if values.max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if values.batch_window_ms < 0:
+            raise ValueError("batch_window_ms must not be negative")
+
+        if values.streaming:
+            if model_type not in ("transducer", "paraformer", "nemo_ctc"):
+                raise ValueError(
+                    f"model_type {model_type} has no streaming version; use transducer, paraformer or nemo_ctc"
+                )
+            if model_type == "paraformer":
+                if not all([values.encoder, values.decoder, values.tokens]):
+                    raise ValueError(
+                        "encoder, decoder, and tokens must be provided for streaming paraformer model type"
+                    )
+                return values
+
         if model_type == "transducer":
             if not all([values.encoder, values.decoder, values.joiner, values.tokens]):
                 raise ValueError(
@@ -281,6 +313,35 @@ class SherpaOnnxASRConfig(I18nMixin):
         return values
 
 
+class SpeculativeStartConfig(I18nMixin):
+    """Configuration for starting the agent before the user has finished speaking."""
+
+    enabled: bool = Field(False, alias="enabled")
+    stable_ms: int = Field(400, alias="stable_ms")
+    silence_db: float = Field(-45.0, alias="silence_db")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "enabled": Description(
+            en="Start the agent's reply on a stable partial transcript, before the end of speech is confirmed. Needs a streaming ASR model",
+            zh="在确认说话结束前，根据稳定的部分识别结果提前开始生成回复。需要流式 ASR 模型",
+        ),
+        "stable_ms": Description(
+            en="Milliseconds the partial transcript must stay unchanged before the reply is started",
+            zh="部分识别结果保持不变多少毫秒后开始生成回复",
+        ),
+        "silence_db": Description(
+            en="Level (dBFS) below which the latest mic audio counts as trailing silence",
+            zh="最新麦克风音频低于该电平（dBFS）时视为说话后的静音",
+        ),
+    }
+
+    @model_validator(mode="after")
+    def check_stable_ms(cls, values: "SpeculativeStartConfig"):
+        if values.stable_ms < 0:
+            raise ValueError("stable_ms must not be negative")
+        return values
+
+
 class ASRConfig(I18nMixin):
     """Configuration for Automatic Speech Recognition."""
 
@@ -304,6 +365,11 @@ class ASRConfig(I18nMixin):
     sherpa_onnx_asr: Optional[SherpaOnnxASRConfig] = Field(
         None, alias="sherpa_onnx_asr"
     )
+    max_concurrency: int = Field(2, alias="max_concurrency")
+    job_deadline_seconds: float = Field(30.0, alias="job_deadline_seconds")
+    speculative_start: SpeculativeStartConfig = Field(
+        default=SpeculativeStartConfig(), alias="speculative_start"
+    )
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "asr_model": Description(
@@ -324,12 +390,27 @@ class ASRConfig(I18nMixin):
         "sherpa_onnx_asr": Description(
             en="Configuration for Sherpa Onnx ASR", zh="Sherpa Onnx ASR 配置"
         ),
+        "max_concurrency": Description(
+            en="Maximum number of utterances transcribed at once, shared by all clients. Waiting utterances are served shortest first",
+            zh="同时识别的最大语音条数（所有客户端共享），排队时较短的语音优先",
+        ),
+        "job_deadline_seconds": Description(
+            en="Seconds an utterance may wait for transcription before it is dropped (0 waits forever)",
+            zh="语音等待识别的最长时间（秒），超时即丢弃（0 表示一直等待）",
+        ),
+        "speculative_start": Description(
+            en="Start the reply speculatively while the user is finishing their sentence",
+            zh="在用户说完之前提前开始生成回复",
+        ),
     }
 
     @model_validator(mode="after")
     def check_asr_config(cls, values: "ASRConfig", info: ValidationInfo):
         asr_model = values.asr_model
 
+        if values.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
         # Only validate the selected ASR model
         if asr_model == "AzureASR" and values.azure_asr is not None:
             values.azure_asr.model_validate(values.azure_asr.model_dump())
@@ -192,6 +192,7 @@ class ClaudeConfig(StatelessLLMBaseConfig):
     interrupt_method: Literal["system", "user"] = Field(
         "user", alias="interrupt_method"
     )
+    prompt_caching: bool = Field(True, alias="prompt_caching")
 
     _CLAUDE_DESCRIPTIONS: ClassVar[dict[str, Description]] = {
         "base_url": Description(
@@ -201,6 +202,10 @@ class ClaudeConfig(StatelessLLMBaseConfig):
         "model": Description(
             en="Name of the Claude model to use", zh="要使用的 Claude 模型名称"
         ),
+        "prompt_caching": Description(
+            en="Mark the unchanging start of each request (tools, system prompt, earlier messages) for Anthropic's prompt cache (default: True)",
+            zh="将每次请求中不变的开头部分（工具、系统提示词、之前的消息）标记给 Anthropic 的提示词缓存（默认：True）",
+        ),
     }
 
     DESCRIPTIONS: ClassVar[dict[str, Description]] = {
@@ -4,6 +4,40 @@ from typing import Dict, ClassVar
 from .i18n import I18nMixin, Description
 
 
+class AudioFrontEndConfig(I18nMixin):
+    """Conditioning applied to incoming microphone audio."""
+
+    remove_dc: bool = Field(False, alias="remove_dc")
+    normalize_gain: bool = Field(False, alias="normalize_gain")
+    target_level_db: float = Field(-20.0, alias="target_level_db")
+    max_gain_db: float = Field(20.0, alias="max_gain_db")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "remove_dc": Description(
+            en="Remove DC offset from microphone audio",
+            zh="去除麦克风音频中的直流偏移",
+        ),
+        "normalize_gain": Description(
+            en="Automatically adjust microphone volume towards target_level_db",
+            zh="自动将麦克风音量调整到 target_level_db",
+        ),
+        "target_level_db": Description(
+            en="Target speech level (dBFS) for gain normalisation",
+            zh="音量归一化的目标电平（dBFS）",
+        ),
+        "max_gain_db": Description(
+            en="Maximum amplification (dB) applied by gain normalisation",
+            zh="音量归一化的最大增益（dB）",
+        ),
+    }
+
+    @model_validator(mode="after")
+    def check_max_gain_db(cls, values):
+        if values.max_gain_db < 0:
+            raise ValueError("max_gain_db must not be negative")
+        return values
+
+
 class SystemConfig(I18nMixin):
     """System configuration settings."""
 
@@ -13,6 +47,10 @@ class SystemConfig(I18nMixin):
     config_alts_dir: str = Field(..., alias="config_alts_dir")
     tool_prompts: Dict[str, str] = Field(..., alias="tool_prompts")
     enable_proxy: bool = Field(False, alias="enable_proxy")
+    max_utterance_seconds: float = Field(120.0, alias="max_utterance_seconds")
+    audio_frontend: AudioFrontEndConfig = Field(
+        default_factory=AudioFrontEndConfig, alias="audio_frontend"
+    )
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "conf_version": Description(en="Configuration version", zh="配置文件版本"),
@@ -29,6 +67,14 @@ class SystemConfig(I18nMixin):
             en="Enable proxy mode for multiple clients",
             zh="启用代理模式以支持多个客户端使用一个 ws 连接",
         ),
+        "max_utterance_seconds": Description(
+            en="Maximum length of buffered microphone audio per utterance, in seconds. Older audio is dropped beyond this",
+            zh="每段语音缓存的最大麦克风音频时长（秒），超出部分将丢弃较早的音频",
+        ),
+        "audio_frontend": Description(
+            en="Conditioning of incoming microphone audio (resampled to 16 kHz in any case)",
+            zh="麦克风音频预处理（无论如何都会重采样到 16 kHz）",
+        ),
     }
 
     @model_validator(mode="after")
@@ -37,3 +83,9 @@ class SystemConfig(I18nMixin):
         if port < 0 or port > 65535:
             raise ValueError("Port must be between 0 and 65535")
         return values
+
+    @model_validator(mode="after")
+    def check_max_utterance_seconds(cls, values):
+        if values.max_utterance_seconds <= 0:
+            raise ValueError("max_utterance_seconds must be positive")
+        return values
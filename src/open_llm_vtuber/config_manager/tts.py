@@ -1,6 +1,6 @@
 # config_manager/tts.py
 from pydantic import ValidationInfo, Field, model_validator
-from typing import Literal, Optional, Dict, ClassVar
+from typing import Literal, Optional, Dict, ClassVar, List
 from .i18n import I18nMixin, Description
 
 
@@ -471,6 +471,75 @@ class IndexTTSConfig(I18nMixin):
     }
 
 
+class TTSCacheConfig(I18nMixin):
+    """Configuration for the synthesised audio cache."""
+
+    enabled: bool = Field(False, alias="enabled")
+    cache_dir: str = Field("cache/tts_cache", alias="cache_dir")
+    memory_max_mb: float = Field(32.0, alias="memory_max_mb")
+    disk_max_mb: float = Field(256.0, alias="disk_max_mb")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "enabled": Description(
+            en="Cache synthesised audio so repeated sentences skip the TTS engine",
+            zh="缓存合成的音频，重复的句子无需再次调用 TTS 引擎",
+        ),
+        "cache_dir": Description(
+            en="Directory for the on-disk cache tier", zh="磁盘缓存目录"
+        ),
+        "memory_max_mb": Description(
+            en="Maximum size of the in-memory cache tier in MB (0 disables it)",
+            zh="内存缓存的最大大小（MB，0 表示禁用）",
+        ),
+        "disk_max_mb": Description(
+            en="Maximum size of the on-disk cache tier in MB (0 disables it)",
+            zh="磁盘缓存的最大大小（MB，0 表示禁用）",
+        ),
+    }
+
+    @model_validator(mode="after")
+    def check_limits(cls, values: "TTSCacheConfig"):
+        if values.memory_max_mb < 0 or values.disk_max_mb < 0:
+            raise ValueError("TTS cache size limits must not be negative")
+        return values
+
+
+class TTSProcessPoolConfig(I18nMixin):
+    """Configuration for running TTS engines in worker processes."""
+
+    engines: List[str] = Field([], alias="engines")
+    num_workers: int = Field(1, alias="num_workers")
+    request_timeout: float = Field(120.0, alias="request_timeout")
+    health_check_interval: float = Field(30.0, alias="health_check_interval")
+
+    DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
+        "engines": Description(
+            en="TTS models to run in worker processes instead of the server process, e.g. ['sherpa_onnx_tts', 'melo_tts']",
+            zh="在独立工作进程而非服务器进程中运行的 TTS 模型，例如 ['sherpa_onnx_tts', 'melo_tts']",
+        ),
+        "num_workers": Description(
+            en="Number of worker processes, each loading its own copy of the model",
+            zh="工作进程数量，每个进程各自加载一份模型",
+        ),
+        "request_timeout": Description(
+            en="Seconds to wait for one sentence before the worker is restarted",
+            zh="单句合成的超时时间（秒），超时后重启工作进程",
+        ),
+        "health_check_interval": Description(
+            en="Seconds between health checks of idle workers (0 disables them)",
+            zh="空闲工作进程的健康检查间隔（秒，0 表示禁用）",
+        ),
+    }
+
+    @model_validator(mode="after")
+    def check_workers(cls, values: "TTSProcessPoolConfig"):
+        if values.num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        if values.request_timeout <= 0:
+            raise ValueError("request_timeout must be positive")
+        return values
+
+
 class TTSConfig(I18nMixin):
     """Configuration for Text-to-Speech."""
 
@@ -513,6 +582,12 @@ class TTSConfig(I18nMixin):
     spark_tts: Optional[SparkTTSConfig] = Field(None, alias="spark_tts")
     minimax_tts: Optional[MinimaxTTSConfig] = Field(None, alias="minimax_tts")
     index_tts: Optional[IndexTTSConfig] = Field(None, alias="index_tts")
+    tts_cache: TTSCacheConfig = Field(default=TTSCacheConfig(), alias="tts_cache")
+    max_concurrency: int = Field(2, alias="max_concurrency")
+    streaming: bool = Field(False, alias="streaming")
+    process_pool: TTSProcessPoolConfig = Field(
+        default=TTSProcessPoolConfig(), alias="process_pool"
+    )
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
         "tts_model": Description(
@@ -552,12 +627,31 @@ class TTSConfig(I18nMixin):
         "index_tts": Description(
             en="Configuration for IndexTTS", zh="IndexTTS 配置"
         ),
+        "tts_cache": Description(
+            en="Cache for synthesised audio, shared by all TTS models",
+            zh="合成音频缓存，所有 TTS 模型通用",
+        ),
+        "max_concurrency": Description(
+            en="Maximum number of sentences synthesised at once, shared by all clients. The first sentence of each reply is always served first",
+            zh="同时合成的最大句子数（所有客户端共享），每次回复的第一句总是优先合成",
+        ),
+        "process_pool": Description(
+            en="Run CPU-bound local TTS models in worker processes, so synthesis does not stall the server",
+            zh="在工作进程中运行占用 CPU 的本地 TTS 模型，避免合成阻塞服务器",
+        ),
+        "streaming": Description(
+            en="Send audio to the frontend in audio-chunk messages while a sentence is still being synthesised (openai_tts, minimax_tts, siliconflow_tts and sherpa_onnx_tts only). Requires a frontend that handles audio-chunk",
+            zh="在句子合成过程中即以 audio-chunk 消息向前端发送音频（仅支持 openai_tts、minimax_tts、siliconflow_tts 和 sherpa_onnx_tts），需要前端支持 audio-chunk",
+        ),
     }
 
     @model_validator(mode="after")
     def check_tts_config(cls, values: "TTSConfig", info: ValidationInfo):
         tts_model = values.tts_model
 
+        if values.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
         # Only validate the selected TTS model
         if tts_model == "azure_tts" and values.azure_tts is not None:
             values.azure_tts.model_validate(values.azure_tts.model_dump())
@@ -14,9 +14,14 @@ class SileroVADConfig(I18nMixin):
     required_hits: int = Field(..., alias="required_hits")  # 3 * (0.032) = 0.1s
     required_misses: int = Field(..., alias="required_misses")  # 24 * (0.032) = 0.8s
     smoothing_window: int = Field(..., alias="smoothing_window")  # 5
+    backend: Literal["torch", "onnx"] = Field("torch", alias="backend")
+    onnx_model_path: Optional[str] = Field(None, alias="onnx_model_path")
 
     DESCRIPTIONS: ClassVar[Dict[str, Description]] = {
-        "orig_sr": Description(en="Original Audio Sample Rate", zh="原始音频采样率"),
+        "orig_sr": Description(
+            en="Original Audio Sample Rate, for audio passed without a rate (server mic audio arrives at 16000)",
+            zh="原始音频采样率，仅用于未注明采样率的音频（服务器的麦克风音频为 16000）",
+        ),
         "target_sr": Description(en="Target Audio Sample Rate", zh="目标音频采样率"),
         "prob_threshold": Description(
             en="Probability Threshold for VAD", zh="语音活动检测的概率阈值"
@@ -35,6 +40,14 @@ class SileroVADConfig(I18nMixin):
         "smoothing_window": Description(
             en="Smoothing window size for VAD", zh="语音活动检测的平滑窗口大小"
         ),
+        "backend": Description(
+            en="Inference backend: 'torch' (PyTorch) or 'onnx' (ONNX Runtime, starts faster and uses less memory, torch is not loaded)",
+            zh="推理后端：'torch'（PyTorch）或 'onnx'（ONNX Runtime，启动更快、内存更少，且不加载 torch）",
+        ),
+        "onnx_model_path": Description(
+            en="Path to silero_vad.onnx for the onnx backend (defaults to the file shipped with the silero-vad package)",
+            zh="onnx 后端使用的 silero_vad.onnx 路径（默认使用 silero-vad 包自带的模型）",
+        ),
     }
 
 
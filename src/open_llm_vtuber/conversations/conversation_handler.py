@@ -6,11 +6,14 @@ import numpy as np
 from fastapi import WebSocket
 from loguru import logger
 
+from ..asr.asr_interface import ASRStream
 from ..chat_group import ChatGroupManager
 from ..chat_history_manager import store_message
 from ..service_context import ServiceContext
+from ..utils.audio_buffer import AudioAccumulator
 from .group_conversation import process_group_conversation
 from .single_conversation import process_single_conversation
+from .speculation import SpeculationTracker
 from .conversation_utils import EMOJI_LIST
 from .types import GroupConversationState
 from prompts import prompt_loader
@@ -25,12 +28,16 @@ async def handle_conversation_trigger(
     client_contexts: Dict[str, ServiceContext],
     client_connections: Dict[str, WebSocket],
     chat_group_manager: ChatGroupManager,
-    received_data_buffers: Dict[str, np.ndarray],
+    received_data_buffers: Dict[str, AudioAccumulator],
     current_conversation_tasks: Dict[str, Optional[asyncio.Task]],
     broadcast_to_group: Callable,
+    asr_streams: Optional[Dict[str, Optional[ASRStream]]] = None,
+    speculations: Optional[Dict[str, SpeculationTracker]] = None,
 ) -> None:
     """Handle triggers that start a conversation"""
     metadata = None
+    tracker = (speculations or {}).get(client_uid)
+    speculation = tracker.take() if tracker is not None else None
 
     if msg_type == "ai-speak-signal":
         try:
@@ -65,13 +72,29 @@ async def handle_conversation_trigger(
     elif msg_type == "text-input":
         user_input = data.get("text", "")
     else:  # mic-audio-end
-        user_input = received_data_buffers[client_uid]
-        received_data_buffers[client_uid] = np.array([])
+        audio_buffer = received_data_buffers[client_uid]
+        if audio_buffer.dropped_samples:
+            logger.warning(
+                f"Utterance from {client_uid} exceeded the maximum length, "
+                f"dropped {audio_buffer.dropped_samples} samples"
+            )
+        user_input = audio_buffer.take()
+        asr_stream = (asr_streams or {}).pop(client_uid, None)
+        if asr_stream is not None:
+            # Already transcribed while recorded; only the endpoint is left
+            user_input = asr_stream
 
     images = data.get("images")
     session_emoji = np.random.choice(EMOJI_LIST)
 
     group = chat_group_manager.get_client_group(client_uid)
+    if speculation is not None and (
+        msg_type != "mic-audio-end" or images or (group and len(group.members) > 1)
+    ):
+        # The speculative reply was started on the transcript alone
+        await speculation.cancel(miss=False)
+        speculation = None
+
     if group and len(group.members) > 1:
         # Use group_id as task key for group conversations
         task_key = group.group_id
@@ -105,6 +128,7 @@ async def handle_conversation_trigger(
                 images=images,
                 session_emoji=session_emoji,
                 metadata=metadata,
+                speculation=speculation,
             )
         )
 
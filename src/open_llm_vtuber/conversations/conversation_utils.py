@@ -10,7 +10,7 @@ from .types import WebSocketSend, BroadcastContext
 from .tts_manager import TTSTaskManager
 from ..agent.output_types import SentenceOutput, AudioOutput
 from ..agent.input_types import BatchInput, TextData, ImageData, TextSource, ImageSource
-from ..asr.asr_interface import ASRInterface
+from ..asr.asr_interface import ASRInterface, ASRStream
 from ..live2d_model import Live2dModel
 from ..tts.tts_interface import TTSInterface
 from ..utils.stream_audio import prepare_audio_payload
@@ -144,11 +144,18 @@ async def send_conversation_start_signals(websocket_send: WebSocketSend) -> None
 
 
 async def process_user_input(
-    user_input: Union[str, np.ndarray],
+    user_input: Union[str, np.ndarray, ASRStream],
     asr_engine: ASRInterface,
     websocket_send: WebSocketSend,
 ) -> str:
     """Process user input, converting audio to text if needed"""
+    if isinstance(user_input, ASRStream):
+        logger.info("Finalizing streamed transcription...")
+        input_text = await user_input.async_finalize()
+        await websocket_send(
+            json.dumps({"type": "user-input-transcription", "text": input_text})
+        )
+        return input_text
     if isinstance(user_input, np.ndarray):
         logger.info("Transcribing audio input...")
         input_text = await asr_engine.async_transcribe_np(user_input)
@@ -6,6 +6,7 @@ from fastapi import WebSocket
 import numpy as np
 
 from ..agent.output_types import AudioOutput, SentenceOutput
+from ..asr.asr_interface import ASRStream
 
 from .conversation_utils import (
     create_batch_input,
@@ -32,7 +33,7 @@ async def process_group_conversation(
     broadcast_func: BroadcastFunc,
     group_members: List[str],
     initiator_client_uid: str,
-    user_input: Union[str, np.ndarray],
+    user_input: Union[str, np.ndarray, ASRStream],
     images: Optional[List[Dict[str, Any]]] = None,
     session_emoji: str = np.random.choice(EMOJI_LIST),
     metadata: Optional[Dict[str, Any]] = None,
@@ -45,13 +46,18 @@ async def process_group_conversation(
         broadcast_func: Function to broadcast messages to group
         group_members: List of group member UIDs
         initiator_client_uid: UID of conversation initiator
-        user_input: Text or audio input from user
+        user_input: Text, audio, or a streamed ASR utterance from user
         images: Optional list of image data
         session_emoji: Emoji identifier for the conversation
         metadata: Optional metadata for special processing flags
     """
     # Create TTSTaskManager for each member
-    tts_managers = {uid: TTSTaskManager() for uid in group_members}
+    tts_managers = {
+        uid: TTSTaskManager(
+            uid, streaming=client_contexts[uid].character_config.tts_config.streaming
+        )
+        for uid in group_members
+    }
 
     try:
         logger.info(f"Group Conversation Chain {session_emoji} started!")
@@ -189,7 +195,7 @@ def init_group_conversation_contexts(
 
 
 async def process_group_input(
-    user_input: Union[str, np.ndarray],
+    user_input: Union[str, np.ndarray, ASRStream],
     initiator_context: ServiceContext,
     initiator_ws_send: WebSocketSend,
     broadcast_func: BroadcastFunc,
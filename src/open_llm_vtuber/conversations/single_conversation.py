@@ -20,16 +20,19 @@ from ..service_context import ServiceContext
 
 # Import necessary types from agent outputs
 from ..agent.output_types import SentenceOutput, AudioOutput
+from ..asr.asr_interface import ASRStream
+from .speculation import SpeculativeResponse
 
 
 async def process_single_conversation(
     context: ServiceContext,
     websocket_send: WebSocketSend,
     client_uid: str,
-    user_input: Union[str, np.ndarray],
+    user_input: Union[str, np.ndarray, ASRStream],
     images: Optional[List[Dict[str, Any]]] = None,
     session_emoji: str = np.random.choice(EMOJI_LIST),
     metadata: Optional[Dict[str, Any]] = None,
+    speculation: Optional[SpeculativeResponse] = None,
 ) -> str:
     """Process a single-user conversation turn
 
@@ -37,16 +40,20 @@ async def process_single_conversation(
         context: Service context containing all configurations and engines
         websocket_send: WebSocket send function
         client_uid: Client unique identifier
-        user_input: Text or audio input from user
+        user_input: Text, audio, or a streamed ASR utterance from user
         images: Optional list of image data
         session_emoji: Emoji identifier for the conversation
         metadata: Optional metadata for special processing flags
+        speculation: Reply already started on the partial transcript, used
+            if the final transcript matches it
 
     Returns:
         str: Complete response text
     """
     # Create TTSTaskManager for this conversation
-    tts_manager = TTSTaskManager()
+    tts_manager = TTSTaskManager(
+        client_uid, streaming=context.character_config.tts_config.streaming
+    )
     full_response = ""  # Initialize full_response here
 
     try:
@@ -86,8 +93,16 @@ async def process_single_conversation(
             logger.info(f"With {len(images)} images")
 
         try:
+            if speculation is not None and not speculation.matches(input_text):
+                await speculation.cancel()
+                speculation = None
+
             # agent.chat yields Union[SentenceOutput, Dict[str, Any]]
-            agent_output_stream = context.agent_engine.chat(batch_input)
+            if speculation is not None:
+                logger.debug("Using the reply started on the partial transcript")
+                agent_output_stream = speculation.outputs()
+            else:
+                agent_output_stream = context.agent_engine.chat(batch_input)
 
             async for output_item in agent_output_stream:
                 if (
@@ -171,4 +186,6 @@ async def process_single_conversation(
         )
         raise
     finally:
+        if speculation is not None:
+            await speculation.close()
         cleanup_conversation(tts_manager, session_emoji)
@@ -0,0 +1,183 @@
+"""
+Speculative start of the agent's reply on a partial transcript.
+
+With a streaming ASR engine the transcript is known, bar the last few
+words, before the client reports the end of speech. When the partial
+transcript has stopped changing and the mic has gone quiet, the agent is
+started on it right away. Its output is buffered, not spoken. At
+mic-audio-end the final transcript decides: if it matches, the turn plays
+the buffered reply (a hit); otherwise the reply is cancelled, the
+messages it added to the agent's memory are removed and the turn starts
+over (a miss). Only those messages are removed, so turns that other
+sessions sharing the agent completed in the meantime are kept.
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+import numpy as np
+from loguru import logger
+
+from ..agent.agents.agent_interface import AgentInterface, recorded_messages
+from ..config_manager import SpeculativeStartConfig
+from .conversation_utils import create_batch_input
+
+_stats = {"started": 0, "hits": 0, "misses": 0, "discarded": 0}
+
+_DONE = object()
+
+
+def get_speculation_stats() -> Dict[str, Any]:
+    """Return how often speculative replies were used or thrown away"""
+    decided = _stats["hits"] + _stats["misses"]
+    return {
+        **_stats,
+        "hit_rate": _stats["hits"] / decided if decided else 0.0,
+    }
+
+
+def _normalize(text: str) -> str:
+    # Punctuation and case may settle only once the utterance is finalised
+    return re.sub(r"[\W_]+", "", text).lower()
+
+
+def _is_silent(audio: np.ndarray, silence_db: float) -> bool:
+    """Whether a float chunk in [-1, 1] is quieter than silence_db (dBFS)"""
+    if len(audio) == 0:
+        return False
+    rms = float(np.sqrt(np.mean(np.square(audio, dtype=np.float64))))
+    return 20 * np.log10(rms + 1e-10) < silence_db
+
+
+class SpeculativeResponse:
+    """An agent reply started on a partial transcript and buffered until confirmed"""
+
+    def __init__(self, agent_engine: AgentInterface, text: str, human_name: str):
+        self.text = text
+        self._agent = agent_engine
+        # What the speculative chat adds to the agent's memory
+        self._added_messages: list = []
+        self._used = False
+        self._outputs: asyncio.Queue = asyncio.Queue()
+        self._task = asyncio.create_task(
+            self._run(create_batch_input(text, None, human_name))
+        )
+        _stats["started"] += 1
+        logger.debug(f"Speculatively started the reply to '{text}'")
+
+    async def _run(self, batch_input) -> None:
+        # Set in this task only, so other sessions' turns are not recorded
+        recorded_messages.set(self._added_messages)
+        try:
+            async for output in self._agent.chat(batch_input):
+                await self._outputs.put(output)
+        except Exception as e:
+            await self._outputs.put(e)
+        finally:
+            self._outputs.put_nowait(_DONE)
+
+    def matches(self, text: str) -> bool:
+        return _normalize(text) == _normalize(self.text)
+
+    def outputs(self) -> AsyncIterator[Any]:
+        """Iterate the agent's output, starting with what was buffered"""
+        _stats["hits"] += 1
+        self._used = True
+        return self._iterate_outputs()
+
+    async def _iterate_outputs(self) -> AsyncIterator[Any]:
+        try:
+            while True:
+                item = await self._outputs.get()
+                if item is _DONE:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # The turn was interrupted; stop the agent as for a normal turn
+            self._task.cancel()
+
+    async def cancel(self, miss: bool = True) -> None:
+        """Stop the reply and undo its changes to the agent's memory"""
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._agent.undo_messages(self._added_messages)
+        _stats["misses" if miss else "discarded"] += 1
+        logger.debug(f"Dropped the speculative reply to '{self.text}'")
+
+    async def close(self) -> None:
+        """
+        Release the reply at the end of the turn it was handed to.
+
+        A reply the turn played is stopped like a normal turn's agent; one
+        it never reached, because transcription failed or the turn was
+        interrupted first, is dropped and undone.
+        """
+        if self._used:
+            self._task.cancel()
+        else:
+            await self.cancel(miss=False)
+
+
+class SpeculationTracker:
+    """Watches one client's partial transcripts and starts a reply when they settle"""
+
+    def __init__(self, config: SpeculativeStartConfig):
+        self.config = config
+        self.partial = ""
+        self.changed_at = time.monotonic()
+        self.response: Optional[SpeculativeResponse] = None
+
+    async def update(
+        self,
+        partial: Optional[str],
+        audio: np.ndarray,
+        agent_engine: AgentInterface,
+        human_name: str,
+    ) -> None:
+        """
+        Record the latest mic chunk and start a reply if the moment is right.
+
+        Args:
+            partial: The new partial transcript, or None if it did not change.
+            audio: The chunk that produced it, float samples in [-1, 1].
+            agent_engine: The agent to start.
+            human_name: The speaker name for the agent's input.
+        """
+        now = time.monotonic()
+        if partial is not None:
+            self.partial = partial
+            self.changed_at = now
+            if self.response is not None and not self.response.matches(partial):
+                # The user kept talking
+                await self.response.cancel()
+                self.response = None
+            return
+
+        if self.response is not None or not _normalize(self.partial):
+            return
+        if (now - self.changed_at) * 1000 < self.config.stable_ms:
+            return
+        if not _is_silent(audio, self.config.silence_db):
+            return
+        if not agent_engine.can_undo_messages():
+            # The agent cannot undo a chat, so it must not start one early
+            return
+        self.response = SpeculativeResponse(agent_engine, self.partial, human_name)
+
+    def take(self) -> Optional[SpeculativeResponse]:
+        """Hand over the reply at the end of the utterance and start afresh"""
+        response = self.response
+        self.response = None
+        self.partial = ""
+        self.changed_at = time.monotonic()
+        return response
+
+    async def discard(self) -> None:
+        """Drop the reply without counting a miss, e.g. on disconnect"""
+        response = self.take()
+        if response is not None:
+            await response.cancel(miss=False)
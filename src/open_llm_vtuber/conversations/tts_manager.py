@@ -3,21 +3,44 @@ import json
 import re
 import uuid
 from datetime import datetime
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Set, Tuple
 from loguru import logger
 
 from ..agent.output_types import DisplayText, Actions
 from ..live2d_model import Live2dModel
-from ..tts.tts_interface import TTSInterface
-from ..utils.stream_audio import prepare_audio_payload
+from ..tts.tts_interface import TTSInterface, TTSAudio
+from ..tts.tts_scheduler import (
+    PRIORITY_FIRST_SENTENCE,
+    PRIORITY_NORMAL,
+    get_tts_scheduler,
+)
+from ..utils.stream_audio import AudioChunkEncoder, prepare_audio_payload
 from .types import WebSocketSend
 
+# Most sentences handed to an engine's batch API in one call. Bounds how long
+# the first sentence of a batch waits on the ones synthesised after it.
+MAX_TTS_BATCH_SIZE = 4
+
 
 class TTSTaskManager:
     """Manages TTS tasks and ensures ordered delivery to frontend while allowing parallel TTS generation"""
 
-    def __init__(self) -> None:
+    def __init__(self, client_uid: str = "", streaming: bool = False) -> None:
+        """
+        Args:
+            client_uid: The client this turn belongs to, used by the engine's
+                scheduler to share synthesis slots fairly between clients
+            streaming: Send `audio-chunk` messages while a sentence is being
+                synthesised, for engines that support streaming
+        """
+        self.client_uid = client_uid
+        self.streaming = streaming
         self.task_list: List[asyncio.Task] = []
+        # Tasks still waiting for a synthesis slot, cancelled on interrupt
+        self._queued_tasks: Set[asyncio.Task] = set()
+        # Sentences waiting for the batch task, for engines with a batch API
+        self._pending_batch: List[Tuple[str, DisplayText, Optional[Actions], int]] = []
+        self._batch_task: Optional[asyncio.Task] = None
         self._lock = asyncio.Lock()
         # Queue to store ordered payloads
         self._payload_queue: asyncio.Queue[Dict] = asyncio.Queue()
@@ -76,6 +99,24 @@ class TTSTaskManager:
                 self._process_payload_queue(websocket_send)
             )
 
+        # The first sentence of a turn is what the user is waiting on
+        priority = PRIORITY_NORMAL if self.task_list else PRIORITY_FIRST_SENTENCE
+
+        if tts_engine.supports_batch and not (
+            self.streaming and tts_engine.supports_streaming
+        ):
+            # Sentences that pile up while the engine is busy are
+            # synthesised together by a single batch task
+            self._pending_batch.append(
+                (tts_text, display_text, actions, current_sequence)
+            )
+            if not self._batch_task or self._batch_task.done():
+                self._batch_task = asyncio.create_task(
+                    self._process_tts_batches(tts_engine, priority)
+                )
+                self.task_list.append(self._batch_task)
+            return
+
         # Create and queue the TTS task
         task = asyncio.create_task(
             self._process_tts(
@@ -85,27 +126,38 @@ class TTSTaskManager:
                 live2d_model=live2d_model,
                 tts_engine=tts_engine,
                 sequence_number=current_sequence,
+                priority=priority,
             )
         )
         self.task_list.append(task)
+        self._queued_tasks.add(task)
 
     async def _process_payload_queue(self, websocket_send: WebSocketSend) -> None:
         """
         Process and send payloads in correct order.
         Runs continuously until all payloads are processed.
         """
-        buffered_payloads: Dict[int, Dict] = {}
+        # A streamed sentence produces several payloads; the next sentence
+        # may only start once the last one (final=True) has been sent
+        buffered_payloads: Dict[int, List[Dict]] = {}
+        finished_sequences: Set[int] = set()
 
         while True:
             try:
                 # Get payload from queue
-                payload, sequence_number = await self._payload_queue.get()
-                buffered_payloads[sequence_number] = payload
+                payload, sequence_number, final = await self._payload_queue.get()
+                buffered_payloads.setdefault(sequence_number, []).append(payload)
+                if final:
+                    finished_sequences.add(sequence_number)
 
                 # Send payloads in order
                 while self._next_sequence_to_send in buffered_payloads:
-                    next_payload = buffered_payloads.pop(self._next_sequence_to_send)
-                    await websocket_send(json.dumps(next_payload))
+                    sequence = self._next_sequence_to_send
+                    for next_payload in buffered_payloads.pop(sequence):
+                        await websocket_send(json.dumps(next_payload))
+                    if sequence not in finished_sequences:
+                        break
+                    finished_sequences.discard(sequence)
                     self._next_sequence_to_send += 1
 
                 self._payload_queue.task_done()
@@ -125,7 +177,7 @@ class TTSTaskManager:
             display_text=display_text,
             actions=actions,
         )
-        await self._payload_queue.put((audio_payload, sequence_number))
+        await self._payload_queue.put((audio_payload, sequence_number, True))
 
     async def _process_tts(
         self,
@@ -135,18 +187,40 @@ class TTSTaskManager:
         live2d_model: Live2dModel,
         tts_engine: TTSInterface,
         sequence_number: int,
+        priority: int = PRIORITY_NORMAL,
     ) -> None:
         """Process TTS generation and queue the result for ordered delivery"""
+        if self.streaming and tts_engine.supports_streaming:
+            await self._process_tts_stream(
+                tts_text=tts_text,
+                display_text=display_text,
+                actions=actions,
+                tts_engine=tts_engine,
+                sequence_number=sequence_number,
+                priority=priority,
+            )
+            return
+
         audio_file_path = None
         try:
-            audio_file_path = await self._generate_audio(tts_engine, tts_text)
+            async with get_tts_scheduler(tts_engine).slot(self.client_uid, priority):
+                # From here on the engine is working on it; let it finish so
+                # any file it writes is cleaned up below
+                self._queued_tasks.discard(asyncio.current_task())
+                if tts_engine.supports_pcm:
+                    # Keep the audio in memory and skip the cache file round trip
+                    audio = await self._generate_pcm(tts_engine, tts_text)
+                else:
+                    audio = audio_file_path = await self._generate_audio(
+                        tts_engine, tts_text
+                    )
             payload = prepare_audio_payload(
-                audio_path=audio_file_path,
+                audio_path=audio,
                 display_text=display_text,
                 actions=actions,
             )
             # Queue the payload with its sequence number
-            await self._payload_queue.put((payload, sequence_number))
+            await self._payload_queue.put((payload, sequence_number, True))
 
         except Exception as e:
             logger.error(f"Error preparing audio payload: {e}")
@@ -156,13 +230,85 @@ class TTSTaskManager:
                 display_text=display_text,
                 actions=actions,
             )
-            await self._payload_queue.put((payload, sequence_number))
+            await self._payload_queue.put((payload, sequence_number, True))
 
         finally:
             if audio_file_path:
                 tts_engine.remove_file(audio_file_path)
                 logger.debug("Audio cache file cleaned.")
 
+    async def _process_tts_batches(
+        self, tts_engine: TTSInterface, priority: int = PRIORITY_NORMAL
+    ) -> None:
+        """Synthesise pending sentences in batches until none are left"""
+        scheduler = get_tts_scheduler(tts_engine)
+        while self._pending_batch:
+            self._queued_tasks.add(asyncio.current_task())
+            async with scheduler.slot(self.client_uid, priority):
+                self._queued_tasks.discard(asyncio.current_task())
+                # Everything queued while waiting for the slot joins the batch
+                batch = self._pending_batch[:MAX_TTS_BATCH_SIZE]
+                del self._pending_batch[: len(batch)]
+                if not batch:
+                    break
+                texts = [item[0] for item in batch]
+                logger.debug(
+                    f"🏃Generating in-memory audio for {len(texts)} sentence(s): '''{' '.join(texts)}'''"
+                )
+                try:
+                    audios = await tts_engine.async_generate_pcm_batch(texts)
+                except Exception as e:
+                    logger.error(f"Error generating audio batch: {e}")
+                    audios = [None] * len(batch)
+
+            for (_, display_text, actions, sequence_number), audio in zip(
+                batch, audios
+            ):
+                try:
+                    payload = prepare_audio_payload(
+                        audio_path=audio,
+                        display_text=display_text,
+                        actions=actions,
+                    )
+                except Exception as e:
+                    logger.error(f"Error preparing audio payload: {e}")
+                    # Queue silent payload for error case
+                    payload = prepare_audio_payload(
+                        audio_path=None,
+                        display_text=display_text,
+                        actions=actions,
+                    )
+                await self._payload_queue.put((payload, sequence_number, True))
+            priority = PRIORITY_NORMAL
+
+    async def _process_tts_stream(
+        self,
+        tts_text: str,
+        display_text: DisplayText,
+        actions: Optional[Actions],
+        tts_engine: TTSInterface,
+        sequence_number: int,
+        priority: int,
+    ) -> None:
+        """Stream TTS audio as `audio-chunk` payloads while it is synthesised"""
+        encoder = AudioChunkEncoder(
+            sequence=sequence_number,
+            display_text=display_text,
+            actions=actions,
+        )
+        try:
+            async with get_tts_scheduler(tts_engine).slot(self.client_uid, priority):
+                self._queued_tasks.discard(asyncio.current_task())
+                logger.debug(f"🏃Streaming audio for '''{tts_text}'''...")
+                async for chunk in tts_engine.async_stream_pcm(tts_text):
+                    for payload in encoder.push(chunk):
+                        await self._payload_queue.put((payload, sequence_number, False))
+        except Exception as e:
+            logger.error(f"Error streaming audio payload: {e}")
+        # Always close the sentence so the sender moves on to the next one.
+        # If nothing was streamed, this carries the display text silently.
+        await self._payload_queue.put((encoder.finish(), sequence_number, True))
+
     async def _generate_audio(self, tts_engine: TTSInterface, text: str) -> str:
         """Generate audio file from text"""
         logger.debug(f"🏃Generating audio for '''{text}'''...")
@@ -171,8 +317,21 @@ class TTSTaskManager:
             file_name_no_ext=f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}",
         )
 
+    async def _generate_pcm(
+        self, tts_engine: TTSInterface, text: str
+    ) -> Optional[TTSAudio]:
+        """Generate audio in memory from text"""
+        logger.debug(f"🏃Generating in-memory audio for '''{text}'''...")
+        return await tts_engine.async_generate_pcm(text=text)
+
     def clear(self) -> None:
         """Clear all pending tasks and reset state"""
+        # Drop sentences that have not reached the engine yet
+        for task in self._queued_tasks:
+            task.cancel()
+        self._queued_tasks.clear()
+        self._pending_batch = []
+        self._batch_task = None
         self.task_list.clear()
         if self._sender_task:
             self._sender_task.cancel()
@@ -1,5 +1,7 @@
+import io
 import os
 import json
+import wave
 from uuid import uuid4
 import numpy as np
 from datetime import datetime
@@ -8,6 +10,8 @@ from starlette.responses import JSONResponse
 from starlette.websockets import WebSocketDisconnect
 from loguru import logger
 from .service_context import ServiceContext
+from .asr.asr_dispatcher import ASRJobExpired
+from .utils.audio_frontend import AudioFrontEnd, to_float32
 from .websocket_handler import WebSocketHandler
 from .proxy_handler import ProxyHandler
 
@@ -153,34 +157,49 @@ def init_webtool_routes(default_context_cache: ServiceContext) -> APIRouter:
                 raise ValueError("Invalid WAV file: File too small")
 
             # Decode the WAV header and get actual audio data
-            wav_header_size = 44  # Standard WAV header size
-            audio_data = contents[wav_header_size:]
-
-            # Validate audio data size
-            if len(audio_data) % 2 != 0:
-                raise ValueError("Invalid audio data: Buffer size must be even")
-
-            # Convert to 16-bit PCM samples to float32
             try:
-                audio_array = (
-                    np.frombuffer(audio_data, dtype=np.int16).astype(np.float32)
-                    / 32768.0
-                )
-            except ValueError as e:
+                with wave.open(io.BytesIO(contents)) as wav:
+                    sample_rate = wav.getframerate()
+                    channels = wav.getnchannels()
+                    sample_width = wav.getsampwidth()
+                    audio_data = wav.readframes(wav.getnframes())
+            except (wave.Error, EOFError) as e:
+                raise ValueError(f"Invalid WAV file: {e}")
+
+            sample_dtype = {1: "u1", 2: "<i2", 4: "<i4"}.get(sample_width)
+            if sample_dtype is None:
                 raise ValueError(
-                    f"Audio format error: {str(e)}. Please ensure the file is 16-bit PCM WAV format."
+                    f"Unsupported sample width of {sample_width} bytes. "
+                    "Please ensure the file is a PCM WAV file."
                 )
+            audio_array = to_float32(np.frombuffer(audio_data, dtype=sample_dtype))
+            if channels > 1:
+                audio_array = audio_array[: len(audio_array) // channels * channels]
+                audio_array = audio_array.reshape(-1, channels).mean(axis=1)
 
             # Validate audio data
             if len(audio_array) == 0:
                 raise ValueError("Empty audio data")
 
+            # Any sample rate is accepted; ASR runs at 16 kHz
+            audio_array = AudioFrontEnd(
+                default_context_cache.system_config.audio_frontend,
+                target_sample_rate=default_context_cache.asr_engine.SAMPLE_RATE,
+            ).process_clip(audio_array, sample_rate)
+
             text = await default_context_cache.asr_engine.async_transcribe_np(
                 audio_array
             )
             logger.info(f"Transcription result: {text}")
             return {"text": text}
 
+        except ASRJobExpired as e:
+            logger.warning(f"Transcription dropped: {e}")
+            return Response(
+                content=json.dumps({"error": "ASR is busy, please retry"}),
+                status_code=503,
+                media_type="application/json",
+            )
         except ValueError as e:
             logger.error(f"Audio format error: {e}")
             return Response(
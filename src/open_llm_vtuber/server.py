@@ -17,6 +17,12 @@ from starlette.staticfiles import StaticFiles as StarletteStaticFiles
 from .routes import init_client_ws_route, init_webtool_routes, init_proxy_route
 from .service_context import ServiceContext
 from .config_manager.utils import Config
+from .utils.http_pool import close_http_pool
+from .agent.stateless_llm.client_registry import close_llm_clients
+
+# Subdirectories of cache/ that survive restarts (see TTSCacheConfig.cache_dir
+# and ResponseCacheConfig.cache_dir)
+PERSISTENT_CACHE_DIRS = {"tts_cache", "response_cache"}
 
 
 # Create a custom StaticFiles class that adds CORS headers
@@ -68,7 +74,7 @@ class WebSocketServer:
 
     Notes:
         - If default_context_cache is omitted, call `await initialize()` to load service context cache.
-        - Use `clean_cache()` to clear and recreate the local cache directory.
+        - Use `clean_cache()` to clear the local cache directory.
     """
 
     def __init__(self, config: Config, default_context_cache: ServiceContext = None):
@@ -79,6 +85,10 @@ class WebSocketServer:
         )  # Use provided context or initialize a new empty one waiting to be loaded
         # It will be populated during the initialize method call
 
+        # Release pooled keep-alive connections to TTS and LLM servers
+        self.app.add_event_handler("shutdown", close_http_pool)
+        self.app.add_event_handler("shutdown", close_llm_clients)
+
         # Add global CORS middleware
         self.app.add_middleware(
             CORSMiddleware,
@@ -155,8 +165,13 @@ class WebSocketServer:
 
     @staticmethod
     def clean_cache():
-        """Clean the cache directory by removing and recreating it."""
+        """Clean the cache directory, keeping the persistent TTS audio cache."""
         cache_dir = "cache"
         if os.path.exists(cache_dir):
-            shutil.rmtree(cache_dir)
-            os.makedirs(cache_dir)
+            for entry in os.scandir(cache_dir):
+                if entry.name in PERSISTENT_CACHE_DIRS:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    os.remove(entry.path)
@@ -19,9 +19,18 @@ from .mcpp.tool_executor import ToolExecutor
 from .mcpp.tool_adapter import ToolAdapter
 
 from .asr.asr_factory import ASRFactory
+from .asr.asr_dispatcher import set_asr_dispatcher
 from .tts.tts_factory import TTSFactory
+from .tts.tts_cache import CachedTTSEngine, get_tts_cache
+from .tts.process_pool_tts import (
+    ProcessPoolTTSEngine,
+    release_tts_engine,
+    retain_tts_engine,
+)
+from .tts.tts_scheduler import set_tts_scheduler
 from .vad.vad_factory import VADFactory
 from .agent.agent_factory import AgentFactory
+from .agent.response_cache import get_response_cache
 from .translate.translate_factory import TranslateFactory
 
 from .config_manager import (
@@ -196,6 +205,9 @@ class ServiceContext:
             self.mcp_client = None
         if self.agent_engine and hasattr(self.agent_engine, "close"):
             await self.agent_engine.close()  # Ensure agent resources are also closed
+        # Stops TTS worker processes once no other session uses them
+        release_tts_engine(self.tts_engine)
+        self.tts_engine = None
         logger.info("ServiceContext closed.")
 
     async def load_cache(
@@ -229,6 +241,7 @@ class ServiceContext:
         self.live2d_model = live2d_model
         self.asr_engine = asr_engine
         self.tts_engine = tts_engine
+        retain_tts_engine(tts_engine)
         self.vad_engine = vad_engine
         self.agent_engine = agent_engine
         self.translate_engine = translate_engine
@@ -327,6 +340,11 @@ class ServiceContext:
                 asr_config.asr_model,
                 **getattr(asr_config, asr_config.asr_model).model_dump(),
             )
+            set_asr_dispatcher(
+                self.asr_engine,
+                max_concurrency=asr_config.max_concurrency,
+                deadline_seconds=asr_config.job_deadline_seconds,
+            )
             # saving config should be done after successful initialization
             self.character_config.asr_config = asr_config
         else:
@@ -335,10 +353,31 @@ class ServiceContext:
     def init_tts(self, tts_config: TTSConfig) -> None:
         if not self.tts_engine or (self.character_config.tts_config != tts_config):
             logger.info(f"Initializing TTS: {tts_config.tts_model}")
-            self.tts_engine = TTSFactory.get_tts_engine(
-                tts_config.tts_model,
-                **getattr(tts_config, tts_config.tts_model.lower()).model_dump(),
-            )
+            previous_engine = self.tts_engine
+            tts_params = getattr(tts_config, tts_config.tts_model.lower()).model_dump()
+            pool_config = tts_config.process_pool
+            if tts_config.tts_model in pool_config.engines:
+                self.tts_engine = ProcessPoolTTSEngine(
+                    tts_config.tts_model,
+                    tts_params,
+                    num_workers=pool_config.num_workers,
+                    request_timeout=pool_config.request_timeout,
+                    health_check_interval=pool_config.health_check_interval,
+                )
+            else:
+                self.tts_engine = TTSFactory.get_tts_engine(
+                    tts_config.tts_model, **tts_params
+                )
+            cache_config = tts_config.tts_cache
+            if cache_config.enabled:
+                self.tts_engine = CachedTTSEngine(
+                    self.tts_engine,
+                    params={"tts_model": tts_config.tts_model, **tts_params},
+                    cache=get_tts_cache(cache_config),
+                )
+            set_tts_scheduler(self.tts_engine, tts_config.max_concurrency)
+            # Other sessions may still use the engine being replaced
+            release_tts_engine(previous_engine)
             # saving config should be done after successful initialization
             self.character_config.tts_config = tts_config
         else:
@@ -391,6 +430,7 @@ class ServiceContext:
                 tool_manager=self.tool_manager,
                 tool_executor=self.tool_executor,
                 mcp_prompt_string=self.mcp_prompt,
+                response_cache=get_response_cache(agent_config.response_cache),
             )
 
             logger.debug(f"Agent choice: {agent_config.conversation_agent_choice}")
@@ -437,6 +477,12 @@ class ServiceContext:
         """
         Append tool prompts to persona prompt.
 
+        Only text that stays the same for the whole session belongs here,
+        in a fixed order, so that every request starts with the same
+        system prompt and can reuse the provider's prompt cache. Context
+        that changes per turn is added by the agent after the user's input
+        (see `BasicMemoryAgent._turn_context`).
+
         Parameters:
         - persona_prompt (str): The persona prompt.
 
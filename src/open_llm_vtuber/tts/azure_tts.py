@@ -2,7 +2,7 @@ import sys
 import os
 import azure.cognitiveservices.speech as speechsdk
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, TTSAudio
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -62,6 +62,24 @@ class TTSEngine(TTSInterface):
         self.__speak_with_audio_config(text, audio_config=file_audio_config)
         return file_name
 
+    def generate_pcm(self, text):
+        """
+        Generate speech audio in memory using TTS.
+        text: str
+            the text to speak
+
+        Returns:
+        TTSAudio: the wav bytes returned by Azure, or None on failure
+        """
+        # audio_config=None keeps the synthesised audio in the result object
+        result = self.__speak_with_audio_config(text, audio_config=None)
+        if (
+            result is None
+            or result.reason != speechsdk.ResultReason.SynthesizingAudioCompleted
+        ):
+            return None
+        return TTSAudio(data=result.audio_data, format=self.file_extension)
+
     def __speak_with_audio_config(
         self,
         text,
@@ -79,6 +97,9 @@ class TTSEngine(TTSInterface):
             the callback function to call when synthesis starts
         on_speak_end_callback: function
             the callback function to call when synthesis ends
+
+        Returns:
+        speechsdk.SpeechSynthesisResult: the synthesis result, or None if there is no text to speak
         """
         speech_synthesizer = speechsdk.SpeechSynthesizer(
             speech_config=self.speech_config, audio_config=audio_config
@@ -132,6 +153,8 @@ class TTSEngine(TTSInterface):
                         "Did you set the speech resource key and region values?"
                     )
 
+        return speech_synthesis_result
+
 
 if __name__ == "__main__":
     tts = TTSEngine(
@@ -3,7 +3,7 @@ import os
 
 import edge_tts
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, TTSAudio
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -49,6 +49,29 @@ class TTSEngine(TTSInterface):
 
         return file_name
 
+    async def async_generate_pcm(self, text):
+        """
+        Generate speech audio in memory using edge-tts' native async stream.
+
+        text: str
+            the text to speak
+
+        Returns:
+        TTSAudio: the mp3 bytes of the speech, or None on failure
+        """
+        try:
+            communicate = edge_tts.Communicate(text, self.voice)
+            audio = bytearray()
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    audio.extend(chunk["data"])
+        except Exception as e:
+            logger.critical(f"\nError: edge-tts unable to generate audio: {e}")
+            logger.critical("It's possible that edge-tts is blocked in your region.")
+            return None
+
+        return TTSAudio(data=bytes(audio), format=self.file_extension)
+
 
 # en-US-AvaMultilingualNeural
 # en-US-EmmaMultilingualNeural
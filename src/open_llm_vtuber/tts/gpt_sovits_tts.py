@@ -5,7 +5,8 @@
 import re
 import requests
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, TTSAudio
+from ..utils.http_pool import get_http_pool
 
 
 class TTSEngine(TTSInterface):
@@ -32,10 +33,39 @@ class TTSEngine(TTSInterface):
         self.streaming_mode = streaming_mode
 
     def generate_audio(self, text, file_name_no_ext=None):
+        audio_bytes = self._request_audio(text)
+        return self._save_audio(audio_bytes, file_name_no_ext)
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        audio_bytes = await self._async_request_audio(text)
+        return self._save_audio(audio_bytes, file_name_no_ext)
+
+    def generate_pcm(self, text):
+        audio_bytes = self._request_audio(text)
+        if audio_bytes is None:
+            return None
+        return TTSAudio(data=audio_bytes, format=self.media_type)
+
+    async def async_generate_pcm(self, text):
+        audio_bytes = await self._async_request_audio(text)
+        if audio_bytes is None:
+            return None
+        return TTSAudio(data=audio_bytes, format=self.media_type)
+
+    def _save_audio(self, audio_bytes, file_name_no_ext):
+        if audio_bytes is None:
+            return None
+
         file_name = self.generate_cache_file_name(file_name_no_ext, self.media_type)
+        # Save the audio content to a file
+        with open(file_name, "wb") as audio_file:
+            audio_file.write(audio_bytes)
+        return file_name
+
+    def _request_params(self, text):
         cleaned_text = re.sub(r"\[.*?\]", "", text)
-        # Prepare the data for the POST request
-        data = {
+        # Prepare the data for the GET request
+        return {
             "text": cleaned_text,
             "text_lang": self.text_lang,
             "ref_audio_path": self.ref_audio_path,
@@ -47,18 +77,28 @@ class TTSEngine(TTSInterface):
             "streaming_mode": self.streaming_mode,
         }
 
-        # Send POST request to the TTS API
-        response = requests.get(self.api_url, params=data, timeout=120)
+    def _request_audio(self, text):
+        """Request speech from the GPT-SoVITS API and return the audio bytes, or None on failure"""
+        # Send GET request to the TTS API
+        response = requests.get(
+            self.api_url, params=self._request_params(text), timeout=120
+        )
+        return self._handle_response(response.status_code, response.content)
+
+    async def _async_request_audio(self, text):
+        """Async version of `_request_audio`, using the shared connection pool"""
+        response = await get_http_pool().request(
+            "GET", self.api_url, params=self._request_params(text)
+        )
+        return self._handle_response(response.status_code, response.content)
 
+    def _handle_response(self, status_code, content):
         # Check if the request was successful
-        if response.status_code == 200:
-            # Save the audio content to a file
-            with open(file_name, "wb") as audio_file:
-                audio_file.write(response.content)
-            return file_name
+        if status_code == 200:
+            return content
         else:
             # Handle errors or unsuccessful requests
             logger.critical(
-                f"Error: Failed to generate audio. Status code: {response.status_code}"
+                f"Error: Failed to generate audio. Status code: {status_code}"
             )
             return None
@@ -1,11 +1,14 @@
 # src/open_llm_vtuber/tts/index_tts.py
 import os
 import sys
+import httpx
 import requests
 import json
+import uuid
 from pathlib import Path
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, TTSAudio
+from ..utils.http_pool import get_http_pool
 from typing import Optional
 
 # Add the current directory to sys.path for relative imports if needed
@@ -160,55 +163,112 @@ class TTSEngine(TTSInterface):
             result = self._generate_audio_local(text, file_name)
             return result
 
+        audio_bytes = self._request_audio(text, file_name)
+        if audio_bytes is None:
+            return None
+
+        with open(file_name, "wb") as audio_file:
+            audio_file.write(audio_bytes)
+        logger.info(f"IndexTTS generated audio: {file_name}")
+        return file_name
+
+    def generate_pcm(self, text):
+        """
+        Generate speech audio in memory using IndexTTS
+
+        Args:
+            text (str): The text to convert to speech
+
+        Returns:
+            TTSAudio: The encoded audio bytes, or None if failed
+        """
+        file_name_no_ext = f"{self.temp_audio_file}_{uuid.uuid4().hex[:8]}"
+
+        if str(self.api_url).strip().lower() == "local":
+            # The local library only writes files, so read the result back
+            file_name = self.generate_audio(text, file_name_no_ext)
+            if not file_name:
+                return None
+            with open(file_name, "rb") as audio_file:
+                audio_bytes = audio_file.read()
+            self.remove_file(file_name, verbose=False)
+        else:
+            audio_bytes = self._request_audio(
+                text,
+                self.generate_cache_file_name(file_name_no_ext, self.file_extension),
+            )
+            if audio_bytes is None:
+                return None
+
+        return TTSAudio(data=audio_bytes, format=self.file_extension)
+
+    async def async_generate_audio(self, text, file_name_no_ext=None):
+        """
+        Asynchronously generate speech audio file using IndexTTS
+
+        The API is called through the shared connection pool. Local mode
+        runs the blocking library call in a worker thread.
+        """
+        if str(self.api_url).strip().lower() == "local":
+            return await super().async_generate_audio(text, file_name_no_ext)
+
+        file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        audio_bytes = await self._async_request_audio(text, file_name)
+        if audio_bytes is None:
+            return None
+
+        with open(file_name, "wb") as audio_file:
+            audio_file.write(audio_bytes)
+        logger.info(f"IndexTTS generated audio: {file_name}")
+        return file_name
+
+    async def async_generate_pcm(self, text):
+        """Asynchronously generate speech audio in memory using IndexTTS"""
+        if str(self.api_url).strip().lower() == "local":
+            return await super().async_generate_pcm(text)
+
+        file_name_no_ext = f"{self.temp_audio_file}_{uuid.uuid4().hex[:8]}"
+        audio_bytes = await self._async_request_audio(
+            text, self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        )
+        if audio_bytes is None:
+            return None
+        return TTSAudio(data=audio_bytes, format=self.file_extension)
+
+    def _request_data(self, text: str, output_path: str) -> dict:
+        """Build the JSON body of an IndexTTS API request"""
+        return {
+            "text": text,
+            "voice_path": self.voice_path,
+            "model_path": self.model_path,
+            "config_path": self.config_path,
+            "use_emo_text": self.use_emo_text,
+            "emo_alpha": self.emo_alpha,
+            "use_random": self.use_random,
+            "output_path": output_path,
+        }
+
+    def _request_audio(self, text: str, output_path: str) -> Optional[bytes]:
+        """
+        Request speech from the IndexTTS API
+
+        Args:
+            text (str): The text to convert to speech
+            output_path (str): Output path hint passed to the API server
+
+        Returns:
+            bytes: The audio bytes, or None if failed
+        """
         try:
-            # Prepare request data
-            data = {
-                "text": text,
-                "voice_path": self.voice_path,
-                "model_path": self.model_path,
-                "config_path": self.config_path,
-                "use_emo_text": self.use_emo_text,
-                "emo_alpha": self.emo_alpha,
-                "use_random": self.use_random,
-                "output_path": file_name
-            }
-            
             # Send request to IndexTTS API
             response = requests.post(
                 self.api_url,
-                json=data,
+                json=self._request_data(text, output_path),
                 timeout=120,
                 headers={"Content-Type": "application/json"}
             )
-            
-            if response.status_code == 200:
-                # Check if the response contains audio data
-                if response.headers.get("content-type", "").startswith("audio/"):
-                    # Save audio data directly
-                    with open(file_name, "wb") as audio_file:
-                        audio_file.write(response.content)
-                else:
-                    # Response might be JSON with file path or status
-                    try:
-                        result = response.json()
-                        if result.get("success") and result.get("audio_path"):
-                            # Copy from generated path to our cache
-                            import shutil
-                            shutil.copy2(result["audio_path"], file_name)
-                        else:
-                            logger.error(f"IndexTTS API error: {result.get('error', 'Unknown error')}")
-                            return None
-                    except json.JSONDecodeError:
-                        logger.error("Invalid response from IndexTTS API")
-                        return None
-                        
-                logger.info(f"IndexTTS generated audio: {file_name}")
-                return file_name
-                
-            else:
-                logger.error(f"IndexTTS API request failed with status {response.status_code}: {response.text}")
-                return None
-                
+            return self._handle_response(response)
+
         except requests.exceptions.RequestException as e:
             logger.error(f"IndexTTS API connection error: {e}")
             return None
@@ -216,6 +276,56 @@ class TTSEngine(TTSInterface):
             logger.error(f"IndexTTS generation error: {e}")
             return None
 
+    async def _async_request_audio(self, text: str, output_path: str) -> Optional[bytes]:
+        """Async version of `_request_audio`, using the shared connection pool"""
+        try:
+            response = await get_http_pool().request(
+                "POST",
+                self.api_url,
+                json=self._request_data(text, output_path),
+                headers={"Content-Type": "application/json"},
+            )
+            return self._handle_response(response)
+
+        except httpx.HTTPError as e:
+            logger.error(f"IndexTTS API connection error: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"IndexTTS generation error: {e}")
+            return None
+
+    def _handle_response(self, response) -> Optional[bytes]:
+        """
+        Extract the audio from an IndexTTS API response
+
+        Args:
+            response: A `requests` or `httpx` response
+
+        Returns:
+            bytes: The audio bytes, or None if failed
+        """
+        if response.status_code == 200:
+            # Check if the response contains audio data
+            if response.headers.get("content-type", "").startswith("audio/"):
+                return response.content
+
+            # Response might be JSON with file path or status
+            try:
+                result = response.json()
+                if result.get("success") and result.get("audio_path"):
+                    # Read the audio the server wrote to its own path
+                    with open(result["audio_path"], "rb") as audio_file:
+                        return audio_file.read()
+                logger.error(f"IndexTTS API error: {result.get('error', 'Unknown error')}")
+                return None
+            except json.JSONDecodeError:
+                logger.error("Invalid response from IndexTTS API")
+                return None
+
+        else:
+            logger.error(f"IndexTTS API request failed with status {response.status_code}: {response.text}")
+            return None
+
     def set_emotion(self, emotion_vector=None, emotion_text=None):
         """
         Set emotion parameters for IndexTTS
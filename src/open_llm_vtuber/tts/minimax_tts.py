@@ -1,7 +1,9 @@
+import json
 import os
 import requests
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, TTSAudio
+from ..utils.http_pool import get_http_pool
 
 
 class TTSEngine(TTSInterface):
@@ -24,9 +26,77 @@ class TTSEngine(TTSInterface):
             os.makedirs(self.cache_dir)
 
     def generate_audio(self, text: str, file_name_no_ext=None) -> str:
-        import json
+        audio = self._request_audio(text)
+        return self._save_audio(audio, file_name_no_ext)
+
+    async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        audio = await self._async_request_audio(text)
+        return self._save_audio(audio, file_name_no_ext)
+
+    def _save_audio(self, audio: bytes, file_name_no_ext=None) -> str:
+        if audio is None:
+            return None
 
         file_name = self.generate_cache_file_name(file_name_no_ext, self.file_extension)
+        with open(file_name, "wb") as f:
+            f.write(audio)
+        return file_name
+
+    def generate_pcm(self, text: str) -> TTSAudio:
+        audio = self._request_audio(text)
+        if audio is None:
+            return None
+        return TTSAudio(data=audio, sample_rate=32000, format=self.file_extension)
+
+    async def async_generate_pcm(self, text: str) -> TTSAudio:
+        audio = await self._async_request_audio(text)
+        if audio is None:
+            return None
+        return TTSAudio(data=audio, sample_rate=32000, format=self.file_extension)
+
+    def stream_pcm(self, text: str):
+        """Request speech from the Minimax API as raw PCM, yielding chunks as they arrive"""
+        url, headers, body = self._build_request(text, audio_format="pcm")
+        with requests.post(
+            url, stream=True, headers=headers, data=json.dumps(body)
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                audio = self._parse_event(line)
+                if audio:
+                    yield TTSAudio(data=audio, sample_rate=32000, format="pcm")
+
+    async def async_stream_pcm(self, text: str):
+        """Async version of `stream_pcm`, using the shared connection pool"""
+        url, headers, body = self._build_request(text, audio_format="pcm")
+        async with get_http_pool().stream(
+            "POST", url, headers=headers, content=json.dumps(body)
+        ) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                audio = self._parse_event(line)
+                if audio:
+                    yield TTSAudio(data=audio, sample_rate=32000, format="pcm")
+
+    @staticmethod
+    def _parse_event(line: bytes | str) -> bytes | None:
+        """Return the audio carried by one server-sent event line, if any"""
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line.startswith("data:"):
+            return None
+        try:
+            data = json.loads(line[5:])
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse audio chunk: {e}")
+            return None
+        # The final event repeats the whole audio along with extra_info
+        if "extra_info" in data or not data.get("data", {}).get("audio"):
+            return None
+        return bytes.fromhex(data["data"]["audio"])
+
+    def _build_request(self, text: str, audio_format: str) -> tuple[str, dict, dict]:
+        """Return the URL, headers and body of a Minimax speech request"""
         url = "https://api.minimax.chat/v1/t2a_v2?GroupId=" + self.group_id
         headers = {
             "accept": "application/json, text/plain, */*",
@@ -59,10 +129,15 @@ class TTSEngine(TTSInterface):
             "audio_setting": {
                 "sample_rate": 32000,
                 "bitrate": 128000,
-                "format": self.file_extension,
+                "format": audio_format,
                 "channel": 1,
             },
         }
+        return url, headers, body
+
+    def _request_audio(self, text: str) -> bytes:
+        """Request speech from the Minimax API and return the audio bytes, or None on failure"""
+        url, headers, body = self._build_request(text, self.file_extension)
 
         try:
             response = requests.request(
@@ -81,9 +156,23 @@ class TTSEngine(TTSInterface):
                                     audio += decoded
                         except Exception as e:
                             logger.error(f"Failed to parse audio chunk: {e}")
-            with open(file_name, "wb") as f:
-                f.write(audio)
-            return file_name
+            return audio
         except Exception as e:
             logger.error(f"Exception in minimax_tts generate_audio: {e}")
             return None
+
+    async def _async_request_audio(self, text: str) -> bytes:
+        """Async version of `_request_audio`, using the shared connection pool"""
+        url, headers, body = self._build_request(text, self.file_extension)
+
+        try:
+            audio = bytearray()
+            async with get_http_pool().stream(
+                "POST", url, headers=headers, content=json.dumps(body)
+            ) as response:
+                async for line in response.aiter_lines():
+                    audio += self._parse_event(line) or b""
+            return bytes(audio)
+        except Exception as e:
+            logger.error(f"Exception in minimax_tts async_generate_audio: {e}")
+            return None
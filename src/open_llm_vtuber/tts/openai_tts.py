@@ -6,7 +6,7 @@ from pathlib import Path
 from loguru import logger
 from openai import OpenAI  # Use the official OpenAI library
 
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, TTSAudio
 
 # Add the current directory to sys.path for relative imports if needed
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -117,6 +117,64 @@ class TTSEngine(TTSInterface):
 
         return str(speech_file_path)
 
+    def generate_pcm(self, text, speed=1.0):
+        """
+        Generate speech audio in memory using OpenAI TTS.
+
+        Args:
+            text (str): The text to synthesize.
+            speed (float): The speed of the speech (0.25 to 4.0). Defaults to 1.0.
+
+        Returns:
+            TTSAudio: The encoded audio bytes, or None if generation failed.
+        """
+        if not self.client:
+            logger.error("OpenAI client not initialized. Cannot generate audio.")
+            return None
+
+        try:
+            with self.client.audio.speech.with_streaming_response.create(
+                model=self.model,
+                voice=self.voice,
+                input=text,
+                response_format=self.file_extension,
+                speed=speed,
+            ) as response:
+                audio_bytes = response.read()
+        except Exception as e:
+            logger.critical(f"Error: OpenAI TTS unable to generate audio: {e}")
+            return None
+
+        return TTSAudio(data=audio_bytes, format=self.file_extension)
+
+    def stream_pcm(self, text, speed=1.0):
+        """
+        Generate speech using OpenAI TTS, yielding audio as it arrives.
+
+        The audio is requested as raw PCM, which OpenAI-compatible servers
+        return as 24 kHz, 16-bit little-endian mono samples.
+
+        Args:
+            text (str): The text to synthesize.
+            speed (float): The speed of the speech (0.25 to 4.0). Defaults to 1.0.
+
+        Yields:
+            TTSAudio: int16 PCM chunks.
+        """
+        if not self.client:
+            logger.error("OpenAI client not initialized. Cannot generate audio.")
+            return
+
+        with self.client.audio.speech.with_streaming_response.create(
+            model=self.model,
+            voice=self.voice,
+            input=text,
+            response_format="pcm",
+            speed=speed,
+        ) as response:
+            for data in response.iter_bytes(chunk_size=4800):
+                yield TTSAudio(data=data, sample_rate=24000, format="pcm")
+
 
 # Example usage (optional, for testing with the compatible endpoint)
 # if __name__ == '__main__':
@@ -0,0 +1,420 @@
+"""
+Run a TTS engine in dedicated worker processes.
+
+Local engines (sherpa-onnx, MeloTTS, Coqui, Bark, ...) do part of their
+work in Python while holding the GIL, which stalls the event loop serving
+every WebSocket. `ProcessPoolTTSEngine` builds the real engine inside one
+or more worker processes, each loading the model once, and forwards
+requests to them over pipes. The calling thread only waits on the pipe,
+so the server process stays responsive.
+
+Workers that crash, stop answering health checks, or exceed the request
+timeout are killed and restarted.
+
+Sessions share an engine (see `ServiceContext.load_cache`), so each one
+registers with `retain_tts_engine` and gives it up with
+`release_tts_engine`; the worker processes are stopped when the last
+session releases the engine, and at the latest when the server exits.
+"""
+
+import asyncio
+import atexit
+import multiprocessing
+import queue
+import signal
+import threading
+import time
+import weakref
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from .tts_interface import TTSInterface, TTSAudio
+from .tts_cache import CachedTTSEngine
+
+# Engines whose workers are still running; weak, so this does not keep
+# an engine that nothing else uses alive
+_open_engines: "weakref.WeakSet[ProcessPoolTTSEngine]" = weakref.WeakSet()
+
+
+class _EngineRunner:
+    """
+    Calls an engine method in a worker, using its async version if the
+    engine only implements that one (e.g. edge_tts's async_generate_pcm).
+    """
+
+    def __init__(self, engine: TTSInterface):
+        self.engine = engine
+        # One loop for the worker's lifetime, so clients bound to it
+        # (see utils.http_pool) are reused across requests
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def call(self, name: str, *args) -> Any:
+        async_name = f"async_{name}"
+        if not self._overrides(name) and self._overrides(async_name):
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            return self._loop.run_until_complete(
+                getattr(self.engine, async_name)(*args)
+            )
+        return getattr(self.engine, name)(*args)
+
+    def _overrides(self, name: str) -> bool:
+        return getattr(type(self.engine), name) is not getattr(TTSInterface, name)
+
+
+def _worker_main(conn, engine_type: str, engine_kwargs: Dict[str, Any]) -> None:
+    """Entry point of a worker process: build the engine, then serve requests"""
+    # Ctrl+C is handled by the server, which stops the workers itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from .tts_factory import TTSFactory
+
+    try:
+        engine = TTSFactory.get_tts_engine(engine_type, **engine_kwargs)
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+        return
+    runner = _EngineRunner(engine)
+    conn.send(("ready", (engine.supports_pcm, engine.supports_batch)))
+
+    while True:
+        try:
+            op, args = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if op == "stop":
+            return
+        try:
+            if op == "ping":
+                result = "pong"
+            elif op == "pcm":
+                result = runner.call("generate_pcm", *args)
+            elif op == "pcm_batch":
+                result = runner.call("generate_pcm_batch", *args)
+            elif op == "file":
+                result = engine.generate_audio(*args)
+            else:
+                raise ValueError(f"Unknown request: {op}")
+            conn.send(("ok", result))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+class WorkerError(RuntimeError):
+    """A worker process crashed, timed out or failed to start"""
+
+
+class _Worker:
+    """One worker process and the parent's end of its pipe"""
+
+    def __init__(self, index: int, engine_type: str, engine_kwargs: Dict[str, Any]):
+        self.index = index
+        self.engine_type = engine_type
+        self.engine_kwargs = engine_kwargs
+        self.process: Optional[multiprocessing.Process] = None
+        self.conn = None
+        self.supports_pcm = False
+        self.supports_batch = False
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+    def start(self, startup_timeout: float) -> None:
+        # spawn, not fork: forking a process that runs an event loop and
+        # threads is unsafe, and CUDA cannot be used in forked children
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.engine_type, self.engine_kwargs),
+            name=f"tts-worker-{self.engine_type}-{self.index}",
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+        status, detail = self._recv(startup_timeout)
+        if status != "ready":
+            self.stop()
+            raise WorkerError(f"TTS worker {self.index} failed to start: {detail}")
+        self.supports_pcm, self.supports_batch = detail
+
+    def call(self, op: str, args: tuple, timeout: float) -> Any:
+        if self.conn is None:
+            raise WorkerError(f"TTS worker {self.index} is not running")
+        try:
+            self.conn.send((op, args))
+        except (BrokenPipeError, OSError) as e:
+            raise WorkerError(f"TTS worker {self.index} is gone: {e}") from e
+        status, result = self._recv(timeout)
+        if status == "error":
+            # The engine raised; the worker itself is fine
+            raise RuntimeError(result)
+        return result
+
+    def _recv(self, timeout: float) -> tuple:
+        # stop() may run on another thread when the engine is closed
+        conn = self.conn
+        if conn is None:
+            raise WorkerError(f"TTS worker {self.index} was stopped")
+        try:
+            if not conn.poll(timeout):
+                raise WorkerError(
+                    f"TTS worker {self.index} did not answer within {timeout}s"
+                )
+            return conn.recv()
+        except (EOFError, OSError) as e:
+            raise WorkerError(f"TTS worker {self.index} crashed: {e}") from e
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self.conn is not None:
+            try:
+                self.conn.send(("stop", ()))
+            except (BrokenPipeError, OSError):
+                pass
+        if self.process is not None:
+            self.process.join(timeout)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+        self.process = None
+        self.conn = None
+
+
+class ProcessPoolTTSEngine(TTSInterface):
+    """
+    A TTS engine whose synthesis runs in a pool of worker processes.
+
+    PCM is returned through the pipe when the engine supports in-memory
+    generation; otherwise the worker writes the usual cache file and
+    returns its path. Streaming is not available in this mode.
+    """
+
+    def __init__(
+        self,
+        engine_type: str,
+        engine_kwargs: Dict[str, Any],
+        num_workers: int = 1,
+        request_timeout: float = 120.0,
+        startup_timeout: float = 300.0,
+        health_check_interval: float = 30.0,
+    ):
+        self.engine_type = engine_type
+        self.request_timeout = request_timeout
+        self.startup_timeout = startup_timeout
+        self.restarts = 0
+
+        self._workers: List[_Worker] = [
+            _Worker(i, engine_type, engine_kwargs) for i in range(num_workers)
+        ]
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._closed = threading.Event()
+        # Sessions using this engine; the creator counts as the first
+        self._users = 1
+        self._users_lock = threading.Lock()
+
+        start = time.monotonic()
+        try:
+            for worker in self._workers:
+                worker.start(startup_timeout)
+                self._idle.put(worker)
+        except Exception:
+            self.close()
+            raise
+        self._supports_pcm = self._workers[0].supports_pcm
+        self._supports_batch = self._workers[0].supports_batch
+        logger.info(
+            f"Started {num_workers} {engine_type} worker process(es) "
+            f"in {time.monotonic() - start:.1f}s"
+        )
+
+        if health_check_interval > 0:
+            # The thread holds only a weak reference, so an engine that is
+            # no longer used can still be garbage-collected
+            threading.Thread(
+                target=_monitor,
+                args=(weakref.ref(self), self._closed, health_check_interval),
+                name=f"tts-worker-monitor-{engine_type}",
+                daemon=True,
+            ).start()
+        _open_engines.add(self)
+
+    @property
+    def supports_pcm(self) -> bool:
+        return self._supports_pcm
+
+    @property
+    def supports_batch(self) -> bool:
+        return self._supports_batch
+
+    def generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        return self._call("file", (text, file_name_no_ext))
+
+    def generate_pcm(self, text: str) -> Optional[TTSAudio]:
+        return self._call("pcm", (text,))
+
+    def generate_pcm_batch(self, texts: List[str]) -> List[Optional[TTSAudio]]:
+        # One pipe round trip for the whole batch
+        return self._call("pcm_batch", (texts,)) or [None] * len(texts)
+
+    def _call(self, op: str, args: tuple) -> Any:
+        worker = self._idle.get()
+        try:
+            if not worker.alive:
+                self._restart(worker, "process exited")
+            return worker.call(op, args, self.request_timeout)
+        except WorkerError as e:
+            logger.error(f"{e}; restarting it")
+            self._restart(worker, str(e))
+            return None
+        except RuntimeError as e:
+            logger.error(f"{self.engine_type} worker failed to generate audio: {e}")
+            return None
+        finally:
+            self._idle.put(worker)
+
+    def _restart(self, worker: _Worker, reason: str) -> None:
+        if self._closed.is_set():
+            return
+        self.restarts += 1
+        logger.warning(
+            f"Restarting {self.engine_type} worker {worker.index} ({reason})"
+        )
+        worker.stop(timeout=1.0)
+        try:
+            worker.start(self.startup_timeout)
+        except WorkerError as e:
+            # Left stopped; the next request or health check tries again
+            logger.error(str(e))
+
+    def health_check(self, timeout: float = 5.0) -> int:
+        """
+        Ping every idle worker and restart the ones that do not answer.
+
+        Workers busy with a request are skipped; they are checked by the
+        request timeout instead.
+
+        Returns:
+            int: The number of workers that were restarted.
+        """
+        checked: List[_Worker] = []
+        restarted = 0
+        try:
+            while True:
+                checked.append(self._idle.get_nowait())
+        except queue.Empty:
+            pass
+        try:
+            for worker in checked:
+                try:
+                    if not worker.alive:
+                        raise WorkerError(f"TTS worker {worker.index} exited")
+                    worker.call("ping", (), timeout)
+                except (WorkerError, RuntimeError) as e:
+                    self._restart(worker, str(e))
+                    restarted += 1
+        finally:
+            for worker in checked:
+                self._idle.put(worker)
+        return restarted
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._workers),
+            "alive": sum(worker.alive for worker in self._workers),
+            "idle": self._idle.qsize(),
+            "restarts": self.restarts,
+        }
+
+    def retain(self) -> None:
+        """Register one more session using this engine"""
+        with self._users_lock:
+            self._users += 1
+
+    def release(self) -> None:
+        """
+        Unregister a session; the last one to leave closes the engine.
+
+        The workers are stopped in a background thread, which waits for
+        requests still in progress, so the caller does not block.
+        """
+        with self._users_lock:
+            self._users -= 1
+            if self._users > 0:
+                return
+        threading.Thread(
+            target=self.close,
+            name=f"tts-worker-close-{self.engine_type}",
+            daemon=True,
+        ).start()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop all worker processes.
+
+        Workers busy with a request are stopped when they finish it, or
+        killed after `timeout` seconds (default: the request timeout).
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        _open_engines.discard(self)
+        deadline = time.monotonic() + (
+            self.request_timeout if timeout is None else timeout
+        )
+        stopped = set()
+        while len(stopped) < len(self._workers):
+            try:
+                worker = self._idle.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            worker.stop()
+            stopped.add(worker.index)
+        for worker in self._workers:
+            if worker.index not in stopped:
+                worker.stop(timeout=0)
+        logger.info(f"Stopped the {self.engine_type} worker process(es)")
+
+
+def _monitor(engine_ref, closed: threading.Event, interval: float) -> None:
+    """Health-check an engine's workers until it is closed or collected"""
+    while not closed.wait(interval):
+        engine = engine_ref()
+        if engine is None:
+            return
+        try:
+            engine.health_check()
+        except Exception as e:
+            logger.error(f"TTS worker health check failed: {e}")
+        del engine
+
+
+def _pool_engine(engine: Optional[TTSInterface]) -> Optional[ProcessPoolTTSEngine]:
+    if isinstance(engine, CachedTTSEngine):
+        engine = engine.engine
+    return engine if isinstance(engine, ProcessPoolTTSEngine) else None
+
+
+def retain_tts_engine(engine: Optional[TTSInterface]) -> None:
+    """Register a session using `engine`, if it runs in worker processes"""
+    pool = _pool_engine(engine)
+    if pool is not None:
+        pool.retain()
+
+
+def release_tts_engine(engine: Optional[TTSInterface]) -> None:
+    """Unregister a session from `engine`, closing it if it was the last"""
+    pool = _pool_engine(engine)
+    if pool is not None:
+        pool.release()
+
+
+@atexit.register
+def _close_open_engines() -> None:
+    for engine in list(_open_engines):
+        engine.close(timeout=5.0)
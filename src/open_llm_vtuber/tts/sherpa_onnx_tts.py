@@ -1,10 +1,11 @@
 import sys
 import os
 
+import numpy as np
 import sherpa_onnx
 import soundfile as sf
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, TTSAudio, stream_from_thread
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(current_dir)
@@ -110,3 +111,63 @@ class TTSEngine(TTSInterface):
         except Exception as e:
             logger.critical(f"\nError: sherpa-onnx unable to generate audio: {e}")
             return None
+
+    def generate_pcm(self, text):
+        """
+        Generate speech audio in memory using sherpa-onnx TTS.
+
+        Parameters:
+            text (str): The text to speak.
+
+        Returns:
+            TTSAudio: float32 PCM samples and their sample rate, or None on failure.
+        """
+        try:
+            audio = self.tts.generate(text, sid=self.sid, speed=self.speed)
+
+            if len(audio.samples) == 0:
+                logger.error(
+                    "Error in generating audios. Please read previous error messages."
+                )
+                return None
+
+            return TTSAudio(
+                data=np.asarray(audio.samples, dtype=np.float32),
+                sample_rate=audio.sample_rate,
+                format="pcm",
+            )
+
+        except Exception as e:
+            logger.critical(f"\nError: sherpa-onnx unable to generate audio: {e}")
+            return None
+
+    async def async_stream_pcm(self, text):
+        """
+        Generate speech with sherpa-onnx, yielding audio as it is synthesised.
+
+        sherpa-onnx splits the text into groups of up to `max_num_sentences`
+        sentences and reports each group's samples through a callback, so the
+        first chunk is available before the whole text is done.
+
+        Parameters:
+            text (str): The text to speak.
+
+        Yields:
+            TTSAudio: float32 PCM chunks and their sample rate.
+        """
+        sample_rate = self.tts.sample_rate
+
+        def produce(emit):
+            def on_samples(samples, progress):
+                chunk = TTSAudio(
+                    data=np.array(samples, dtype=np.float32),
+                    sample_rate=sample_rate,
+                    format="pcm",
+                )
+                # Returning 0 tells sherpa-onnx to stop synthesising
+                return 1 if emit(chunk) else 0
+
+            self.tts.generate(text, sid=self.sid, speed=self.speed, callback=on_samples)
+
+        async for chunk in stream_from_thread(produce):
+            yield chunk
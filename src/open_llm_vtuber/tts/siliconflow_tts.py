@@ -1,6 +1,8 @@
+import httpx
 import requests
 from loguru import logger
-from .tts_interface import TTSInterface
+from .tts_interface import TTSInterface, TTSAudio
+from ..utils.http_pool import get_http_pool
 
 
 class SiliconFlowTTS(TTSInterface):
@@ -27,14 +29,91 @@ class SiliconFlowTTS(TTSInterface):
         self.gain = gain
 
     def generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        audio_bytes = self._request_audio(text)
+        return self._save_audio(audio_bytes, file_name_no_ext)
+
+    async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        audio_bytes = await self._async_request_audio(text)
+        return self._save_audio(audio_bytes, file_name_no_ext)
+
+    def _save_audio(self, audio_bytes: bytes | None, file_name_no_ext=None) -> str:
         cache_file = self.generate_cache_file_name(
             file_name_no_ext, file_extension=self.response_format
         )
+        if audio_bytes is None:
+            return ""
+
+        with open(cache_file, "wb") as f:
+            f.write(audio_bytes)
+        logger.info(
+            f"成功生成音频文件Successfully generated the audio file.: {cache_file}"
+        )
+        return cache_file
+
+    def generate_pcm(self, text: str) -> TTSAudio | None:
+        audio_bytes = self._request_audio(text)
+        if audio_bytes is None:
+            return None
+        return TTSAudio(
+            data=audio_bytes,
+            sample_rate=self.sample_rate,
+            format=self.response_format,
+        )
+
+    async def async_generate_pcm(self, text: str) -> TTSAudio | None:
+        audio_bytes = await self._async_request_audio(text)
+        if audio_bytes is None:
+            return None
+        return TTSAudio(
+            data=audio_bytes,
+            sample_rate=self.sample_rate,
+            format=self.response_format,
+        )
+
+    async def async_stream_pcm(self, text: str):
+        """Async version of `stream_pcm`, using the shared connection pool"""
+        if self.api_url is None:
+            logger.error(
+                "API URL 未正确配置，请检查配置文件。The configuration is incorrect. Please check the configuration file."
+            )
+            return
+
+        payload, headers = self._build_request(text, "pcm", stream=True)
+        async with get_http_pool().stream(
+            "POST", self.api_url, json=payload, headers=headers
+        ) as response:
+            response.raise_for_status()
+            async for data in response.aiter_bytes(chunk_size=4096):
+                yield TTSAudio(data=data, sample_rate=self.sample_rate, format="pcm")
+
+    def stream_pcm(self, text: str):
+        """Request speech from the SiliconFlow API as raw PCM, yielding chunks as they arrive"""
+        if self.api_url is None:
+            logger.error(
+                "API URL 未正确配置，请检查配置文件。The configuration is incorrect. Please check the configuration file."
+            )
+            return
+
+        payload, headers = self._build_request(text, "pcm", stream=True)
+        with requests.post(
+            self.api_url, json=payload, headers=headers, stream=True
+        ) as response:
+            response.raise_for_status()
+            for data in response.iter_content(chunk_size=4096):
+                if data:
+                    yield TTSAudio(
+                        data=data, sample_rate=self.sample_rate, format="pcm"
+                    )
+
+    def _build_request(
+        self, text: str, response_format: str, stream: bool
+    ) -> tuple[dict, dict]:
+        """Return the JSON body and headers of a SiliconFlow speech request"""
         payload = {
             "input": text,
-            "response_format": self.response_format,
+            "response_format": response_format,
             "sample_rate": self.sample_rate,
-            "stream": self.stream,
+            "stream": stream,
             "speed": self.speed,
             "gain": self.gain,
             "model": self.default_model,
@@ -44,26 +123,49 @@ class SiliconFlowTTS(TTSInterface):
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
         }
+        return payload, headers
+
+    def _request_audio(self, text: str) -> bytes | None:
+        """Request speech from the SiliconFlow API and return the audio bytes, or None on failure"""
+        payload, headers = self._build_request(
+            text, self.response_format, stream=self.stream
+        )
 
         try:
             if self.api_url is None:
                 logger.error(
                     "API URL 未正确配置，请检查配置文件。The configuration is incorrect. Please check the configuration file."
                 )
-                return ""
+                return None
             response = requests.request(
                 "POST", self.api_url, json=payload, headers=headers
             )
             response.raise_for_status()  # Check the response status code
-            with open(cache_file, "wb") as f:
-                f.write(response.content)
-            logger.info(
-                f"成功生成音频文件Successfully generated the audio file.: {cache_file}"
-            )
-            return cache_file
+            return response.content
         except requests.RequestException as e:
             logger.error(f"生成音频文件失败Failed to generate the audio file.: {e}")
-            return ""
+            return None
+
+    async def _async_request_audio(self, text: str) -> bytes | None:
+        """Async version of `_request_audio`, using the shared connection pool"""
+        payload, headers = self._build_request(
+            text, self.response_format, stream=self.stream
+        )
+
+        if self.api_url is None:
+            logger.error(
+                "API URL 未正确配置，请检查配置文件。The configuration is incorrect. Please check the configuration file."
+            )
+            return None
+        try:
+            response = await get_http_pool().request(
+                "POST", self.api_url, json=payload, headers=headers
+            )
+            response.raise_for_status()  # Check the response status code
+            return response.content
+        except httpx.HTTPError as e:
+            logger.error(f"生成音频文件失败Failed to generate the audio file.: {e}")
+            return None
 
     def remove_file(self, filepath: str, verbose: bool = True) -> None:
         super().remove_file(filepath, verbose)
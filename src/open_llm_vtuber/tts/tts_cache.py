@@ -0,0 +1,510 @@
+import asyncio
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+import unicodedata
+import wave
+from collections import OrderedDict
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import numpy as np
+from loguru import logger
+
+from .tts_interface import TTSInterface, TTSAudio
+from ..config_manager import TTSCacheConfig
+
+# Engine parameters that identify an account rather than a voice
+_CREDENTIAL_MARKERS = ("key", "token", "secret", "password")
+
+
+def normalize_text(text: str) -> str:
+    """Normalise text for cache lookups: NFKC, trimmed, collapsed whitespace"""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def _audio_nbytes(audio: TTSAudio) -> int:
+    data = audio.data
+    return data.nbytes if isinstance(data, np.ndarray) else len(data)
+
+
+def _join_pcm(chunks: List[TTSAudio]) -> TTSAudio:
+    """Concatenate streamed PCM chunks into one int16 TTSAudio"""
+    if all(isinstance(c.data, (bytes, bytearray)) for c in chunks):
+        data = b"".join(c.data for c in chunks)
+        # Drop a dangling byte rather than fail on a truncated stream
+        samples = np.frombuffer(data[: len(data) - len(data) % 2], dtype="<i2")
+    else:
+        parts = []
+        for chunk in chunks:
+            data = chunk.data
+            if isinstance(data, (bytes, bytearray)):
+                data = np.frombuffer(data, dtype="<i2")
+            data = np.asarray(data).reshape(-1)
+            if data.dtype != np.int16:
+                data = (np.clip(data, -1.0, 1.0) * 32767).astype(np.int16)
+            parts.append(data)
+        samples = np.concatenate(parts)
+    return TTSAudio(data=samples, sample_rate=chunks[0].sample_rate, format="pcm")
+
+
+def _decode_wav(data: bytes) -> TTSAudio:
+    """Decode a 16-bit mono WAV written by `_encode_for_disk` back into PCM"""
+    with wave.open(io.BytesIO(data), "rb") as wf:
+        frames = wf.readframes(wf.getnframes())
+        return TTSAudio(
+            data=np.frombuffer(frames, dtype="<i2"),
+            sample_rate=wf.getframerate(),
+            format="pcm",
+        )
+
+
+def _encode_for_disk(audio: TTSAudio) -> tuple[bytes, str]:
+    """Return the file bytes and extension to store an audio entry on disk"""
+    if audio.format != "pcm":
+        return bytes(audio.data), audio.format
+
+    samples = audio.data
+    if isinstance(samples, (bytes, bytearray)):
+        pcm = bytes(samples)
+    else:
+        samples = np.asarray(samples)
+        if samples.dtype != np.int16:
+            samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        pcm = samples.tobytes()
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(audio.sample_rate)
+        wf.writeframes(pcm)
+    return buffer.getvalue(), "wav"
+
+
+class TTSCache:
+    """
+    Content-addressed, size-bounded cache of synthesised audio.
+
+    There are two tiers, both evicted in least-recently-used order once
+    their byte limit is exceeded:
+    - memory: TTSAudio objects, as returned by the engine
+    - disk: one encoded audio file per entry, named after the cache key
+
+    The disk tier survives restarts; existing files are indexed on startup
+    in modification-time order. All methods are thread safe, since engines
+    are usually called through `asyncio.to_thread`.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "cache/tts_cache",
+        memory_max_bytes: int = 32 * 1024 * 1024,
+        disk_max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.cache_dir = cache_dir
+        self.memory_max_bytes = memory_max_bytes
+        self.disk_max_bytes = disk_max_bytes
+
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, TTSAudio] = OrderedDict()
+        self._memory_bytes = 0
+        # key -> (file path, size in bytes)
+        self._disk: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._disk_bytes = 0
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if self.disk_max_bytes > 0:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _load_disk_index(self) -> None:
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file():
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.path, stat.st_size))
+        for _, path, size in sorted(entries):
+            key = os.path.splitext(os.path.basename(path))[0]
+            self._disk[key] = (path, size)
+            self._disk_bytes += size
+        with self._lock:
+            self._evict_disk()
+        logger.info(
+            f"TTS cache: indexed {len(self._disk)} files "
+            f"({self._disk_bytes / 1024 / 1024:.1f} MB) in {self.cache_dir}"
+        )
+
+    @staticmethod
+    def make_key(
+        engine: TTSInterface, params: Dict[str, Any], text: str, variant: str = ""
+    ) -> str:
+        """
+        Build the cache key for a piece of text.
+
+        Args:
+            engine: The TTS engine that synthesises the text.
+            params: The engine's voice/model parameters. Credentials are ignored.
+            text: The text to speak.
+            variant: Distinguishes requests that return different audio for
+                the same text, e.g. streamed raw PCM versus an encoded file.
+
+        Returns:
+            str: A hex digest of (engine class, params, variant, normalised text).
+        """
+        voice_params = {
+            k: v
+            for k, v in params.items()
+            if not any(marker in k.lower() for marker in _CREDENTIAL_MARKERS)
+        }
+        engine_cls = type(engine)
+        material = json.dumps(
+            [
+                f"{engine_cls.__module__}.{engine_cls.__qualname__}",
+                voice_params,
+                variant,
+                normalize_text(text),
+            ],
+            sort_keys=True,
+            default=str,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[TTSAudio]:
+        """Look up an entry, promoting disk hits into memory"""
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return audio
+
+            disk_entry = self._disk.get(key)
+            if disk_entry is not None:
+                path, _ = disk_entry
+                try:
+                    with open(path, "rb") as f:
+                        data = f.read()
+                except OSError as e:
+                    logger.warning(f"TTS cache: failed to read {path}: {e}")
+                    self._drop_disk_entry(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self.disk_hits += 1
+                    audio = TTSAudio(
+                        data=data, format=os.path.splitext(path)[1].lstrip(".")
+                    )
+                    self._put_memory(key, audio)
+                    return audio
+
+            self.misses += 1
+            return None
+
+    def get_file(self, key: str, dest_path: str) -> Optional[str]:
+        """
+        Materialise an entry as a file at `dest_path`.
+
+        The file is a hard link (or a copy) of the cached file, so the caller
+        owns it and may delete it without affecting the cache.
+
+        Returns:
+            str | None: `dest_path` on a hit, None on a miss.
+        """
+        with self._lock:
+            disk_entry = self._disk.get(key)
+            if disk_entry is not None:
+                path, _ = disk_entry
+                try:
+                    _link_or_copy(path, dest_path)
+                except OSError as e:
+                    logger.warning(f"TTS cache: failed to link {path}: {e}")
+                    self._drop_disk_entry(key)
+                else:
+                    self._disk.move_to_end(key)
+                    self.disk_hits += 1
+                    return dest_path
+
+            audio = self._memory.get(key)
+            if audio is not None:
+                data, _ = _encode_for_disk(audio)
+                with open(dest_path, "wb") as f:
+                    f.write(data)
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return dest_path
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, audio: TTSAudio) -> None:
+        """Store an entry in both tiers"""
+        data, extension = _encode_for_disk(audio)
+        with self._lock:
+            self._put_memory(key, audio)
+            if self.disk_max_bytes > 0 and key not in self._disk:
+                path = os.path.join(self.cache_dir, f"{key}.{extension}")
+                try:
+                    with open(path, "wb") as f:
+                        f.write(data)
+                except OSError as e:
+                    logger.warning(f"TTS cache: failed to write {path}: {e}")
+                    return
+                self._disk[key] = (path, len(data))
+                self._disk_bytes += len(data)
+                self._evict_disk()
+
+    def put_file(self, key: str, src_path: str) -> None:
+        """Store an engine-generated file, leaving `src_path` owned by the caller"""
+        extension = os.path.splitext(src_path)[1].lstrip(".") or "wav"
+        try:
+            with open(src_path, "rb") as f:
+                data = f.read()
+        except OSError as e:
+            logger.warning(f"TTS cache: failed to read {src_path}: {e}")
+            return
+        self.put(key, TTSAudio(data=data, format=extension))
+
+    def _put_memory(self, key: str, audio: TTSAudio) -> None:
+        if self.memory_max_bytes <= 0:
+            return
+        size = _audio_nbytes(audio)
+        if size > self.memory_max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= _audio_nbytes(previous)
+        self._memory[key] = audio
+        self._memory_bytes += size
+        self._evict_memory()
+
+    def _evict_memory(self) -> None:
+        while self._memory_bytes > self.memory_max_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= _audio_nbytes(evicted)
+            self.evictions += 1
+
+    def set_limits(self, memory_max_bytes: int, disk_max_bytes: int) -> None:
+        """Apply new tier limits, evicting what no longer fits"""
+        index_disk = self.disk_max_bytes <= 0 < disk_max_bytes
+        with self._lock:
+            self.memory_max_bytes = memory_max_bytes
+            self.disk_max_bytes = disk_max_bytes
+            self._evict_memory()
+            self._evict_disk()
+        if index_disk:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.disk_max_bytes and self._disk:
+            key = next(iter(self._disk))
+            self._drop_disk_entry(key)
+            self.evictions += 1
+
+    def _drop_disk_entry(self, key: str) -> None:
+        path, size = self._disk.pop(key)
+        self._disk_bytes -= size
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"TTS cache: failed to remove {path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (
+                    (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+                ),
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+            }
+
+
+# One cache per directory, shared by every session and engine that uses it
+_caches: Dict[str, TTSCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_tts_cache(config: TTSCacheConfig) -> TTSCache:
+    """
+    Return the shared cache for a directory, creating it on first use.
+
+    Several instances on one directory would each index, size and evict
+    it on their own, so its size limit would not hold and one could
+    delete files another still lists. Entries of different engines and
+    voices are kept apart by their keys. The limits of the most recent
+    config apply.
+    """
+    cache_dir = os.path.realpath(config.cache_dir)
+    memory_max_bytes = int(config.memory_max_mb * 1024 * 1024)
+    disk_max_bytes = int(config.disk_max_mb * 1024 * 1024)
+    with _caches_lock:
+        cache = _caches.get(cache_dir)
+        if cache is None:
+            cache = TTSCache(
+                cache_dir=config.cache_dir,
+                memory_max_bytes=memory_max_bytes,
+                disk_max_bytes=disk_max_bytes,
+            )
+            _caches[cache_dir] = cache
+        else:
+            cache.set_limits(memory_max_bytes, disk_max_bytes)
+        return cache
+
+
+def _link_or_copy(src: str, dest: str) -> None:
+    if os.path.exists(dest):
+        os.remove(dest)
+    try:
+        os.link(src, dest)
+    except OSError:
+        shutil.copyfile(src, dest)
+
+
+class CachedTTSEngine(TTSInterface):
+    """
+    Wraps a TTS engine with a TTSCache.
+
+    Files returned by `generate_audio` are always owned by the caller, so
+    `TTSTaskManager` can delete them after use as it does for any engine.
+    Attributes not defined here are looked up on the wrapped engine.
+    """
+
+    def __init__(self, engine: TTSInterface, params: Dict[str, Any], cache: TTSCache):
+        self.engine = engine
+        self.params = params
+        self.cache = cache
+
+    def __getattr__(self, name: str) -> Any:
+        # Only called for attributes not found on the wrapper itself
+        if name == "engine":
+            raise AttributeError(name)
+        return getattr(self.engine, name)
+
+    @property
+    def supports_pcm(self) -> bool:
+        return self.engine.supports_pcm
+
+    @property
+    def supports_streaming(self) -> bool:
+        return self.engine.supports_streaming
+
+    @property
+    def supports_batch(self) -> bool:
+        return self.engine.supports_batch
+
+    def _key(self, text: str, variant: str = "") -> str:
+        return TTSCache.make_key(self.engine, self.params, text, variant)
+
+    def generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        key = self._key(text)
+        extension = getattr(self.engine, "file_extension", None) or "wav"
+        dest_path = self.generate_cache_file_name(file_name_no_ext, extension)
+        if self.cache.get_file(key, dest_path):
+            logger.debug(f"TTS cache hit for '''{text}'''")
+            return dest_path
+
+        audio_path = self.engine.generate_audio(text, file_name_no_ext)
+        if audio_path:
+            self.cache.put_file(key, audio_path)
+        return audio_path
+
+    async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
+        key = self._key(text)
+        extension = getattr(self.engine, "file_extension", None) or "wav"
+        dest_path = self.generate_cache_file_name(file_name_no_ext, extension)
+        if await asyncio.to_thread(self.cache.get_file, key, dest_path):
+            logger.debug(f"TTS cache hit for '''{text}'''")
+            return dest_path
+
+        audio_path = await self.engine.async_generate_audio(text, file_name_no_ext)
+        if audio_path:
+            await asyncio.to_thread(self.cache.put_file, key, audio_path)
+        return audio_path
+
+    def generate_pcm(self, text: str) -> Optional[TTSAudio]:
+        key = self._key(text)
+        audio = self.cache.get(key)
+        if audio is not None:
+            logger.debug(f"TTS cache hit for '''{text}'''")
+            return audio
+
+        audio = self.engine.generate_pcm(text)
+        if audio is not None:
+            self.cache.put(key, audio)
+        return audio
+
+    async def async_generate_pcm(self, text: str) -> Optional[TTSAudio]:
+        key = self._key(text)
+        audio = await asyncio.to_thread(self.cache.get, key)
+        if audio is not None:
+            logger.debug(f"TTS cache hit for '''{text}'''")
+            return audio
+
+        audio = await self.engine.async_generate_pcm(text)
+        if audio is not None:
+            await asyncio.to_thread(self.cache.put, key, audio)
+        return audio
+
+    def generate_pcm_batch(self, texts: List[str]) -> List[Optional[TTSAudio]]:
+        keys = [self._key(text) for text in texts]
+        results = [self.cache.get(key) for key in keys]
+        missing = [i for i, audio in enumerate(results) if audio is None]
+        if missing:
+            generated = self.engine.generate_pcm_batch([texts[i] for i in missing])
+            for i, audio in zip(missing, generated):
+                results[i] = audio
+                if audio is not None:
+                    self.cache.put(keys[i], audio)
+        return results
+
+    async def async_generate_pcm_batch(
+        self, texts: List[str]
+    ) -> List[Optional[TTSAudio]]:
+        keys = [self._key(text) for text in texts]
+        results = [await asyncio.to_thread(self.cache.get, key) for key in keys]
+        # Only the sentences missing from the cache reach the engine
+        missing = [i for i, audio in enumerate(results) if audio is None]
+        if missing:
+            generated = await self.engine.async_generate_pcm_batch(
+                [texts[i] for i in missing]
+            )
+            for i, audio in zip(missing, generated):
+                results[i] = audio
+                if audio is not None:
+                    await asyncio.to_thread(self.cache.put, keys[i], audio)
+        return results
+
+    async def async_stream_pcm(self, text: str) -> AsyncIterator[TTSAudio]:
+        key = self._key(text, variant="stream")
+        audio = await asyncio.to_thread(self.cache.get, key)
+        if audio is not None:
+            logger.debug(f"TTS cache hit for '''{text}'''")
+            # Disk hits come back as the WAV the PCM was stored as
+            yield _decode_wav(audio.data) if audio.format == "wav" else audio
+            return
+
+        chunks = []
+        async for chunk in self.engine.async_stream_pcm(text):
+            chunks.append(chunk)
+            yield chunk
+        # Only reached if the whole sentence was streamed
+        if chunks:
+            await asyncio.to_thread(self.cache.put, key, _join_pcm(chunks))
@@ -1,10 +1,80 @@
 import abc
 import os
 import asyncio
+import threading
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Union
 
+import numpy as np
 from loguru import logger
 
 
+@dataclass
+class TTSAudio:
+    """
+    Synthesised audio held in memory.
+
+    Attributes:
+        data: Raw mono PCM samples when `format` is "pcm", either as an
+            ndarray (float32 in [-1, 1] or int16) or as little-endian int16
+            bytes. Otherwise the bytes of an encoded audio file (e.g. "wav",
+            "mp3").
+        sample_rate: Sample rate of the audio in Hz. Required for "pcm",
+            optional for encoded formats which carry their own header.
+        format: "pcm" or the container format of `data`.
+    """
+
+    data: Union[np.ndarray, bytes]
+    sample_rate: Optional[int] = None
+    format: str = "pcm"
+
+
+async def stream_from_thread(
+    produce: Callable[[Callable[[TTSAudio], bool]], None],
+) -> AsyncIterator[TTSAudio]:
+    """
+    Run a blocking audio producer in a worker thread and iterate its chunks.
+
+    Args:
+        produce: Called in a worker thread with an `emit(chunk)` function.
+            `emit` returns False once the consumer has stopped iterating, so
+            the producer can abort synthesis early.
+
+    Yields:
+        TTSAudio: The chunks passed to `emit`, in order.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    stopped = threading.Event()
+    done = object()
+
+    def emit(chunk: TTSAudio) -> bool:
+        if stopped.is_set():
+            return False
+        loop.call_soon_threadsafe(queue.put_nowait, chunk)
+        return True
+
+    def run() -> None:
+        try:
+            produce(emit)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, done)
+
+    loop.run_in_executor(None, run)
+    try:
+        while True:
+            item = await queue.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stopped.set()
+
+
 class TTSInterface(metaclass=abc.ABCMeta):
     async def async_generate_audio(self, text: str, file_name_no_ext=None) -> str:
         """
@@ -39,6 +109,139 @@ class TTSInterface(metaclass=abc.ABCMeta):
         """
         raise NotImplementedError
 
+    async def async_generate_pcm(self, text: str) -> Optional[TTSAudio]:
+        """
+        Asynchronously generate speech audio in memory, without a cache file.
+
+        By default, this runs the synchronous generate_pcm in a coroutine.
+        Engines that have a native async client can override this method.
+        Only engines for which `supports_pcm` is True implement it.
+
+        text: str
+            the text to speak
+
+        Returns:
+        TTSAudio | None: the generated audio, or None if generation failed
+        """
+        return await asyncio.to_thread(self.generate_pcm, text)
+
+    def generate_pcm(self, text: str) -> Optional[TTSAudio]:
+        """
+        Generate speech audio in memory, without a cache file.
+
+        This is optional. Engines that already hold the synthesised audio in
+        memory should implement it so callers can skip the round trip
+        through the `cache/` directory.
+
+        text: str
+            the text to speak
+
+        Returns:
+        TTSAudio | None: the generated audio, or None if generation failed
+        """
+        raise NotImplementedError
+
+    async def async_generate_pcm_batch(
+        self, texts: List[str]
+    ) -> List[Optional[TTSAudio]]:
+        """
+        Asynchronously generate several sentences in memory in one call.
+
+        By default, this runs the synchronous generate_pcm_batch in a
+        coroutine. Only engines for which `supports_batch` is True
+        implement it.
+
+        texts: List[str]
+            the sentences to speak, in order
+
+        Returns:
+        List[TTSAudio | None]: one entry per sentence, None where it failed
+        """
+        return await asyncio.to_thread(self.generate_pcm_batch, texts)
+
+    def generate_pcm_batch(self, texts: List[str]) -> List[Optional[TTSAudio]]:
+        """
+        Generate several sentences in memory in one call.
+
+        This is optional. Only engines whose model synthesises several
+        texts in a single pass should implement it. Looping over
+        generate_pcm is slower than not batching: the sentences of a batch
+        share one synthesis slot and none is sent until all are done.
+
+        texts: List[str]
+            the sentences to speak, in order
+
+        Returns:
+        List[TTSAudio | None]: one entry per sentence, None where it failed
+        """
+        raise NotImplementedError
+
+    async def async_stream_pcm(self, text: str) -> AsyncIterator[TTSAudio]:
+        """
+        Asynchronously generate speech as a stream of raw PCM chunks.
+
+        By default, this iterates the synchronous stream_pcm in a worker
+        thread. Only engines for which `supports_streaming` is True
+        implement it.
+
+        text: str
+            the text to speak
+
+        Yields:
+        TTSAudio: mono "pcm" chunks with `sample_rate` set, in playback order
+        """
+
+        def produce(emit: Callable[[TTSAudio], bool]) -> None:
+            for chunk in self.stream_pcm(text):
+                if not emit(chunk):
+                    break
+
+        async for chunk in stream_from_thread(produce):
+            yield chunk
+
+    def stream_pcm(self, text: str) -> Iterator[TTSAudio]:
+        """
+        Generate speech as a stream of raw PCM chunks.
+
+        This is optional. Engines whose backend can return audio before the
+        whole sentence is synthesised should implement it, so playback can
+        start after the first chunk.
+
+        text: str
+            the text to speak
+
+        Yields:
+        TTSAudio: mono "pcm" chunks with `sample_rate` set, in playback order
+        """
+        raise NotImplementedError
+
+    @property
+    def supports_streaming(self) -> bool:
+        """Whether this engine implements stream_pcm or async_stream_pcm"""
+        cls = type(self)
+        return (
+            cls.stream_pcm is not TTSInterface.stream_pcm
+            or cls.async_stream_pcm is not TTSInterface.async_stream_pcm
+        )
+
+    @property
+    def supports_batch(self) -> bool:
+        """Whether this engine implements generate_pcm_batch or its async version"""
+        cls = type(self)
+        return (
+            cls.generate_pcm_batch is not TTSInterface.generate_pcm_batch
+            or cls.async_generate_pcm_batch is not TTSInterface.async_generate_pcm_batch
+        )
+
+    @property
+    def supports_pcm(self) -> bool:
+        """Whether this engine implements generate_pcm or async_generate_pcm"""
+        cls = type(self)
+        return (
+            cls.generate_pcm is not TTSInterface.generate_pcm
+            or cls.async_generate_pcm is not TTSInterface.async_generate_pcm
+        )
+
     def remove_file(self, filepath: str, verbose: bool = True) -> None:
         """
         Remove a file from the file system.
@@ -0,0 +1,195 @@
+import asyncio
+import time
+import weakref
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict
+
+from loguru import logger
+
+from .tts_interface import TTSInterface
+
+PRIORITY_FIRST_SENTENCE = 0
+PRIORITY_NORMAL = 1
+
+DEFAULT_MAX_CONCURRENCY = 2
+
+
+@dataclass
+class _Job:
+    client_uid: str
+    priority: int
+    enqueued_at: float = field(default_factory=time.monotonic)
+    grant: asyncio.Future = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class TTSScheduler:
+    """
+    Limits how many synthesis calls run at once against one TTS engine.
+
+    Jobs wait for a slot in two queues:
+    - first sentences of a turn (PRIORITY_FIRST_SENTENCE), served in arrival
+      order ahead of everything else, since the user is waiting on them
+    - all other sentences, served round-robin across clients so one long
+      reply cannot starve other sessions sharing the engine
+
+    A job that is cancelled while queued (e.g. the turn was interrupted)
+    simply leaves the queue without ever touching the engine.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        wait_samples: int = 256,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+
+        self._urgent: Deque[_Job] = deque()
+        # client_uid -> that client's queued jobs, in round-robin order
+        self._pending: OrderedDict[str, Deque[_Job]] = OrderedDict()
+        self._running = 0
+
+        self.completed = 0
+        self.cancelled = 0
+        self.max_queue_depth = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._recent_waits: Deque[float] = deque(maxlen=wait_samples)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._urgent) + sum(len(q) for q in self._pending.values())
+
+    @property
+    def running(self) -> int:
+        return self._running
+
+    @asynccontextmanager
+    async def slot(
+        self, client_uid: str, priority: int = PRIORITY_NORMAL
+    ) -> AsyncIterator[None]:
+        """
+        Wait for a free synthesis slot and hold it for the duration of the block.
+
+        Args:
+            client_uid: The client the work is for, used for fairness.
+            priority: PRIORITY_FIRST_SENTENCE or PRIORITY_NORMAL.
+        """
+        job = _Job(client_uid=client_uid, priority=priority)
+        if priority == PRIORITY_FIRST_SENTENCE:
+            self._urgent.append(job)
+        else:
+            self._pending.setdefault(client_uid, deque()).append(job)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        self._dispatch()
+
+        try:
+            await job.grant
+        except asyncio.CancelledError:
+            if job.grant.done() and not job.grant.cancelled():
+                # Granted in the same loop iteration we were cancelled in
+                self._release()
+            else:
+                self._remove(job)
+                self.cancelled += 1
+            raise
+
+        self._record_wait(time.monotonic() - job.enqueued_at)
+        try:
+            yield
+        finally:
+            self.completed += 1
+            self._release()
+
+    def _next_job(self) -> _Job | None:
+        if self._urgent:
+            return self._urgent.popleft()
+        if self._pending:
+            client_uid, jobs = self._pending.popitem(last=False)
+            job = jobs.popleft()
+            if jobs:
+                # Move the client to the back of the round-robin order
+                self._pending[client_uid] = jobs
+            return job
+        return None
+
+    def _dispatch(self) -> None:
+        while self._running < self.max_concurrency:
+            job = self._next_job()
+            if job is None:
+                return
+            if job.grant.done():
+                continue
+            self._running += 1
+            job.grant.set_result(None)
+
+    def _release(self) -> None:
+        self._running -= 1
+        self._dispatch()
+
+    def _remove(self, job: _Job) -> None:
+        if job.priority == PRIORITY_FIRST_SENTENCE:
+            queue = self._urgent
+        else:
+            queue = self._pending.get(job.client_uid)
+        if queue is None:
+            return
+        try:
+            queue.remove(job)
+        except ValueError:
+            return
+        if not queue and queue is not self._urgent:
+            del self._pending[job.client_uid]
+
+    def _record_wait(self, wait: float) -> None:
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        self._recent_waits.append(wait)
+        if wait > 1.0:
+            logger.debug(
+                f"TTS job waited {wait:.2f}s for a slot "
+                f"(queue depth {self.queue_depth}, running {self._running})"
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return queue depth and wait-time metrics"""
+        waits = sorted(self._recent_waits)
+        started = self.completed + self._running
+        return {
+            "max_concurrency": self.max_concurrency,
+            "running": self._running,
+            "queue_depth": self.queue_depth,
+            "queued_first_sentences": len(self._urgent),
+            "max_queue_depth": self.max_queue_depth,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "avg_wait": self._total_wait / started if started else 0.0,
+            "max_wait": self._max_wait,
+            "p95_wait": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+        }
+
+
+# One scheduler per engine instance, shared by every session using the engine
+_schedulers: "weakref.WeakKeyDictionary[TTSInterface, TTSScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def set_tts_scheduler(tts_engine: TTSInterface, max_concurrency: int) -> TTSScheduler:
+    """Create the scheduler for a newly initialised TTS engine"""
+    scheduler = TTSScheduler(max_concurrency=max_concurrency)
+    _schedulers[tts_engine] = scheduler
+    return scheduler
+
+
+def get_tts_scheduler(tts_engine: TTSInterface) -> TTSScheduler:
+    """Return the scheduler of a TTS engine, creating a default one if needed"""
+    scheduler = _schedulers.get(tts_engine)
+    if scheduler is None:
+        scheduler = set_tts_scheduler(tts_engine, DEFAULT_MAX_CONCURRENCY)
+    return scheduler
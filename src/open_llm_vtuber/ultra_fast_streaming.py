@@ -5,6 +5,7 @@ import asyncio
 import time
 import json
 import hashlib
+import uuid
 from typing import AsyncIterator, Dict, Any, Optional, List
 from loguru import logger
 from pathlib import Path
@@ -152,26 +153,13 @@ class UltraFastStreamingProcessor:
     async def _ultra_fast_tts_generation(self, text: str, tts_engine) -> Optional[str]:
         """超快速TTS生成"""
         try:
-            # 检查TTS缓存
-            tts_cache_key = hashlib.md5(text.encode()).hexdigest()
-            cached_audio = self.cache_dir / f"tts_{tts_cache_key}.mp3"
-            
-            if cached_audio.exists():
-                return str(cached_audio)
-            
-            # 生成新音频
-            audio_path = await tts_engine.async_generate_audio(
+            # 音频缓存由 TTS 引擎负责（tts_config.tts_cache），这里不再单独缓存：
+            # 旧的缓存键不包含音色参数，且固定使用 .mp3 扩展名
+            return await tts_engine.async_generate_audio(
                 text=text,
-                file_name_no_ext=f"ultra_fast_{int(time.time())}"
+                file_name_no_ext=f"ultra_fast_{uuid.uuid4().hex[:8]}"
             )
             
-            # 缓存音频
-            if audio_path:
-                import shutil
-                shutil.copy2(audio_path, cached_audio)
-            
-            return audio_path
-            
         except Exception as e:
             logger.error(f"TTS生成失败: {e}")
             return None
@@ -269,31 +257,20 @@ class UltraFastTTSManager:
     """超快速TTS管理器"""
     
     def __init__(self):
-        self.audio_cache = {}
         self.preloaded_phrases = {}
         self.parallel_semaphore = asyncio.Semaphore(3)  # 限制并行TTS任务
     
     async def generate_audio_ultra_fast(self, text: str, tts_engine) -> Optional[str]:
         """超快速音频生成"""
         async with self.parallel_semaphore:
-            # 检查缓存
-            cache_key = hashlib.md5(text.encode()).hexdigest()
-            if cache_key in self.audio_cache:
-                return self.audio_cache[cache_key]
-            
+            # 不缓存文件路径：返回的文件播放后会被删除，且字典会无限增长。
+            # 需要缓存时请启用 tts_config.tts_cache
             try:
-                # 生成音频
-                audio_path = await tts_engine.async_generate_audio(
+                return await tts_engine.async_generate_audio(
                     text=text,
-                    file_name_no_ext=f"ultra_fast_{cache_key[:8]}"
+                    file_name_no_ext=f"ultra_fast_{uuid.uuid4().hex[:8]}"
                 )
                 
-                # 缓存结果
-                if audio_path:
-                    self.audio_cache[cache_key] = audio_path
-                
-                return audio_path
-                
             except Exception as e:
                 logger.error(f"超快速TTS生成失败: {e}")
                 return None
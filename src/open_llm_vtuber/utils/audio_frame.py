@@ -0,0 +1,152 @@
+"""
+Binary WebSocket frame format for microphone audio.
+
+Clients that support it send mic audio on `/client-ws` as binary messages
+instead of JSON float arrays. Each frame is a fixed 16-byte little-endian
+header followed by raw PCM samples:
+
+    offset  size  field
+    0       1     version       (currently 1)
+    1       1     kind          (0 = mic-audio-data, 1 = raw-audio-data)
+    2       1     sample_format (1 = int16, 2 = float32)
+    3       1     reserved      (must be 0)
+    4       4     stream_id     (uint32, chosen by the client)
+    8       4     sample_rate   (uint32, Hz)
+    12      4     sequence      (uint32, increments per frame of a stream)
+    16      ...   PCM samples, mono
+
+Samples are decoded with `np.frombuffer` and normalised to float32 in
+[-1, 1], which is the same representation the JSON path produces.
+"""
+
+import struct
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+
+from .audio_frontend import float_to_int16, to_float32
+
+AUDIO_FRAME_VERSION = 1
+
+_HEADER = struct.Struct("<BBBBIII")
+HEADER_SIZE = _HEADER.size
+
+# Frame kind -> WebSocket message type handled by WebSocketHandler
+FRAME_KINDS: Dict[int, str] = {
+    0: "mic-audio-data",
+    1: "raw-audio-data",
+}
+
+SAMPLE_FORMAT_INT16 = 1
+SAMPLE_FORMAT_FLOAT32 = 2
+
+_SAMPLE_DTYPES: Dict[int, np.dtype] = {
+    SAMPLE_FORMAT_INT16: np.dtype("<i2"),
+    SAMPLE_FORMAT_FLOAT32: np.dtype("<f4"),
+}
+
+
+@dataclass
+class AudioFrame:
+    """A decoded binary audio frame"""
+
+    msg_type: str
+    stream_id: int
+    sample_rate: int
+    sequence: int
+    audio: np.ndarray  # float32, mono, in [-1, 1]
+
+
+def decode_audio_frame(payload: bytes) -> AudioFrame:
+    """
+    Decode a binary audio frame.
+
+    Args:
+        payload: The raw bytes of a binary WebSocket message.
+
+    Returns:
+        AudioFrame: The decoded header fields and float32 samples.
+
+    Raises:
+        ValueError: If the header is malformed or the payload size does not
+            match the sample format.
+    """
+    if len(payload) < HEADER_SIZE:
+        raise ValueError(
+            f"Binary audio frame too short: {len(payload)} bytes "
+            f"(header is {HEADER_SIZE} bytes)"
+        )
+
+    version, kind, sample_format, _, stream_id, sample_rate, sequence = (
+        _HEADER.unpack_from(payload)
+    )
+    if version != AUDIO_FRAME_VERSION:
+        raise ValueError(f"Unsupported binary audio frame version: {version}")
+
+    msg_type = FRAME_KINDS.get(kind)
+    if msg_type is None:
+        raise ValueError(f"Unknown binary audio frame kind: {kind}")
+
+    dtype = _SAMPLE_DTYPES.get(sample_format)
+    if dtype is None:
+        raise ValueError(f"Unknown binary audio sample format: {sample_format}")
+
+    body_size = len(payload) - HEADER_SIZE
+    if body_size % dtype.itemsize != 0:
+        raise ValueError(
+            f"Binary audio payload of {body_size} bytes is not a multiple of "
+            f"the sample size ({dtype.itemsize} bytes)"
+        )
+
+    # float32 frames stay a read-only view of the payload; downstream code
+    # only reads them
+    audio = to_float32(np.frombuffer(payload, dtype=dtype, offset=HEADER_SIZE))
+
+    return AudioFrame(
+        msg_type=msg_type,
+        stream_id=stream_id,
+        sample_rate=sample_rate,
+        sequence=sequence,
+        audio=audio,
+    )
+
+
+def encode_audio_frame(
+    audio: np.ndarray,
+    msg_type: str = "mic-audio-data",
+    sample_rate: int = 16000,
+    stream_id: int = 0,
+    sequence: int = 0,
+    sample_format: int = SAMPLE_FORMAT_INT16,
+) -> bytes:
+    """
+    Encode float samples in [-1, 1] into a binary audio frame.
+
+    This is the inverse of `decode_audio_frame`, mostly useful for clients
+    written in Python and for testing.
+    """
+    kind = next((k for k, v in FRAME_KINDS.items() if v == msg_type), None)
+    if kind is None:
+        raise ValueError(f"Message type {msg_type} cannot be sent as a binary frame")
+
+    dtype = _SAMPLE_DTYPES.get(sample_format)
+    if dtype is None:
+        raise ValueError(f"Unknown binary audio sample format: {sample_format}")
+
+    audio = np.asarray(audio, dtype=np.float32)
+    if sample_format == SAMPLE_FORMAT_INT16:
+        body = float_to_int16(audio).astype(dtype, copy=False).tobytes()
+    else:
+        body = audio.astype(dtype, copy=False).tobytes()
+
+    header = _HEADER.pack(
+        AUDIO_FRAME_VERSION,
+        kind,
+        sample_format,
+        0,
+        stream_id,
+        sample_rate,
+        sequence & 0xFFFFFFFF,
+    )
+    return header + body
@@ -0,0 +1,236 @@
+"""
+Conditioning of incoming microphone audio.
+
+Audio reaches the server as JSON float lists, binary int16/float32
+frames, uploaded WAV files, and at whatever rate the client captured it
+(48 kHz in most browsers). The ASR engines and the VAD expect float32
+mono samples in [-1, 1] at 16 kHz. This module does that conversion in
+one place:
+
+- `to_float32` normalises any common PCM dtype, scaling in place on the
+  single array it allocates.
+- `resample` converts a whole clip with a polyphase filter, and
+  `StreamingResampler` does the same chunk by chunk, keeping the filter
+  history so chunk boundaries leave no artefacts.
+- `AudioFrontEnd` chains these for one audio stream, with optional DC
+  removal and gain normalisation.
+"""
+
+from math import gcd
+from typing import List, Optional, Union
+
+import numpy as np
+
+from ..config_manager import AudioFrontEndConfig
+
+TARGET_SAMPLE_RATE = 16000
+
+AudioInput = Union[List[float], np.ndarray]
+
+
+def to_float32(audio: AudioInput) -> np.ndarray:
+    """
+    Return samples as float32 in [-1, 1].
+
+    float32 arrays are returned as they are, without a copy. Integer PCM
+    is converted into one new array that is then scaled in place.
+    """
+    if not isinstance(audio, np.ndarray):
+        # JSON float lists are already in [-1, 1]
+        return np.asarray(audio, dtype=np.float32)
+    if audio.dtype == np.float32:
+        return audio
+    if np.issubdtype(audio.dtype, np.floating):
+        return audio.astype(np.float32)
+
+    converted = audio.astype(np.float32)
+    if audio.dtype == np.uint8:
+        converted -= 128.0
+        converted *= 1.0 / 128.0
+    elif audio.dtype == np.int16:
+        converted *= 1.0 / 32768.0
+    elif audio.dtype == np.int32:
+        converted *= 1.0 / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported audio sample type: {audio.dtype}")
+    return converted
+
+
+def float_to_int16(audio: np.ndarray) -> np.ndarray:
+    """Convert float samples in [-1, 1] to int16, clipping out-of-range values"""
+    return np.clip(audio * 32767, -32768, 32767).astype(np.int16)
+
+
+def _resampling_ratio(orig_sr: int, target_sr: int):
+    if orig_sr <= 0 or target_sr <= 0:
+        raise ValueError(f"Invalid sample rates: {orig_sr} -> {target_sr}")
+    divisor = gcd(orig_sr, target_sr)
+    return target_sr // divisor, orig_sr // divisor
+
+
+def resample(audio: np.ndarray, orig_sr: int, target_sr: int) -> np.ndarray:
+    """Resample a complete float32 clip with a polyphase filter"""
+    if orig_sr == target_sr or len(audio) == 0:
+        return audio
+    # scipy.signal is imported on first use; it takes longer to import than
+    # the rest of the audio path, which usually runs at 16 kHz anyway
+    from scipy.signal import resample_poly
+
+    up, down = _resampling_ratio(orig_sr, target_sr)
+    return resample_poly(audio, up, down).astype(np.float32, copy=False)
+
+
+class StreamingResampler:
+    """
+    Polyphase resampling of a stream that arrives in chunks.
+
+    Uses the same anti-aliasing filter as `scipy.signal.resample_poly`,
+    but keeps the input samples the filter still needs between calls, so
+    the concatenated output equals resampling the whole stream at once
+    (apart from a delay of half the filter, under a millisecond).
+    """
+
+    def __init__(self, orig_sr: int, target_sr: int):
+        self.orig_sr = orig_sr
+        self.target_sr = target_sr
+        self.up, self.down = _resampling_ratio(orig_sr, target_sr)
+
+        from scipy.signal import firwin
+
+        half_len = 10 * max(self.up, self.down)
+        taps = firwin(
+            2 * half_len + 1, 1.0 / max(self.up, self.down), window=("kaiser", 5.0)
+        )
+        taps *= self.up
+        # Input samples covered by the filter for one output sample
+        self.width = -(-len(taps) // self.up)
+        taps = np.pad(taps, (0, self.width * self.up - len(taps)))
+        # Row p holds the taps applied at upsampling phase p
+        self._phases = taps.reshape(self.width, self.up).T.astype(np.float32)
+        self._delay = half_len
+        self._offsets = np.arange(self.width)
+
+        # Zeros stand in for the samples before the stream began
+        self._history = np.zeros(self.width - 1, dtype=np.float32)
+        self._consumed = 0
+        self._produced = 0
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """Resample the next chunk, returning every output sample it completes"""
+        if len(audio) == 0:
+            return np.empty(0, dtype=np.float32)
+        buffer = np.concatenate([self._history, audio])
+        buffer_start = self._consumed - len(self._history)
+        self._consumed += len(audio)
+
+        # Output m needs input up to (m * down + delay) // up
+        available = (self._consumed * self.up - 1 - self._delay) // self.down + 1
+        positions = (
+            np.arange(self._produced, available, dtype=np.int64) * self.down
+            + self._delay
+        )
+        newest = positions // self.up
+        indices = newest[:, np.newaxis] - self._offsets - buffer_start
+        output = np.einsum(
+            "ij,ij->i", buffer[indices], self._phases[positions % self.up]
+        )
+        self._produced = max(self._produced, available)
+
+        next_newest = (self._produced * self.down + self._delay) // self.up
+        keep_from = min(next_newest - (self.width - 1), self._consumed) - buffer_start
+        self._history = buffer[max(keep_from, 0) :]
+        return output.astype(np.float32, copy=False)
+
+
+class AudioFrontEnd:
+    """
+    Brings one client's audio stream to float32 at the ASR sample rate.
+
+    The resampler, DC filter and gain level carry state across chunks, so
+    each audio stream needs its own instance.
+    """
+
+    # One-pole high-pass at about 12 Hz for 16 kHz audio
+    DC_POLE = 0.995
+    # Chunks quieter than this do not move the gain level
+    GAIN_GATE_DB = -50.0
+    # Weight of a new chunk in the tracked level
+    GAIN_ATTACK = 0.2
+
+    def __init__(
+        self,
+        config: Optional[AudioFrontEndConfig] = None,
+        target_sample_rate: int = TARGET_SAMPLE_RATE,
+    ):
+        self.config = config or AudioFrontEndConfig()
+        self.target_sample_rate = target_sample_rate
+        self._resampler: Optional[StreamingResampler] = None
+        self._dc_state = np.zeros(1)
+        self._level: Optional[float] = None
+
+    def process(
+        self, audio: AudioInput, sample_rate: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Condition the next chunk of the stream.
+
+        Args:
+            audio: Samples as a float list or an int/float array.
+            sample_rate: Rate of `audio`; None means it is already at
+                the target rate.
+
+        Returns:
+            np.ndarray: float32 samples in [-1, 1] at the target rate.
+        """
+        original = audio
+        audio = to_float32(audio)
+
+        if sample_rate and sample_rate != self.target_sample_rate:
+            if self._resampler is None or self._resampler.orig_sr != sample_rate:
+                self._resampler = StreamingResampler(
+                    sample_rate, self.target_sample_rate
+                )
+            audio = self._resampler.process(audio)
+        return self._condition(audio, original)
+
+    def process_clip(self, audio: AudioInput, sample_rate: int) -> np.ndarray:
+        """
+        Condition a complete recording, such as an uploaded file.
+
+        Unlike `process`, the whole clip is resampled at once, so no
+        samples are held back for a following chunk.
+        """
+        original = audio
+        audio = resample(to_float32(audio), sample_rate, self.target_sample_rate)
+        return self._condition(audio, original)
+
+    def _condition(self, audio: np.ndarray, original: AudioInput) -> np.ndarray:
+        """Apply the configured DC removal and gain normalisation"""
+        if self.config.remove_dc:
+            from scipy.signal import lfilter
+
+            audio, self._dc_state = lfilter(
+                [1.0, -1.0], [1.0, -self.DC_POLE], audio, zi=self._dc_state
+            )
+            audio = audio.astype(np.float32, copy=False)
+
+        if self.config.normalize_gain and len(audio):
+            if audio is original or not audio.flags.writeable:
+                audio = audio.copy()
+            self._apply_gain(audio)
+        return audio
+
+    def _apply_gain(self, audio: np.ndarray) -> None:
+        """Scale `audio` in place towards the target level"""
+        rms = float(np.sqrt(np.mean(np.square(audio, dtype=np.float64))))
+        if 20 * np.log10(rms + 1e-10) > self.GAIN_GATE_DB:
+            if self._level is None:
+                self._level = rms
+            else:
+                self._level += self.GAIN_ATTACK * (rms - self._level)
+        if self._level is None:
+            return
+        target = 10 ** (self.config.target_level_db / 20)
+        max_gain = 10 ** (self.config.max_gain_db / 20)
+        audio *= min(target / self._level, max_gain)
+        np.clip(audio, -1.0, 1.0, out=audio)
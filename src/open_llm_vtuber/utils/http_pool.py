@@ -0,0 +1,120 @@
+"""
+Shared async HTTP client for engines that call HTTP services.
+
+Every engine request goes through one `httpx.AsyncClient`, so TCP and TLS
+connections to a TTS server are kept alive and reused across sentences and
+sessions instead of being set up for every request. Requests to one host
+are capped by a per-host semaphore, so a burst of sentences cannot open an
+unbounded number of connections to a single server.
+
+An `httpx.AsyncClient` is bound to the event loop it is first used in, so
+one pool is kept per running loop.
+"""
+
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+from loguru import logger
+
+# Maximum concurrent requests (and so connections) to one host
+MAX_CONNECTIONS_PER_HOST = 8
+# Idle connections kept open for reuse, across all hosts
+MAX_KEEPALIVE_CONNECTIONS = 32
+KEEPALIVE_EXPIRY = 60.0
+# Default timeouts in seconds; `read` is how long a server may be silent
+DEFAULT_TIMEOUT = httpx.Timeout(120.0, connect=10.0)
+
+
+class AsyncHTTPPool:
+    """A keep-alive `httpx.AsyncClient` with per-host concurrency limits"""
+
+    def __init__(
+        self,
+        max_connections_per_host: int = MAX_CONNECTIONS_PER_HOST,
+        max_keepalive_connections: int = MAX_KEEPALIVE_CONNECTIONS,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+    ):
+        self.max_connections_per_host = max_connections_per_host
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=None,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+            timeout=timeout,
+        )
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = httpx.URL(url).netloc.decode("ascii")
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.max_connections_per_host)
+            self._host_limits[host] = limit
+        return limit
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[float | httpx.Timeout] = None,
+        **kwargs,
+    ) -> httpx.Response:
+        """
+        Send a request and read the whole response body.
+
+        Args:
+            method: HTTP method, e.g. "GET" or "POST".
+            url: Request URL.
+            timeout: Overrides the pool's default timeout for this request.
+            **kwargs: Passed on to `httpx.AsyncClient.request`
+                (json, params, data, headers, ...).
+        """
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        async with self._host_limit(url):
+            return await self.client.request(method, url, **kwargs)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        url: str,
+        timeout: Optional[float | httpx.Timeout] = None,
+        **kwargs,
+    ) -> AsyncIterator[httpx.Response]:
+        """Like `request`, but yields the response before its body is read"""
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        async with self._host_limit(url):
+            async with self.client.stream(method, url, **kwargs) as response:
+                yield response
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+
+_pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncHTTPPool]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_http_pool() -> AsyncHTTPPool:
+    """Return the shared HTTP pool of the running event loop"""
+    loop = asyncio.get_running_loop()
+    pool = _pools.get(loop)
+    if pool is None:
+        pool = AsyncHTTPPool()
+        _pools[loop] = pool
+        logger.debug("Created shared async HTTP connection pool")
+    return pool
+
+
+async def close_http_pool() -> None:
+    """Close the shared HTTP pool of the running event loop, if any"""
+    pool = _pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.aclose()
@@ -1,14 +1,114 @@
 import base64
+import io
+import wave
+from array import array
+from typing import Literal
+
+import numpy as np
+
 try:
     from pydub import AudioSegment
-    from pydub.utils import make_chunks
     PYDUB_AVAILABLE = True
 except ImportError:
     PYDUB_AVAILABLE = False
     AudioSegment = None
-    make_chunks = None
 from ..agent.output_types import Actions
 from ..agent.output_types import DisplayText
+from ..tts.tts_interface import TTSAudio
+
+
+# numpy dtypes of pydub's raw (signed, interleaved) sample data by sample width
+_SAMPLE_WIDTH_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+
+def _frame_length(sample_rate: int, chunk_length_ms: int) -> int:
+    """Number of samples per channel in one envelope frame"""
+    return max(1, round(sample_rate * chunk_length_ms / 1000))
+
+
+def _frame_rms(x: np.ndarray, frame_length: int) -> np.ndarray:
+    """RMS of each frame of float32 samples; the last frame may be shorter"""
+    num_full = len(x) // frame_length
+    has_tail = len(x) % frame_length != 0
+
+    rms = np.empty(num_full + has_tail, dtype=np.float32)
+    if num_full:
+        frames = x[: num_full * frame_length].reshape(num_full, frame_length)
+        rms[:num_full] = np.einsum("ij,ij->i", frames, frames) / frame_length
+    if has_tail:
+        tail = x[num_full * frame_length :]
+        rms[-1] = np.dot(tail, tail) / len(tail)
+    np.sqrt(rms, out=rms)
+    return rms
+
+
+def get_volume_envelope(
+    samples: np.ndarray,
+    sample_rate: int,
+    chunk_length_ms: int = 20,
+    normalization: Literal["max", "peak", "percentile"] = "max",
+    percentile: float = 95.0,
+    channels: int = 1,
+    quantize: bool = False,
+) -> array | np.ndarray:
+    """
+    Calculate the normalized volume (RMS) envelope of PCM audio.
+
+    All frames are processed at once: the samples are reshaped into a
+    (num_frames, frame_length) matrix and the RMS of every row is computed
+    in a single vectorised pass. The last frame may be shorter, like the
+    chunks produced by pydub's `make_chunks`.
+
+    Parameters:
+        samples (np.ndarray): PCM samples, float or integer. Multi-channel
+            audio must be interleaved.
+        sample_rate (int): Sample rate of the audio in Hz.
+        chunk_length_ms (int): The length of each frame in milliseconds.
+        normalization (str): How the envelope is scaled to [0, 1].
+            "max" divides by the loudest frame's RMS.
+            "peak" divides by the peak absolute sample value.
+            "percentile" divides by the given percentile of the frame RMS
+            values and clips to 1, so a single loud frame does not flatten
+            the rest of the envelope.
+        percentile (float): Percentile used by the "percentile" mode.
+        channels (int): Number of interleaved channels in `samples`.
+        quantize (bool): Return a uint8 ndarray (0-255) instead of floats.
+
+    Returns:
+        array('f') | np.ndarray: One normalized volume per frame.
+
+    Raises:
+        ValueError: If the audio is empty or all zero.
+    """
+    x = np.asarray(samples).reshape(-1)
+    if x.dtype != np.float32:
+        x = x.astype(np.float32)
+
+    frame_length = _frame_length(sample_rate, chunk_length_ms) * channels
+    rms = _frame_rms(x, frame_length)
+
+    if normalization == "max":
+        reference = rms.max() if len(rms) else 0.0
+    elif normalization == "peak":
+        reference = np.abs(x).max() if len(x) else 0.0
+    elif normalization == "percentile":
+        reference = np.percentile(rms, percentile) if len(rms) else 0.0
+        if reference == 0 and len(rms):
+            reference = rms.max()
+    else:
+        raise ValueError(f"Unknown volume normalization mode: {normalization}")
+
+    if reference == 0:
+        raise ValueError("Audio is empty or all zero.")
+
+    rms /= reference
+    np.minimum(rms, 1.0, out=rms)
+
+    if quantize:
+        return np.rint(rms * 255).astype(np.uint8)
+    envelope = array("f")
+    envelope.frombytes(rms.tobytes())
+    return envelope
 
 
 def _get_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
@@ -20,21 +120,67 @@ def _get_volume_by_chunks(audio: AudioSegment, chunk_length_ms: int) -> list:
         chunk_length_ms (int): The length of each audio chunk in milliseconds.
 
     Returns:
-        list: Normalized volumes for each chunk.
+        list: Normalized volumes for each chunk, ready for JSON.
     """
     if not PYDUB_AVAILABLE:
         return [0.5] * 10  # Return dummy volumes if pydub is not available
-    
-    chunks = make_chunks(audio, chunk_length_ms)
-    volumes = [chunk.rms for chunk in chunks]
-    max_volume = max(volumes)
-    if max_volume == 0:
-        raise ValueError("Audio is empty or all zero.")
-    return [volume / max_volume for volume in volumes]
+
+    dtype = _SAMPLE_WIDTH_DTYPES.get(audio.sample_width)
+    if dtype is not None:
+        samples = np.frombuffer(audio.raw_data, dtype=dtype)
+    else:
+        # 24-bit audio is widened to 32-bit by pydub
+        samples = np.asarray(audio.get_array_of_samples())
+
+    envelope = get_volume_envelope(
+        samples,
+        audio.frame_rate,
+        chunk_length_ms,
+        channels=audio.channels,
+    )
+    # Four decimals are plenty for lip sync and keep the JSON payload small
+    return np.round(np.frombuffer(envelope, dtype=np.float32), 4).tolist()
+
+
+def _load_audio(audio: str | bytes | TTSAudio) -> tuple[AudioSegment, bytes | None]:
+    """
+    Load audio from a file path or from memory.
+
+    Parameters:
+        audio (str | bytes | TTSAudio): A file path, the bytes of an encoded
+            audio file, or in-memory audio returned by a TTS engine.
+
+    Returns:
+        tuple: The decoded AudioSegment, and the original bytes if they are
+            already a WAV file that can be sent as-is (None otherwise).
+    """
+    if isinstance(audio, str):
+        return AudioSegment.from_file(audio), None
+
+    if isinstance(audio, (bytes, bytearray)):
+        audio = TTSAudio(data=bytes(audio), format=None)
+
+    if audio.format == "pcm":
+        samples = audio.data
+        if isinstance(samples, (bytes, bytearray)):
+            samples = np.frombuffer(samples, dtype="<i2")
+        if samples.dtype != np.int16:
+            samples = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+        # Raw PCM needs no decoding, only wrapping
+        segment = AudioSegment(
+            data=samples.tobytes(),
+            sample_width=2,
+            frame_rate=audio.sample_rate,
+            channels=1,
+        )
+        return segment, None
+
+    segment = AudioSegment.from_file(io.BytesIO(audio.data), format=audio.format)
+    return segment, audio.data if audio.format == "wav" else None
 
 
 def prepare_audio_payload(
-    audio_path: str | None,
+    audio_path: str | bytes | TTSAudio | None,
     chunk_length_ms: int = 20,
     display_text: DisplayText = None,
     actions: Actions = None,
@@ -45,7 +191,9 @@ def prepare_audio_payload(
     If audio_path is None, returns a payload with audio=None for silent display.
 
     Parameters:
-        audio_path (str | None): The path to the audio file to be processed, or None for silent display
+        audio_path (str | bytes | TTSAudio | None): The path to the audio file to be processed,
+            the audio itself held in memory (encoded bytes or a TTSAudio from
+            `TTSInterface.async_generate_pcm`), or None for silent display
         chunk_length_ms (int): The length of each audio chunk in milliseconds
         display_text (DisplayText, optional): Text to be displayed with the audio
         actions (Actions, optional): Actions associated with the audio
@@ -56,7 +204,7 @@ def prepare_audio_payload(
     if isinstance(display_text, DisplayText):
         display_text = display_text.to_dict()
 
-    if not audio_path:
+    if audio_path is None or (isinstance(audio_path, str) and not audio_path):
         # Return payload for silent display
         return {
             "type": "audio",
@@ -74,11 +222,13 @@ def prepare_audio_payload(
         volumes = [0.5] * 10
     else:
         try:
-            audio = AudioSegment.from_file(audio_path)
-            audio_bytes = audio.export(format="wav").read()
+            audio, audio_bytes = _load_audio(audio_path)
+            if audio_bytes is None:
+                audio_bytes = audio.export(format="wav").read()
         except Exception as e:
+            source = audio_path if isinstance(audio_path, str) else "<in-memory audio>"
             raise ValueError(
-                f"Error loading or converting generated audio file to wav file '{audio_path}': {e}"
+                f"Error loading or converting generated audio file to wav file '{source}': {e}"
             )
         audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
         volumes = _get_volume_by_chunks(audio, chunk_length_ms)
@@ -96,5 +246,146 @@ def prepare_audio_payload(
     return payload
 
 
+class AudioChunkEncoder:
+    """
+    Turns the PCM chunks streamed by a TTS engine into `audio-chunk` payloads.
+
+    Each payload carries a standalone WAV with a whole number of envelope
+    frames, so its `volumes` line up with its audio exactly. Tiny engine
+    chunks are merged until at least `min_chunk_ms` of audio is available,
+    to keep the number of WebSocket messages reasonable.
+
+    The envelope is normalised by the loudest frame seen so far in the
+    sentence (with a floor, so leading near-silence does not open the mouth
+    fully), since the loudest frame of the whole sentence is not known yet.
+
+    Payload fields:
+        type: "audio-chunk"
+        sequence: Sentence number within the turn, same order as "audio"
+        chunk_index: 0, 1, 2, ... within the sentence
+        audio: Base64 WAV of this chunk, or None if there is none
+        volumes, slice_length: Lip-sync envelope, as in "audio" payloads
+        display_text, actions: Only set on chunk 0
+        final: True on the last chunk of the sentence
+    """
+
+    # RMS of roughly -34 dBFS, below any normal speech level
+    MIN_REFERENCE = 0.02
+
+    def __init__(
+        self,
+        sequence: int,
+        display_text: DisplayText = None,
+        actions: Actions = None,
+        chunk_length_ms: int = 20,
+        min_chunk_ms: int = 200,
+        forwarded: bool = False,
+    ):
+        if isinstance(display_text, DisplayText):
+            display_text = display_text.to_dict()
+        self.sequence = sequence
+        self.display_text = display_text
+        self.actions = actions
+        self.chunk_length_ms = chunk_length_ms
+        self.min_chunk_ms = min_chunk_ms
+        self.forwarded = forwarded
+
+        self.sample_rate = None
+        self.chunk_index = 0
+        self._pending: list[np.ndarray] = []
+        self._pending_samples = 0
+        self._odd_byte = b""
+        self._reference = self.MIN_REFERENCE
+
+    def push(self, audio: TTSAudio) -> list[dict[str, any]]:
+        """
+        Add a chunk of streamed audio.
+
+        Returns:
+            list[dict]: Zero or one payloads that are ready to send.
+        """
+        if self.sample_rate is None:
+            self.sample_rate = audio.sample_rate
+        samples = self._to_int16(audio.data)
+        if len(samples):
+            self._pending.append(samples)
+            self._pending_samples += len(samples)
+
+        frame_length = _frame_length(self.sample_rate, self.chunk_length_ms)
+        min_samples = max(
+            frame_length, _frame_length(self.sample_rate, self.min_chunk_ms)
+        )
+        if self._pending_samples < min_samples:
+            return []
+
+        data = np.concatenate(self._pending)
+        ready = len(data) // frame_length * frame_length
+        rest = data[ready:]
+        self._pending = [rest] if len(rest) else []
+        self._pending_samples = len(rest)
+        return [self._payload(data[:ready], final=False)]
+
+    def finish(self) -> dict[str, any]:
+        """Return the final payload, carrying any audio still buffered"""
+        data = (
+            np.concatenate(self._pending)
+            if self._pending
+            else np.empty(0, dtype=np.int16)
+        )
+        self._pending = []
+        self._pending_samples = 0
+        return self._payload(data, final=True)
+
+    def _to_int16(self, data: np.ndarray | bytes) -> np.ndarray:
+        if isinstance(data, (bytes, bytearray)):
+            # Network chunks may split a sample across two reads
+            data = self._odd_byte + bytes(data)
+            usable = len(data) - len(data) % 2
+            self._odd_byte = data[usable:]
+            return np.frombuffer(data[:usable], dtype="<i2")
+        data = np.asarray(data).reshape(-1)
+        if data.dtype != np.int16:
+            data = (np.clip(data, -1.0, 1.0) * 32767).astype(np.int16)
+        return data
+
+    def _volumes(self, samples: np.ndarray) -> list:
+        x = samples.astype(np.float32)
+        x *= 1.0 / 32768.0
+        rms = _frame_rms(x, _frame_length(self.sample_rate, self.chunk_length_ms))
+        self._reference = max(self._reference, float(rms.max()))
+        rms /= self._reference
+        return np.round(rms, 4).tolist()
+
+    def _payload(self, samples: np.ndarray, final: bool) -> dict[str, any]:
+        first = self.chunk_index == 0
+        audio_base64 = None
+        volumes = []
+        if len(samples):
+            buffer = io.BytesIO()
+            with wave.open(buffer, "wb") as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(2)
+                wf.setframerate(self.sample_rate)
+                wf.writeframes(samples.tobytes())
+            audio_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
+            volumes = self._volumes(samples)
+
+        payload = {
+            "type": "audio-chunk",
+            "sequence": self.sequence,
+            "chunk_index": self.chunk_index,
+            "audio": audio_base64,
+            "volumes": volumes,
+            "slice_length": self.chunk_length_ms,
+            "sample_rate": self.sample_rate,
+            "display_text": self.display_text if first else None,
+            "actions": self.actions.to_dict() if first and self.actions else None,
+            "final": final,
+            "forwarded": self.forwarded,
+        }
+        self.chunk_index += 1
+        return payload
+
+
 # Example usage:
 # payload, duration = prepare_audio_payload("path/to/audio.mp3", display_text="Hello", expression_list=[0,1,2])
@@ -1,13 +1,20 @@
 import asyncio
+import importlib.util
+import os
+import sys
+import threading
+import time
+import weakref
 from collections import deque
 from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
-import torch
+from numpy.lib.stride_tricks import sliding_window_view
 from loguru import logger
 from pydantic import BaseModel
-from silero_vad import load_silero_vad
 
+from ..utils.audio_frontend import StreamingResampler, float_to_int16, to_float32
 from .vad_interface import VADInterface
 
 
@@ -21,7 +28,232 @@ class SileroVADConfig(BaseModel):
     smoothing_window: int = 5
 
 
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process in MB, None where unsupported"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+class TorchSileroModel:
+    """
+    The TorchScript model of the silero-vad package.
+
+    It keeps its recurrent state inside the module, so the state is
+    swapped in and out whenever a different session calls it.
+    """
+
+    STATE_ATTRS = ("_state", "_context", "_last_sr", "_last_batch_size")
+
+    def __init__(self, sample_rate: int):
+        import torch
+        from silero_vad import load_silero_vad
+
+        self._torch = torch
+        self.sample_rate = sample_rate
+        self.model = load_silero_vad()
+        self._lock = threading.Lock()
+        # Session whose recurrent state is currently loaded in the model
+        self._owner: Optional[weakref.ref] = None
+
+    def speech_probs(
+        self, windows: np.ndarray, session: "SileroVADSession"
+    ) -> np.ndarray:
+        """
+        Speech probability of each row of `windows`, in order.
+
+        The model is recurrent, so consecutive windows of one stream cannot
+        share a forward call; they are run back to back on views of a single
+        tensor and the results are gathered in one conversion.
+        """
+        torch = self._torch
+        frames = torch.tensor(windows)
+        with self._lock, torch.no_grad():
+            self._load_state(session)
+            probs = [self.model(frame, self.sample_rate) for frame in frames]
+        return torch.cat(probs).flatten().numpy()
+
+    async def async_speech_probs(
+        self, windows: np.ndarray, session: "SileroVADSession"
+    ) -> np.ndarray:
+        """
+        Same as `speech_probs`. The recurrent state lives inside the module
+        as a single stream, so sessions cannot share a forward call.
+        """
+        return self.speech_probs(windows, session)
+
+    def _load_state(self, session: "SileroVADSession") -> None:
+        """Swap the model's recurrent state to `session`'s if another one ran last"""
+        owner = self._owner() if self._owner is not None else None
+        if owner is session:
+            return
+        if owner is not None:
+            owner.model_state = {
+                name: getattr(self.model, name)
+                for name in self.STATE_ATTRS
+                if hasattr(self.model, name)
+            }
+        if session.model_state is None:
+            self.model.reset_states()
+        else:
+            for name, value in session.model_state.items():
+                setattr(self.model, name, value)
+        self._owner = weakref.ref(session)
+
+
+class OnnxSileroModel:
+    """
+    The ONNX export of Silero VAD, run by ONNX Runtime without torch.
+
+    The recurrent state is an explicit input and output of the model, so
+    every session simply keeps its own and no locking is needed. It also
+    has a batch axis: `async_speech_probs` runs the chunks of all sessions
+    that arrive in the same event loop iteration together, one model call
+    per window position instead of one per session.
+    """
+
+    def __init__(self, sample_rate: int, model_path: Optional[str] = None):
+        import onnxruntime
+
+        model_path = model_path or self.default_model_path()
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"Silero VAD ONNX model not found: {model_path}")
+
+        options = onnxruntime.SessionOptions()
+        # The model is tiny; more threads only add synchronisation
+        options.inter_op_num_threads = 1
+        options.intra_op_num_threads = 1
+        self.session = onnxruntime.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.sample_rate = sample_rate
+        # Trailing samples of the previous window the model sees with each one
+        self.context_size = 64 if sample_rate == 16000 else 32
+        self._sr = np.array(sample_rate, dtype=np.int64)
+        # Chunks waiting for the next batched run, see async_speech_probs
+        self._pending: List[Tuple[np.ndarray, "SileroVADSession", asyncio.Future]] = []
+
+    @staticmethod
+    def default_model_path() -> str:
+        """The ONNX file shipped with the silero-vad package, found without importing it"""
+        spec = importlib.util.find_spec("silero_vad")
+        if spec is None or spec.origin is None:
+            raise FileNotFoundError(
+                "silero-vad is not installed; set onnx_model_path to a silero_vad.onnx file"
+            )
+        return os.path.join(os.path.dirname(spec.origin), "data", "silero_vad.onnx")
+
+    def speech_probs(
+        self, windows: np.ndarray, session: "SileroVADSession"
+    ) -> np.ndarray:
+        """Speech probability of each row of `windows`, continuing `session`'s state"""
+        return self._run([(windows, session)])[0]
+
+    async def async_speech_probs(
+        self, windows: np.ndarray, session: "SileroVADSession"
+    ) -> np.ndarray:
+        """
+        `speech_probs`, batched with the chunks of every other session that
+        asks in the same event loop iteration.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if not self._pending:
+            loop.call_soon(self._run_pending)
+        self._pending.append((windows, session, future))
+        return await future
+
+    def _run_pending(self) -> None:
+        pending, self._pending = self._pending, []
+        batch, sessions = [], set()
+        for request in pending:
+            if id(request[1]) in sessions:
+                # Continues from the state this batch leaves; runs next
+                self._pending.append(request)
+            else:
+                sessions.add(id(request[1]))
+                batch.append(request)
+        if self._pending:
+            asyncio.get_running_loop().call_soon(self._run_pending)
+
+        try:
+            results = self._run([(windows, session) for windows, session, _ in batch])
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (*_, future), probs in zip(batch, results):
+            if not future.done():
+                future.set_result(probs)
+
+    def _run(
+        self, requests: List[Tuple[np.ndarray, "SileroVADSession"]]
+    ) -> List[np.ndarray]:
+        """
+        Run the windows of several sessions, each continuing its own state.
+
+        Row i of the k-th model call is the k-th window of one session, so a
+        batch takes as many calls as its longest chunk has windows.
+        """
+        lengths = np.array([len(windows) for windows, _ in requests])
+        # Longest first, so the sessions still running at any step are a prefix
+        order = np.argsort(-lengths, kind="stable")
+        count, steps = len(requests), int(lengths.max())
+        window_size = requests[0][0].shape[1]
+
+        frames = np.zeros((count, steps, window_size), dtype=np.float32)
+        state = np.zeros((2, count, 128), dtype=np.float32)
+        context = np.zeros((count, self.context_size), dtype=np.float32)
+        for row, index in enumerate(order):
+            windows, session = requests[index]
+            frames[row, : len(windows)] = windows
+            if session.model_state is not None:
+                state[:, row] = session.model_state["state"][:, 0]
+                context[row] = session.model_state["context"][0]
+
+        probs = np.empty((count, steps), dtype=np.float32)
+        active = count
+        for step in range(steps):
+            while lengths[order[active - 1]] <= step:
+                active -= 1
+            frame = np.concatenate([context[:active], frames[:active, step]], axis=1)
+            out, state[:, :active] = self.session.run(
+                None,
+                {
+                    "input": frame,
+                    "state": np.ascontiguousarray(state[:, :active]),
+                    "sr": self._sr,
+                },
+            )
+            probs[:active, step] = out[:, 0]
+            context[:active] = frame[:, -self.context_size :]
+
+        results: List[Optional[np.ndarray]] = [None] * count
+        for row, index in enumerate(order):
+            session = requests[index][1]
+            session.model_state = {
+                "state": state[:, row : row + 1].copy(),
+                "context": context[row : row + 1].copy(),
+            }
+            results[index] = probs[row, : lengths[index]]
+        return results
+
+
 class VADEngine(VADInterface):
+    """
+    Loads the Silero model once and shares it between sessions.
+
+    `detect_speech` on the engine itself uses a built-in session; call
+    `create_session` for every additional audio stream.
+    """
+
+    BACKENDS = ("torch", "onnx")
+
     def __init__(
         self,
         orig_sr: int = 16000,
@@ -31,6 +263,8 @@ class VADEngine(VADInterface):
         required_hits: int = 3,
         required_misses: int = 24,
         smoothing_window: int = 5,
+        backend: str = "torch",
+        onnx_model_path: Optional[str] = None,
     ):
         self.config = SileroVADConfig(
             orig_sr=orig_sr,
@@ -41,38 +275,116 @@ class VADEngine(VADInterface):
             required_misses=required_misses,
             smoothing_window=smoothing_window,
         )
+        if backend not in self.BACKENDS:
+            raise ValueError(
+                f"Unknown Silero VAD backend: {backend}, "
+                f"expected one of {', '.join(self.BACKENDS)}"
+            )
+        self.backend = backend
+        self.onnx_model_path = onnx_model_path
         self.model = self.load_vad_model()
-        self.state = StateMachine(self.config)
         self.window_size_samples = 512 if self.config.target_sr == 16000 else 256
         # 512 / 16000 = 0.032s
+        self._session = self.create_session()
 
     def load_vad_model(self):
-        logger.info("Loading Silero-VAD model...")
-        return load_silero_vad()
-
-    def detect_speech(self, audio_data: list[float]):
-        audio_np = np.array(audio_data, dtype=np.float32)
-        for i in range(0, len(audio_np), self.window_size_samples):
-            chunk_np = audio_np[i : i + self.window_size_samples]
-            if len(chunk_np) < self.window_size_samples:
-                break
-            chunk = torch.Tensor(chunk_np)
-
-            with torch.no_grad():
-                speech_prob = self.model(chunk, self.config.target_sr).item()
-
-            if speech_prob:
-                # print(speech_prob)
-                iter = self.state.get_result(speech_prob, chunk_np)
-
-                for probs, dbs, chunk in iter:  # detected a sequence of voice bytes
-                    # rounded_probs = [round(x, 2) for x in probs]
-                    # rounded_dbs = [round(y, 2) for y in dbs]
-
-                    audio_chunk = bytes(chunk)
-                    yield audio_chunk
-
-        del audio_np
+        logger.info(f"Loading Silero-VAD model ({self.backend})...")
+        start, rss_before = time.perf_counter(), _peak_rss_mb()
+        if self.backend == "onnx":
+            model = OnnxSileroModel(self.config.target_sr, self.onnx_model_path)
+        else:
+            model = TorchSileroModel(self.config.target_sr)
+        rss_after = _peak_rss_mb()
+        memory = (
+            f", peak RSS {rss_before:.0f} -> {rss_after:.0f} MB"
+            if rss_before is not None
+            else ""
+        )
+        logger.info(
+            f"Silero-VAD ({self.backend}) loaded in "
+            f"{time.perf_counter() - start:.2f}s{memory}"
+        )
+        return model
+
+    def create_session(self) -> "SileroVADSession":
+        return SileroVADSession(self)
+
+    @property
+    def sample_rate(self) -> int:
+        return self.config.target_sr
+
+    def detect_speech(self, audio_data: list[float], sample_rate: Optional[int] = None):
+        yield from self._session.detect_speech(audio_data, sample_rate)
+
+    async def async_detect_speech(
+        self, audio_data: list[float], sample_rate: Optional[int] = None
+    ) -> List[bytes]:
+        return await self._session.async_detect_speech(audio_data, sample_rate)
+
+
+class SileroVADSession(VADInterface):
+    """Speech detection state of one audio stream; the model is the engine's"""
+
+    def __init__(self, engine: VADEngine):
+        self.engine = engine
+        self.state = StateMachine(engine.config)
+        # Recurrent model state of this stream, managed by the model backend
+        self.model_state: Optional[Dict[str, Any]] = None
+        # Created for the input rate on first use; None while none is needed
+        self.resampler: Optional[StreamingResampler] = None
+
+    def create_session(self) -> "SileroVADSession":
+        return self.engine.create_session()
+
+    @property
+    def sample_rate(self) -> int:
+        return self.engine.config.target_sr
+
+    def detect_speech(self, audio_data: list[float], sample_rate: Optional[int] = None):
+        """
+        Args:
+            audio_data: Float samples of the next chunk of the stream.
+            sample_rate: Rate of `audio_data`; None means `orig_sr` from the
+                config. Audio is resampled to `target_sr` only if it differs.
+        """
+        windows = self._windows(audio_data, sample_rate)
+        if windows is None:
+            return
+        probs = self.engine.model.speech_probs(windows, self)
+        yield from self._detect(probs, windows)
+
+    async def async_detect_speech(
+        self, audio_data: list[float], sample_rate: Optional[int] = None
+    ) -> List[bytes]:
+        windows = self._windows(audio_data, sample_rate)
+        if windows is None:
+            return []
+        probs = await self.engine.model.async_speech_probs(windows, self)
+        return list(self._detect(probs, windows))
+
+    def _windows(
+        self, audio_data: list[float], sample_rate: Optional[int]
+    ) -> Optional[np.ndarray]:
+        """The chunk at `target_sr`, framed into whole model windows"""
+        window_size = self.engine.window_size_samples
+        audio_np = to_float32(audio_data)
+        input_sr = sample_rate or self.engine.config.orig_sr
+        if input_sr != self.engine.config.target_sr:
+            if self.resampler is None or self.resampler.orig_sr != input_sr:
+                self.resampler = StreamingResampler(
+                    input_sr, self.engine.config.target_sr
+                )
+            audio_np = self.resampler.process(audio_np)
+        # Whole windows only; a trailing partial window is dropped
+        num_windows = len(audio_np) // window_size
+        if num_windows == 0:
+            return None
+        return audio_np[: num_windows * window_size].reshape(num_windows, window_size)
+
+    def _detect(self, probs: np.ndarray, windows: np.ndarray):
+        for _, _, chunk in self.state.process_windows(probs, windows):
+            # detected a sequence of voice bytes
+            yield bytes(chunk)
 
 
 # Define state enumeration
@@ -107,6 +419,12 @@ class StateMachine:
         rms = np.sqrt(np.mean(np.square(audio_data)))
         return 20 * np.log10(rms + 1e-7) if rms > 0 else -np.inf
 
+    @classmethod
+    def calculate_dbs(cls, audio_windows: np.ndarray) -> np.ndarray:
+        """`calculate_db` of every row of a 2D array in one pass"""
+        rms = np.sqrt(np.mean(np.square(audio_windows), axis=1))
+        return np.where(rms > 0, 20 * np.log10(rms + 1e-7), -np.inf)
+
     def update(self, chunk_bytes, prob, db):
         self.probs.append(prob)
         self.dbs.append(db)
@@ -124,14 +442,62 @@ class StateMachine:
         smoothed_db = np.mean(self.db_window)
         return smoothed_prob, smoothed_db
 
+    @staticmethod
+    def _rolling_mean(history: deque, values: np.ndarray) -> np.ndarray:
+        """
+        Mean of each value with the ones before it in a window of
+        `history.maxlen`, continuing from `history`, which is then updated.
+        """
+        size = history.maxlen
+        previous = list(history)[-(size - 1) :] if size > 1 else []
+        # NaN pads the windows that start before the first value ever seen
+        series = np.concatenate(
+            [np.full(size - 1 - len(previous), np.nan), previous, values]
+        )
+        history.extend(values.tolist())
+        return np.nanmean(sliding_window_view(series, size), axis=1)
+
+    def process_windows(self, probs: np.ndarray, float_windows: np.ndarray):
+        """
+        Run the state machine over consecutive windows at once.
+
+        Equivalent to calling `process` on each row of `float_windows` with
+        its probability, but the dB and smoothing of all windows are
+        computed in a few vectorised operations.
+        """
+        # Windows the model scored exactly 0 are skipped, as in detect_speech
+        scored = probs != 0
+        probs, float_windows = probs[scored], float_windows[scored]
+        if len(probs) == 0:
+            return
+
+        int_windows = float_windows * 32767
+        dbs = self.calculate_dbs(int_windows)
+        chunk_bytes = float_to_int16(float_windows).tobytes()
+        window_bytes = len(chunk_bytes) // len(probs)
+
+        smoothed_probs = self._rolling_mean(self.prob_window, probs.astype(np.float64))
+        smoothed_dbs = self._rolling_mean(self.db_window, dbs)
+
+        for i, (smoothed_prob, smoothed_db) in enumerate(
+            zip(smoothed_probs.tolist(), smoothed_dbs.tolist())
+        ):
+            yield from self._step(
+                chunk_bytes[i * window_bytes : (i + 1) * window_bytes],
+                smoothed_prob,
+                smoothed_db,
+            )
+
     def process(self, prob, float_chunk_np: np.ndarray):
         int_chunk_np = float_chunk_np * 32767
-        chunk_bytes = int_chunk_np.astype(np.int16).tobytes()
+        chunk_bytes = float_to_int16(float_chunk_np).tobytes()
         db = self.calculate_db(int_chunk_np)
 
         # Obtain the smoothed prob and db
         smoothed_prob, smoothed_db = self.get_smoothed_values(prob, db)
+        yield from self._step(chunk_bytes, smoothed_prob, smoothed_db)
 
+    def _step(self, chunk_bytes: bytes, smoothed_prob: float, smoothed_db: float):
         if self.state == State.IDLE:
             self.pre_buffer.append(chunk_bytes)
             if (
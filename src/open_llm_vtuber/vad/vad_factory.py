@@ -18,4 +18,6 @@ class VADFactory:
                 kwargs.get("required_hits"),
                 kwargs.get("required_misses"),
                 kwargs.get("smoothing_window"),
+                kwargs.get("backend", "torch"),
+                kwargs.get("onnx_model_path"),
             )
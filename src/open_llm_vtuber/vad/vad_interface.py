@@ -1,12 +1,39 @@
 from abc import ABC, abstractmethod
+from typing import List, Optional
 
 
 class VADInterface(ABC):
     @abstractmethod
-    def detect_speech(self, audio_data: bytes):
+    def detect_speech(self, audio_data: bytes, sample_rate: Optional[int] = None):
         """
         Detect if there is voice activity in the audio data.
         :param audio_data: Input audio data
+        :param sample_rate: Sample rate of audio_data; None means the engine's configured input rate
         :return: Returns a sequence of audio bytes containing human voice if voice activity is detected
         """
         pass
+
+    async def async_detect_speech(
+        self, audio_data: bytes, sample_rate: Optional[int] = None
+    ) -> List[bytes]:
+        """
+        detect_speech for a caller on the event loop, returning everything
+        it yields. Engines whose model can run several streams in one call
+        override it to batch the sessions that are waiting together.
+        """
+        return list(self.detect_speech(audio_data, sample_rate))
+
+    @property
+    def sample_rate(self) -> int:
+        """Sample rate of the speech audio that detect_speech yields"""
+        return 16000
+
+    def create_session(self) -> "VADInterface":
+        """
+        Return a detector for one more audio stream.
+
+        Engines that keep detection state across calls return an object
+        with its own state that shares this engine's model. Stateless
+        engines may return themselves.
+        """
+        return self
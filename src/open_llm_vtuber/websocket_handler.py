@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Callable, TypedDict
+from typing import Dict, List, Optional, Callable, TypedDict, Union
 from fastapi import WebSocket, WebSocketDisconnect
 import asyncio
 import json
@@ -15,6 +15,10 @@ from .chat_group import (
 )
 from .message_handler import message_handler
 from .utils.stream_audio import prepare_audio_payload
+from .utils.audio_frame import decode_audio_frame
+from .utils.audio_buffer import AudioAccumulator
+from .utils.audio_frontend import AudioFrontEnd, resample, to_float32
+from .asr.asr_interface import ASRInterface, ASRStream
 from .chat_history_manager import (
     create_new_history,
     get_history,
@@ -27,6 +31,7 @@ from .conversations.conversation_handler import (
     handle_group_interrupt,
     handle_individual_interrupt,
 )
+from .conversations.speculation import SpeculationTracker
 
 
 class MessageType(Enum):
@@ -51,7 +56,10 @@ class WSMessage(TypedDict, total=False):
     type: str
     action: Optional[str]
     text: Optional[str]
-    audio: Optional[List[float]]
+    audio: Optional[Union[List[float], np.ndarray]]
+    sample_rate: Optional[int]
+    stream_id: Optional[int]
+    sequence: Optional[int]
     images: Optional[List[str]]
     history_uid: Optional[str]
     file: Optional[str]
@@ -68,7 +76,17 @@ class WebSocketHandler:
         self.chat_group_manager = ChatGroupManager()
         self.current_conversation_tasks: Dict[str, Optional[asyncio.Task]] = {}
         self.default_context_cache = default_context_cache
-        self.received_data_buffers: Dict[str, np.ndarray] = {}
+        self.received_data_buffers: Dict[str, AudioAccumulator] = {}
+        # Resampling and conditioning of each client's mic audio
+        self._audio_front_ends: Dict[str, AudioFrontEnd] = {}
+        # Last sequence number seen per (client, stream) for binary audio frames
+        self._audio_frame_sequences: Dict[str, Dict[int, int]] = {}
+        # Utterance being transcribed by a streaming ASR engine, per client.
+        # None marks an utterance whose stream failed; it is transcribed
+        # from the audio buffer instead.
+        self._asr_streams: Dict[str, Optional[ASRStream]] = {}
+        # Replies started on a settled partial transcript, per client
+        self._speculations: Dict[str, SpeculationTracker] = {}
 
         # Message handlers mapping
         self._message_handlers = self._init_message_handlers()
@@ -141,7 +159,16 @@ class WebSocketHandler:
         """Store client data and initialize group status"""
         self.client_connections[client_uid] = websocket
         self.client_contexts[client_uid] = session_service_context
-        self.received_data_buffers[client_uid] = np.array([])
+        self.received_data_buffers[client_uid] = AudioAccumulator(
+            max_samples=int(
+                self.default_context_cache.system_config.max_utterance_seconds
+                * ASRInterface.SAMPLE_RATE
+            )
+        )
+        self._audio_front_ends[client_uid] = AudioFrontEnd(
+            self.default_context_cache.system_config.audio_frontend,
+            target_sample_rate=ASRInterface.SAMPLE_RATE,
+        )
 
         self.chat_group_manager.client_group_map[client_uid] = ""
         await self.send_group_update(websocket, client_uid)
@@ -191,7 +218,12 @@ class WebSocketHandler:
             live2d_model=self.default_context_cache.live2d_model,
             asr_engine=self.default_context_cache.asr_engine,
             tts_engine=self.default_context_cache.tts_engine,
-            vad_engine=self.default_context_cache.vad_engine,
+            # Shared model, but detection state of this client's own
+            vad_engine=(
+                self.default_context_cache.vad_engine.create_session()
+                if self.default_context_cache.vad_engine
+                else None
+            ),
             agent_engine=self.default_context_cache.agent_engine,
             translate_engine=self.default_context_cache.translate_engine,
             mcp_server_registery=self.default_context_cache.mcp_server_registery,
@@ -214,7 +246,9 @@ class WebSocketHandler:
         try:
             while True:
                 try:
-                    data = await websocket.receive_json()
+                    data = await self._receive_message(websocket, client_uid)
+                    if data is None:
+                        continue
                     message_handler.handle_message(client_uid, data)
                     await self._route_message(websocket, client_uid, data)
                 except WebSocketDisconnect:
@@ -236,6 +270,56 @@ class WebSocketHandler:
             logger.error(f"Fatal error in WebSocket communication: {e}")
             raise
 
+    async def _receive_message(
+        self, websocket: WebSocket, client_uid: str
+    ) -> Optional[WSMessage]:
+        """
+        Receive the next message, accepting both JSON text frames and binary
+        audio frames.
+
+        Binary frames are decoded without going through JSON, so mic audio
+        never becomes a list of Python floats. Old frontends keep sending
+        JSON and are handled as before.
+
+        Args:
+            websocket: The WebSocket connection
+            client_uid: Client identifier
+
+        Returns:
+            Optional[WSMessage]: The decoded message, or None if the frame
+            should be skipped
+        """
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            raise WebSocketDisconnect(message.get("code", 1000))
+
+        payload = message.get("bytes")
+        if payload is None:
+            return json.loads(message.get("text") or "")
+
+        try:
+            frame = decode_audio_frame(payload)
+        except ValueError as e:
+            logger.error(f"Invalid binary audio frame from {client_uid}: {e}")
+            return None
+
+        sequences = self._audio_frame_sequences.setdefault(client_uid, {})
+        last_sequence = sequences.get(frame.stream_id)
+        if last_sequence is not None and frame.sequence != last_sequence + 1:
+            logger.warning(
+                f"Audio stream {frame.stream_id} of {client_uid} jumped from "
+                f"sequence {last_sequence} to {frame.sequence}"
+            )
+        sequences[frame.stream_id] = frame.sequence
+
+        return {
+            "type": frame.msg_type,
+            "audio": frame.audio,
+            "sample_rate": frame.sample_rate,
+            "stream_id": frame.stream_id,
+            "sequence": frame.sequence,
+        }
+
     async def _route_message(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
@@ -299,8 +383,14 @@ class WebSocketHandler:
 
         # Clean up other client data
         self.client_connections.pop(client_uid, None)
-        self.client_contexts.pop(client_uid, None)
+        context = self.client_contexts.pop(client_uid, None)
         self.received_data_buffers.pop(client_uid, None)
+        self._audio_front_ends.pop(client_uid, None)
+        self._audio_frame_sequences.pop(client_uid, None)
+        self._asr_streams.pop(client_uid, None)
+        tracker = self._speculations.pop(client_uid, None)
+        if tracker is not None:
+            await tracker.discard()
         if client_uid in self.current_conversation_tasks:
             task = self.current_conversation_tasks[client_uid]
             if task and not task.done():
@@ -308,7 +398,6 @@ class WebSocketHandler:
             self.current_conversation_tasks.pop(client_uid, None)
 
         # Call context close to clean up resources (e.g., MCPClient)
-        context = self.client_contexts.get(client_uid)
         if context:
             await context.close()
 
@@ -464,21 +553,29 @@ class WebSocketHandler:
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
         """Handle incoming audio data"""
-        audio_data = data.get("audio", [])
-        if audio_data:
-            self.received_data_buffers[client_uid] = np.append(
-                self.received_data_buffers[client_uid],
-                np.array(audio_data, dtype=np.float32),
+        audio_data = data.get("audio")
+        if audio_data is not None and len(audio_data):
+            audio = self._audio_front_ends[client_uid].process(
+                audio_data, data.get("sample_rate")
             )
+            self.received_data_buffers[client_uid].append(audio)
+            await self._feed_asr_stream(websocket, client_uid, audio)
 
     async def _handle_raw_audio_data(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
         """Handle incoming raw audio data for VAD processing"""
         context = self.client_contexts[client_uid]
-        chunk = data.get("audio", [])
-        if chunk:
-            for audio_bytes in context.vad_engine.detect_speech(chunk):
+        chunk = data.get("audio")
+        if chunk is not None and len(chunk):
+            # The front end brings the audio to the ASR rate; the VAD only
+            # resamples it again if its model runs at another rate
+            chunk = self._audio_front_ends[client_uid].process(
+                chunk, data.get("sample_rate")
+            )
+            vad = context.vad_engine
+            speech = await vad.async_detect_speech(chunk, ASRInterface.SAMPLE_RATE)
+            for audio_bytes in speech:
                 if audio_bytes == b"<|PAUSE|>":
                     await websocket.send_text(
                         json.dumps({"type": "control", "text": "interrupt"})
@@ -487,14 +584,83 @@ class WebSocketHandler:
                     pass
                 elif len(audio_bytes) > 1024:
                     # Detected audio activity (voice)
-                    self.received_data_buffers[client_uid] = np.append(
-                        self.received_data_buffers[client_uid],
-                        np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32),
+                    utterance = resample(
+                        to_float32(np.frombuffer(audio_bytes, dtype=np.int16)),
+                        vad.sample_rate,
+                        ASRInterface.SAMPLE_RATE,
                     )
+                    self.received_data_buffers[client_uid].append(utterance)
+                    # Decode it while the mic-audio-end round trip happens
+                    await self._feed_asr_stream(websocket, client_uid, utterance)
                     await websocket.send_text(
                         json.dumps({"type": "control", "text": "mic-audio-end"})
                     )
 
+    async def _feed_asr_stream(
+        self,
+        websocket: WebSocket,
+        client_uid: str,
+        audio: np.ndarray,
+    ) -> None:
+        """
+        Feed mic audio, already at the ASR sample rate, to the client's
+        streaming ASR and send the partial transcript to the client as
+        `user-input-partial`.
+
+        Does nothing for ASR engines without streaming support; their
+        utterance is transcribed from the audio buffer at mic-audio-end.
+        """
+        asr_engine = self.client_contexts[client_uid].asr_engine
+        if not asr_engine.supports_streaming:
+            return
+        if client_uid not in self._asr_streams:
+            self._asr_streams[client_uid] = asr_engine.create_stream()
+        stream = self._asr_streams[client_uid]
+        if stream is None:
+            return
+
+        try:
+            partial = await stream.async_accept_waveform(
+                audio, ASRInterface.SAMPLE_RATE
+            )
+        except Exception as e:
+            logger.error(
+                f"Streaming ASR failed for {client_uid}, "
+                f"falling back to transcribing the whole utterance: {e}"
+            )
+            self._asr_streams[client_uid] = None
+            return
+
+        if partial is not None:
+            await websocket.send_text(
+                json.dumps({"type": "user-input-partial", "text": partial})
+            )
+        await self._update_speculation(client_uid, partial, audio)
+
+    async def _update_speculation(
+        self, client_uid: str, partial: Optional[str], audio: np.ndarray
+    ) -> None:
+        """Start the agent early once the partial transcript has settled"""
+        context = self.client_contexts[client_uid]
+        config = context.character_config.asr_config.speculative_start
+        if not config.enabled:
+            return
+        group = self.chat_group_manager.get_client_group(client_uid)
+        if group and len(group.members) > 1:
+            return
+        task = self.current_conversation_tasks.get(client_uid)
+        if task is not None and not task.done():
+            # The previous reply is still playing; its memory must settle first
+            return
+
+        tracker = self._speculations.get(client_uid)
+        if tracker is None:
+            tracker = self._speculations[client_uid] = SpeculationTracker(config)
+        tracker.config = config  # Follows config switches
+        await tracker.update(
+            partial, audio, context.agent_engine, context.character_config.human_name
+        )
+
     async def _handle_conversation_trigger(
         self, websocket: WebSocket, client_uid: str, data: WSMessage
     ) -> None:
@@ -509,6 +675,8 @@ class WebSocketHandler:
             client_connections=self.client_connections,
             chat_group_manager=self.chat_group_manager,
             received_data_buffers=self.received_data_buffers,
+            asr_streams=self._asr_streams,
+            speculations=self._speculations,
             current_conversation_tasks=self.current_conversation_tasks,
             broadcast_to_group=self.broadcast_to_group,
         )